@@ -16,10 +16,16 @@ from .plugin import Factory
 from .fixture import Fixture
 from .globals import global_fixtures
 from .building import FixtureBuildingFromConfigMixin, FixtureBuildingFromDictMixin
-from .discover import discover_project_root
+from .discover import discover_project_root, find_project_roots
+from .manifest import DiscoverManifest, METTA_DISCOVER_MANIFEST_ENV
 from .config import add_config_sources_from_config, METTA_CONFIG_CONFIG_SOURCE_KEY
 from .importing import add_imports_from_config, METTA_IMPORT_CONFIG_LABEL
-from .setuptools import setuptools_entrypoint, METTA_CONFIG_SETUPTOOLS_BOOTSTRAPS_KEY
+from .setuptools import (
+    setuptools_entrypoint,
+    add_resolved_entrypoints,
+    resolved_entrypoints,
+    METTA_CONFIG_SETUPTOOLS_BOOTSTRAPS_KEY,
+)
 from .environment import METTA_FIXTURES_CONFIG_ENVIRONMENTS_KEY
 
 logger = logging.getLogger("metta.bootstrapper")
@@ -126,7 +132,7 @@ def core_bootstrap(config: Config, instance_id: str) -> "BootStrapFixtureBuilder
     interfaces=[METTA_PLUGIN_INTERFACE_ROLE_BOOTSTRAPPER],
 )
 def project_bootstrap(
-    config: Config, instance_id: str, path: str = CWD
+    config: Config, instance_id: str, path: str = CWD, manifest: str = ""
 ) -> "BootStrapFixtureBuilder":
     """Bootstrap Metta by looking in a file-system for a project.
 
@@ -143,9 +149,27 @@ def project_bootstrap(
     config (Config) : Configerus Config object used internally and by any
         functionality that wants to consider itself inside the environment.
 
+    path (str) : path from which to start looking for the project root.
+
+    manifest (str) : optional path to a discover manifest file, which records
+        the discovered project so that later runs can skip the file system
+        search and the entrypoint scans while it is still valid. If empty then
+        the METTA_DISCOVER_MANIFEST environment variable is used, if set.
+        @see .manifest
+
     """
+    if not manifest:
+        manifest = os.environ.get(METTA_DISCOVER_MANIFEST_ENV, "")
+    discover_manifest: DiscoverManifest = DiscoverManifest(manifest) if manifest else None
+
     # 1. Discover a root project config path, which gives us enough config to start
-    discover_project_root(config, start_path=path)
+    if discover_manifest is not None and discover_manifest.load(start_path=path):
+        logger.debug("Using discover manifest: %s", manifest)
+        roots = discover_manifest.roots()
+        add_resolved_entrypoints(discover_manifest.entrypoints())
+    else:
+        roots = find_project_roots(path)
+    discover_project_root(config, start_path=path, roots=roots)
 
     # At this point, the setup is done as we should have found some standardized
     # config which instructs the core bootloader how to do its magic.
@@ -155,7 +179,18 @@ def project_bootstrap(
     instance_id = f"{instance_id}-core"
     args: List[Any] = [config, instance_id]
     kwargs: Dict[str, Any] = {}
-    return Factory.create(METTA_BOOTSTRAPPER_CORE_PLUGIN_ID, instance_id, *args, **kwargs)
+    builder = Factory.create(METTA_BOOTSTRAPPER_CORE_PLUGIN_ID, instance_id, *args, **kwargs)
+
+    # 3. record the discovery for later runs
+    if discover_manifest is not None:
+        discover_manifest.save(
+            start_path=path,
+            roots=roots,
+            config=config,
+            entrypoints=resolved_entrypoints(),
+        )
+
+    return builder
 
 
 class BootStrapFixtureBuilder(FixtureBuildingFromConfigMixin, FixtureBuildingFromDictMixin):
@@ -19,6 +19,11 @@ from .plugin import (
     METTA_PLUGIN_CONFIG_KEY_ARGUMENTS,
     METTA_PLUGIN_CONFIG_KEY_PLUGINLABELS,
 )
+from .timings import (
+    global_timings,
+    METTA_TIMINGS_CATEGORY_CONFIG_LOAD,
+    METTA_TIMINGS_CATEGORY_CONFIG_VALIDATE,
+)
 from .fixture import (
     Fixture,
     Fixtures,
@@ -186,7 +191,8 @@ class FixtureBuildingFromConfigMixin:
         fixtures: Fixtures = Fixtures()
 
         try:
-            plugin_config = self._config.load(label)
+            with global_timings.timer(METTA_TIMINGS_CATEGORY_CONFIG_LOAD, label):
+                plugin_config = self._config.load(label)
 
             # check to see if we are being directed elsewhere for config
             # using a "from_config" directive
@@ -203,7 +209,8 @@ class FixtureBuildingFromConfigMixin:
                         default=LOADED_KEY_ROOT,
                     )
 
-                    plugin_config = self._config.load(label)
+                    with global_timings.timer(METTA_TIMINGS_CATEGORY_CONFIG_LOAD, label):
+                        plugin_config = self._config.load(label)
                 else:
                     logger.debug("Using from_config, and passing current label/base as arguments")
             except KeyError:
@@ -310,7 +317,8 @@ class FixtureBuildingFromConfigMixin:
 
         try:
             # loaded configuration for the plugin
-            plugin_loaded = self._config.load(label)
+            with global_timings.timer(METTA_TIMINGS_CATEGORY_CONFIG_LOAD, label):
+                plugin_loaded = self._config.load(label)
         except KeyError as err:
             raise KeyError(f"Could not load plugin config source {label}") from err
 
@@ -444,8 +452,9 @@ class FixtureBuildingFromConfigMixin:
         if len(validators):
             # Run configerus validation on the config base once per validator
             try:
-                for val in validators:
-                    loaded.get(base, validator=val)
+                with global_timings.timer(METTA_TIMINGS_CATEGORY_CONFIG_VALIDATE, str(base)):
+                    for val in validators:
+                        loaded.get(base, validator=val)
             except ValidationError as err:
                 raise err
 
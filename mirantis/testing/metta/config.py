@@ -4,10 +4,10 @@ Interact and manipulate Configerus objects.
 
 """
 import logging
-from typing import Any, List, Union
+from typing import Any, Dict, List, Union
 
 from configerus.config import Config
-from configerus.loaded import LOADED_KEY_ROOT
+from configerus.loaded import Loaded, LOADED_KEY_ROOT
 from configerus.contrib.files import PLUGIN_ID_SOURCE_PATH, CONFIGERUS_PATH_KEY
 from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT, CONFIGERUS_DICT_DATA_KEY
 from configerus.contrib.env import (
@@ -40,6 +40,31 @@ def default_config(additional_bootstraps: List[str] = None):
     return config
 
 
+def copy_config(config: Config) -> Config:
+    """Copy a config object, sharing already loaded label data with the copy.
+
+    Configerus copies start with no loaded labels, so every copy re-reads and
+    re-parses the same source files.  The copy has the same sources, so the
+    loaded data for a label is the same until the copy gets new sources, at
+    which point configerus drops the loaded labels of the copy and reloads
+    them as needed.  The parent is not affected by changes to the copy.
+
+    Loaded data is shared between the configs, so it must be treated as
+    read-only, which is already expected of data shared by Loaded.get().
+    Each label gets a new Loaded object so that formatting and validation use
+    the plugins of the copy.
+
+    The copy gets whatever the parent loaded, even if the source files have
+    changed since.  If they may have changed, reload the labels in the copy
+    with load(label, force_reload=True), which leaves the parent alone.
+
+    """
+    config_copy = config.copy()
+    for label, loaded in config.loaded.items():
+        config_copy.loaded[label] = Loaded(data=loaded.data, parent=config_copy, instance_id=label)
+    return config_copy
+
+
 def add_config_sources_from_config(
     config: Config,
     label: str = "config",
@@ -52,6 +77,8 @@ def add_config_sources_from_config(
     entirely extensible from a single metta.yml file.
     In the trade-off battle between configurable and convention, this leans
     heavily towards configuration, but it easily lends to standards.
+    Labels that were already loaded are kept if the new sources have no data
+    for them, so shared loaded data (@see copy_config) stays shared.
     Parameters:
     -----------
     label (str) : configurus load label.
@@ -61,6 +88,11 @@ def add_config_sources_from_config(
     config_environment = config.load(label)
     config_sources = config_environment.get(base, default={})
 
+    # Adding a source drops all loaded labels, keep them to restore those that
+    # the new sources don't change.
+    loaded: Dict[str, Loaded] = dict(config.loaded)
+    sources: List[Any] = []
+
     for instance_id in config_sources.keys():
         instance_base = [base, instance_id]
 
@@ -78,6 +110,7 @@ def add_config_sources_from_config(
             instance_id,
         )
         plugin = config.add_source(plugin_id=plugin_id, instance_id=instance_id, priority=priority)
+        sources.append(plugin)
 
         # Configerus plugins all work differently so we take a different
         # approach per plugin
@@ -102,3 +135,10 @@ def add_config_sources_from_config(
                 "had no way of configuring new Configerus source plugin %s",
                 plugin_id,
             )
+
+    # labels which none of the new sources have data for are unchanged
+    for loaded_label, loaded_config in loaded.items():
+        if loaded_label not in config.loaded and not any(
+            source.load(loaded_label) for source in sources
+        ):
+            config.loaded[loaded_label] = loaded_config
@@ -7,10 +7,11 @@ configuration, along with related configuration, dependency injections and
 fixtures.
 
 """
-import os.path
+import functools
+import os
 import sys
 import logging
-from typing import List
+from typing import List, Tuple
 
 from configerus.plugin import Type as ConfigerusType
 from configerus.config import Config
@@ -39,32 +40,47 @@ DEFAULT_ENVIRONMENT_ROOT_CONFIG_IF_NO_ROOT_IS_FOUND = {
 }
 """ If no root is found then this config is passed back as a config source """
 
+METTA_PROJECT_ROOT_ENV = "METTA_PROJECT_ROOT"
+""" Environment variable which pins the project root, so that no search is done """
 
-def discover_project_root(config: Config, start_path: str, marker_files: List[str] = None):
-    """Find a project root path.
 
-    We start looking in the start_path for certain marker files, and if we
-    don't find any then we check the parent, recursively. If we never find a
-    marker file then we assume that the current path is the root.
+def find_project_roots(start_path: str, marker_files: List[str] = None) -> List[str]:
+    """Find project root paths, from start_path up, that contain a marker file.
 
-    Whichever path we think is the root, we add a a configerus path source.
-    That means that you can put whatever you want there for config.
+    If the METTA_PROJECT_ROOT environment variable is set, then it is the only
+    project root and no search is done.
 
-    Commonly, one used just the metta.yml|json file to direct metta to include
-    additional paths (such a ./config) from the metta.yml path.
+    Searches are kept per start path and marker files for the life of the
+    process, @see clear_project_roots_cache()
+
+    Returns:
+    --------
+    List of paths, starting with the one closest to start_path.
 
     """
+    pinned_root = os.environ.get(METTA_PROJECT_ROOT_ENV, "")
+    if pinned_root:
+        logger.debug("Using pinned project root: %s", pinned_root)
+        return [os.path.realpath(pinned_root)]
+
     if marker_files is None:
         marker_files = METTA_ROOT_FILES
 
     # standardize the path to rid of issues that could be cause by path tricks
     # such as  'path/..'
-    start_path = os.path.realpath(start_path)
+    return list(_search_project_roots(os.path.realpath(start_path), tuple(marker_files)))
+
+
+def clear_project_roots_cache():
+    """Forget project root searches, so that the file system is searched again."""
+    _search_project_roots.cache_clear()
 
-    # Try to any a path from start+path and up that contains a marker file as a
-    # config source.
+
+@functools.lru_cache(maxsize=None)
+def _search_project_roots(start_path: str, marker_files: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Search the file system for project roots, @see find_project_roots()."""
     check_path = start_path
-    depth = 0
+    roots: List[str] = []
     while check_path:
         # if we are in a system /root path then stop scanning
         # we do this by checking if the path's parent is the
@@ -73,35 +89,60 @@ def discover_project_root(config: Config, start_path: str, marker_files: List[st
             break
 
         for root_file in marker_files:
-            root_file_path = os.path.join(check_path, root_file)
-
-            if os.path.isfile(root_file_path):
-                # If we found a marker file in a path, then we add that path as
-                # a config source.
-                if check_path not in sys.path:
-                    sys.path.append(check_path)
-
-                priority = DEFAULT_SOURCE_PRIORITY - depth
-                if depth:
-                    instance_id = f"project-{depth}"
-                else:
-                    instance_id = "project"
-                config.add_source(
-                    plugin_id=PLUGIN_ID_SOURCE_PATH,
-                    instance_id=instance_id,
-                    priority=priority,
-                ).set_path(check_path)
-                logger.info("Added project path as config: %s => %s", check_path, instance_id)
-
-                depth += 1
-
-                # Since we already added this path as a config source, we don't
-                #  need to keep looking for more files.
+            if os.path.isfile(os.path.join(check_path, root_file)):
+                roots.append(check_path)
+                # we already found this path, so we don't need to keep looking
+                # for more files.
                 break
 
         # move up one directory and try again
         check_path = os.path.dirname(check_path)
 
+    return tuple(roots)
+
+
+def discover_project_root(
+    config: Config, start_path: str, marker_files: List[str] = None, roots: List[str] = None
+):
+    """Find a project root path.
+
+    We start looking in the start_path for certain marker files, and if we
+    don't find any then we check the parent, recursively. If we never find a
+    marker file then we assume that the current path is the root.
+
+    Whichever path we think is the root, we add a a configerus path source.
+    That means that you can put whatever you want there for config.
+
+    Commonly, one used just the metta.yml|json file to direct metta to include
+    additional paths (such a ./config) from the metta.yml path.
+
+    Parameters:
+    -----------
+    roots (List[str]) : already known root paths (e.g. from a discover
+        manifest) in which case the file system is not searched.
+
+    """
+    if roots is None:
+        roots = find_project_roots(start_path, marker_files)
+
+    for depth, root_path in enumerate(roots):
+        # If we found a marker file in a path, then we add that path as a
+        # config source.
+        if root_path not in sys.path:
+            sys.path.append(root_path)
+
+        priority = DEFAULT_SOURCE_PRIORITY - depth
+        if depth:
+            instance_id = f"project-{depth}"
+        else:
+            instance_id = "project"
+        config.add_source(
+            plugin_id=PLUGIN_ID_SOURCE_PATH,
+            instance_id=instance_id,
+            priority=priority,
+        ).set_path(root_path)
+        logger.info("Added project path as config: %s => %s", root_path, instance_id)
+
     try:
         config.plugins.get_plugins(type=ConfigerusType.SOURCE)
     except KeyError:
@@ -38,16 +38,19 @@ from configerus.loaded import LOADED_KEY_ROOT
 
 from .plugin import (
     Factory,
+    Instance,
 )
 from .fixture import (
     Fixture,
     Fixtures,
+    LazyFixture,
     METTA_FIXTURES_CONFIG_FIXTURES_LABEL,
 )
 from .building import FixtureBuildingFromConfigMixin, FixtureBuildingFromDictMixin
-from .config import add_config_sources_from_config, METTA_CONFIG_CONFIG_SOURCE_KEY
-from .importing import add_imports_from_config, METTA_IMPORT_CONFIG_LABEL
+from .config import add_config_sources_from_config, copy_config, METTA_CONFIG_CONFIG_SOURCE_KEY
+from .importing import add_imports_from_config, imports_info, METTA_IMPORT_CONFIG_LABEL
 from .setuptools import setuptools_entrypoint, METTA_CONFIG_SETUPTOOLS_BOOTSTRAPS_KEY
+from .timings import global_timings, METTA_TIMINGS_CATEGORY_FIXTURE
 
 logger = getLogger("metta.environment")
 
@@ -223,11 +226,90 @@ class Environment:
         NotImplementedError if you asked for an unregistered plugin_id
 
         """
-        if arguments is None:
-            arguments = {}
+        self._check_fixture_arguments(plugin_id, instance_id, priority)
+
+        # Build the plugin instance by passing collected arguments to the
+        # registered plugin factory, then build a fixture from it and add it to
+        # the fixtures set for the environment, and return the fixture.
+        plugin_instance = self._create_fixture_plugin(plugin_id, instance_id, arguments)
+        return self.fixtures().add(
+            fixture=Fixture.from_instance(
+                plugin_instance, priority=priority, labels=self._fixture_labels(labels)
+            ),
+            replace_existing=replace_existing,
+        )
+
+    # This is what it takes to build a plugin
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def new_lazy_fixture(
+        self,
+        plugin_id: str,
+        instance_id: str,
+        priority: int,
+        arguments: Dict[str, Any] = None,
+        labels: Dict[str, Any] = None,
+        replace_existing=False,
+    ) -> LazyFixture:
+        """Add a fixture whose plugin is only created when it is first used.
 
-        # Catch some early arg validation errors which would otherwise have
-        # caused some hard to diagnose issues.
+        This is new_fixture() for plugins which may never be used, such as
+        generated outputs.  The fixture metadata comes from the plugin
+        registration, so the fixture can be filtered and sorted without
+        running the plugin factory.  The factory is run, with the arguments,
+        on first access of the fixture .plugin.
+
+        Parameters:
+        -----------
+        Same as new_fixture()
+
+        Return:
+        -------
+        The LazyFixture, already added to the environment.
+
+        Raises:
+        -------
+        NotImplementedError if you asked for an unregistered plugin_id
+
+        """
+        self._check_fixture_arguments(plugin_id, instance_id, priority)
+
+        try:
+            registration = Factory.plugin_info(plugin_id)
+        except KeyError as err:
+            raise NotImplementedError(
+                f"METTA Plugin factory '{plugin_id}' has not been registered."
+            ) from err
+
+        fixture_labels: Dict[str, Any] = registration["labels"]
+        if labels is not None:
+            fixture_labels.update(labels)
+
+        return self.fixtures().add(
+            fixture=LazyFixture(
+                build=lambda: self._create_fixture_plugin(
+                    plugin_id, instance_id, arguments
+                ).plugin,
+                plugin_id=plugin_id,
+                instance_id=instance_id,
+                interfaces=registration["interfaces"],
+                labels=self._fixture_labels(fixture_labels),
+                priority=priority,
+            ),
+            replace_existing=replace_existing,
+        )
+
+    @staticmethod
+    def _check_fixture_arguments(plugin_id: str, instance_id: str, priority: int):
+        """Validate new fixture arguments.
+
+        Catch some early arg validation errors which would otherwise have
+        caused some hard to diagnose issues.
+
+        Raises:
+        -------
+        ValueError if the arguments are of the wrong types
+
+        """
         if not (
             isinstance(plugin_id, str)
             and isinstance(instance_id, str)
@@ -238,24 +320,39 @@ class Environment:
                 f":{plugin_id}:{instance_id} ({priority})"
             )
 
-        if labels is None:
-            labels = {}
-        labels["environment"] = self.instance_id()
+    def _fixture_labels(self, labels: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Return fixture labels with the environment label added."""
+        fixture_labels: Dict[str, Any] = {} if labels is None else dict(labels)
+        fixture_labels["environment"] = self.instance_id()
+        return fixture_labels
 
-        # Build the plugin instance by passing collected arguments to the
-        # registered plugin factory. This will call whatever function was
-        # decorated for the plugin_id.
-        args: List[Any] = [self, instance_id]
-        kwargs: Dict[str, Any] = arguments
-        plugin_instance = Factory.create(plugin_id, instance_id, *args, **kwargs)
-
-        # Build a fixture from the plugin_instance and add it to the fixtures
-        # set for the environment, then return the fixture.
-        fixture = self.fixtures().add(
-            fixture=Fixture.from_instance(plugin_instance, priority=priority, labels=labels),
-            replace_existing=replace_existing,
-        )
-        return fixture
+    def _create_fixture_plugin(
+        self, plugin_id: str, instance_id: str, arguments: Dict[str, Any] = None
+    ) -> Instance:
+        """Run the registered plugin factory for a fixture, timing it.
+
+        The factory is passed the environment and instance_id, followed by the
+        keyword arguments.
+
+        Raises:
+        -------
+        NotImplementedError if you asked for an unregistered plugin_id
+
+        """
+        if arguments is None:
+            arguments = {}
+
+        with global_timings.timer(
+            METTA_TIMINGS_CATEGORY_FIXTURE,
+            f"{self.instance_id()}/{plugin_id}/{instance_id}",
+            labels={
+                "environment": self.instance_id(),
+                "plugin_id": plugin_id,
+                "instance_id": instance_id,
+            },
+        ):
+            args: List[Any] = [self, instance_id]
+            return Factory.create(plugin_id, instance_id, *args, **arguments)
 
 
 METTA_BUILDER_ENVIRONMENT_PLUGIN_ID = "metta_builder_environment"
@@ -313,8 +410,8 @@ class FixtureBuilderEnvironment(
             functionality that wants to consider itself inside the environment.
         """
         # Make each environment use its own config object to keep config
-        # changes isolated to each environment.
-        config: Config = config.copy()
+        # changes isolated to each environment.  Already loaded config is shared.
+        config: Config = copy_config(config)
 
         Environment.__init__(self, config=config, instance_id=instance_id)
         FixtureBuildingFromConfigMixin.__init__(
@@ -324,6 +421,8 @@ class FixtureBuilderEnvironment(
 
         self._environment_boostraps: List[str] = []
         """Track what bootstaps we have applied for introspection."""
+        self._imports: List[str] = []
+        """Track what module paths we have imported for introspection."""
 
         # If we received any config directiosn, then we self-bootstrap from the config
         if label:
@@ -338,7 +437,7 @@ class FixtureBuilderEnvironment(
             # 2. import any python code requested, to make sure that all funxtionality
             #    is in scope that is needed.
             #    Here we say look in the "metta" config for a "imports" section.
-            add_imports_from_config(
+            self._imports = add_imports_from_config(
                 config=config, label=label, base=[base, METTA_IMPORT_CONFIG_LABEL]
             )
 
@@ -365,10 +464,17 @@ class FixtureBuilderEnvironment(
                 labels=labels,
             )
 
-    # pylint: disable=unused-argument
     def info(self, deep: bool = False) -> Dict[str, Any]:
-        """Return dict plugin info."""
-        return {
+        """Return dict plugin info.
+
+        Deep info includes the modules imported from config, with how long
+        each import took.
+
+        """
+        environment_info: Dict[str, Any] = {
             "name": self.instance_id(),
             "bootstraps": self._environment_boostraps,
         }
+        if deep:
+            environment_info["imports"] = imports_info(self._imports)
+        return environment_info
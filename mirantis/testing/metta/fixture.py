@@ -26,7 +26,8 @@ the plugin in the dark about its own metadata.
 
 """
 import logging
-from typing import Any, Dict, List, Iterator
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Iterator, Iterable, Mapping, FrozenSet, Tuple
 
 # pylint: disable=W0511
 # TODO move these to this file as METTA_FIXTURE_KEY_XXXXX
@@ -64,6 +65,50 @@ METTA_FIXTURE_VALIDATION_JSONSCHEMA = {
 }
 """ json schema validation definition for a plugin """
 
+_EMPTY_LABELS: Mapping[str, str] = MappingProxyType({})
+""" Shared read-only labels for fixtures without labels """
+_INTERFACE_SETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+""" Interned interface frozensets, so that fixtures from one plugin share one set """
+_LABEL_MAPPINGS: Dict[FrozenSet, Mapping[str, str]] = {}
+""" Interned read-only label mappings, keyed on their items """
+_LABEL_MAPPINGS_MAX: int = 1024
+""" How many distinct label mappings will be interned """
+
+
+def _intern_interfaces(interfaces: Iterable[str]) -> FrozenSet[str]:
+    """Return a shared frozenset for the interfaces.
+
+    The number of distinct interface sets is bounded by the number of plugin
+    registrations, so keeping them all is cheap.
+    """
+    interface_set = frozenset(interfaces) if interfaces else frozenset()
+    return _INTERFACE_SETS.setdefault(interface_set, interface_set)
+
+
+def _intern_labels(labels: Mapping[str, str]) -> Mapping[str, str]:
+    """Return a read-only copy of the labels, shared with equal labels if possible.
+
+    Fixtures created from one plugin factory often carry identical labels, so
+    equal label sets share one mapping.  The cache is bounded, as labels can
+    also be unique per instance; past the bound, labels just get their own copy.
+    """
+    if not labels:
+        return _EMPTY_LABELS
+    try:
+        key = frozenset(labels.items())
+    except TypeError:
+        # unhashable label values can't be interned
+        return MappingProxyType(dict(labels))
+
+    try:
+        return _LABEL_MAPPINGS[key]
+    except KeyError:
+        pass
+    proxy = MappingProxyType(dict(labels))
+    if len(_LABEL_MAPPINGS) < _LABEL_MAPPINGS_MAX:
+        _LABEL_MAPPINGS[key] = proxy
+    return proxy
+
 
 class Fixture:
     """A plugin wrapper struct that keep metadata about the plugin in a set.
@@ -72,16 +117,24 @@ class Fixture:
     metadata about the plugin.  This is similar to the plugin.PluginInstance
     wrapper, but it also adds a priority intereger for relative importance.
 
+    Environments can hold thousands of fixtures (e.g. one per terraform output)
+    so the struct is kept lean: it uses slots, and its interfaces and labels
+    are immutable.  Interfaces are kept as a frozenset which is shared between
+    all fixtures with the same interfaces, and labels as a read-only mapping.
+    Only the priority can be changed after creation.
+
     """
 
+    __slots__ = ("plugin_id", "instance_id", "interfaces", "labels", "priority", "_plugin")
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
         plugin: Any,
         plugin_id: str,
         instance_id: str,
-        interfaces: List[str],
-        labels: Dict[str, str],
+        interfaces: Iterable[str],
+        labels: Mapping[str, str],
         priority: int,
     ):
         """Initialize struct contents.
@@ -96,14 +149,26 @@ class Fixture:
         instance_id (str) : plugin instance identifier
         interfaces (list[str]) : string list of interface
             identifiers that the plugin should support.
+        labels (Dict[str, str]) : labels for the instance.  The labels are
+            copied, so changing the passed dict does not change the fixture.
 
         """
         self.plugin_id: str = plugin_id
         self.instance_id: str = instance_id
-        self.interfaces: List[str] = interfaces
-        self.labels: Dict[str, str] = labels
+        self.interfaces: FrozenSet[str] = _intern_interfaces(interfaces)
+        self.labels: Mapping[str, str] = _intern_labels(labels)
         self.priority: int = priority
-        self.plugin: Any = plugin
+        self._plugin: Any = plugin
+
+    @property
+    def plugin(self) -> Any:
+        """Return the plugin instance."""
+        return self._plugin
+
+    @plugin.setter
+    def plugin(self, plugin: Any):
+        """Set the plugin instance."""
+        self._plugin = plugin
 
     def __eq__(self, other):
         """Compare to another fixture.
@@ -147,15 +212,7 @@ class Fixture:
         a risk of a plugin throwing an exception.
 
         """
-        fixture_info: Dict[str, Any] = {
-            "fixture": {
-                "instance_id": self.instance_id,
-                "plugin_id": self.plugin_id,
-                "interfaces": self.interfaces,
-                "labels": self.labels,
-                "priority": self.priority,
-            }
-        }
+        fixture_info: Dict[str, Any] = {"fixture": self._metadata_info()}
         # If a plugin has a callable info method then add it to the info
         if hasattr(self.plugin, "info"):
             fixture_info["plugin"] = self.plugin.info(deep=deep)
@@ -169,19 +226,27 @@ class Fixture:
 
         return fixture_info
 
-    def has_interfaces(self, interfaces: List[str]) -> bool:
+    def _metadata_info(self) -> Dict[str, Any]:
+        """Return the fixture metadata part of info()."""
+        return {
+            "instance_id": self.instance_id,
+            "plugin_id": self.plugin_id,
+            "interfaces": sorted(self.interfaces),
+            "labels": dict(self.labels),
+            "priority": self.priority,
+        }
+
+    def has_interfaces(self, interfaces: Iterable[str]) -> bool:
         """Does this fixture have all of the passed interfaces."""
-        for required_interface in interfaces:
-            if required_interface not in self.interfaces:
-                return False
-        return True
+        return self.interfaces.issuperset(interfaces)
 
-    def has_labels(self, labels: List[str]) -> bool:
+    def has_labels(self, labels: Iterable[str]) -> bool:
         """Does this fixture have all of the passed labels."""
-        for required_label in labels:
-            if required_label not in self.labels.keys():
-                return False
-        return True
+        return all(required_label in self.labels for required_label in labels)
+
+    def matches_labels(self, labels: Mapping[str, str]) -> bool:
+        """Does this fixture have all of the passed label key-value pairs."""
+        return self.labels.items() >= labels.items()
 
     @classmethod
     def from_instance(
@@ -206,6 +271,78 @@ class Fixture:
         )
 
 
+class LazyFixture(Fixture):
+    """A Fixture which only creates its plugin when the plugin is first used.
+
+    Some plugins produce a lot of fixtures (e.g. one per terraform output) of
+    which only a few are ever used.  A lazy fixture keeps the metadata needed
+    for filtering and sorting, and a build callable which creates the plugin
+    on first access of .plugin.  Assigning .plugin drops the build callable.
+
+    """
+
+    __slots__ = ("_build",)
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        build: Callable[[], Any],
+        plugin_id: str,
+        instance_id: str,
+        interfaces: Iterable[str],
+        labels: Mapping[str, str],
+        priority: int,
+    ):
+        """Initialize struct contents.
+
+        Parameters:
+        -----------
+        build (Callable) : called with no arguments to create the fixture
+            plugin instance, the first time that the plugin is needed.
+
+        Other parameters match the Fixture parameters.
+
+        """
+        super().__init__(
+            plugin=None,
+            plugin_id=plugin_id,
+            instance_id=instance_id,
+            interfaces=interfaces,
+            labels=labels,
+            priority=priority,
+        )
+        self._build: Callable[[], Any] = build
+
+    @property
+    def plugin(self) -> Any:
+        """Return the plugin instance, creating it if needed."""
+        if self._build is not None:
+            build = self._build
+            self._plugin = build()
+            self._build = None
+        return self._plugin
+
+    @plugin.setter
+    def plugin(self, plugin: Any):
+        """Set the plugin instance, replacing any pending build."""
+        self._plugin = plugin
+        self._build = None
+
+    def is_built(self) -> bool:
+        """Has the plugin instance been created yet."""
+        return self._build is None
+
+    def info(self, deep: bool = False, children: bool = False) -> Dict[str, Any]:
+        """Return some dict metadata about the fixture and plugin.
+
+        A plugin which has not been built yet is only built for deep info.
+
+        """
+        if deep or self.is_built():
+            return super().info(deep=deep, children=children)
+        return {"fixture": {**self._metadata_info(), "built": False}}
+
+
 class Fixtures:
     """A managed set of Fixture objects.
 
@@ -225,6 +362,8 @@ class Fixtures:
         """Create initial empty fixtures list."""
         self._fixtures: List[Fixture] = []
         """ object List of fixtures. """
+        self._instance_indexes: Dict[str, Dict[str, Fixture]] = {}
+        """ instance_id maps per interface, built by instance_index() """
 
     def __len__(self) -> int:
         """Return how many plugin instances we have.
@@ -289,22 +428,52 @@ class Fixtures:
 
         return fixtures_info
 
-    def merge(self, merge_from: "Fixtures"):
+    def merge(self, merge_from: "Fixtures", replace_existing: bool = False):
         """Merge fixture instances from another Fixtures object into this one.
 
+        The merge is done in bulk: matching fixtures are found using a single
+        plugin_id/instance_id index of this collection, rather than searching
+        the collection for each merged fixture.  If any fixture conflicts, and
+        replace_existing is False, then nothing is merged.
+
         Parameters:
         -----------
         Merge_from (Fixtures) : fixture instance source
 
+        replace_existing (bool) : If True, then merged fixtures replace any
+            matching fixtures with the same metadata.
+
         Raises:
         -------
         May raise a KeyError if there a matching plugin is already in the
         Fixtures object.
 
         """
-        # We use the add_fixture method to centralize the logic for adding fixtures to one function
-        for fixture in merge_from:
-            self.add(fixture)
+        merged: List[Fixture] = list(self._fixtures)
+        index: Dict[Tuple[str, str], int] = {
+            (fixture.plugin_id, fixture.instance_id): i for i, fixture in enumerate(merged)
+        }
+
+        # merge in priority order, as one at a time adds used to.
+        for fixture in merge_from.to_list():
+            key = (fixture.plugin_id, fixture.instance_id)
+            try:
+                existing = index[key]
+            except KeyError:
+                index[key] = len(merged)
+                merged.append(fixture)
+                continue
+
+            if not replace_existing:
+                raise KeyError(
+                    "Fixture index already exists:"
+                    f"[plugin_id:{fixture.plugin_id}]"
+                    f"[instance_id:{fixture.instance_id}]"
+                )
+            merged[existing] = fixture
+
+        self._fixtures = merged
+        self._instance_indexes = {}
 
     # pylint: disable=too-many-arguments
     def new(
@@ -360,30 +529,77 @@ class Fixtures:
             matching plugin with the same metadata.
 
         """
-        if self.get(
-            plugin_id=fixture.plugin_id,
-            instance_id=fixture.instance_id,
-            exception_if_missing=False,
-        ):
-
-            if not replace_existing:
-                raise KeyError(
-                    "Fixture index already exists:"
-                    f"[plugin_id:{fixture.plugin_id}]"
-                    f"[instance_id:{fixture.instance_id}]"
-                )
-
-            # array index needed for replacement
-            # pylint: disable=consider-using-enumerate
-            for i in range(len(self._fixtures)):
-                if self._fixtures[i] == fixture:
-                    self._fixtures[i] = fixture
-                    return fixture
+        for i, existing in enumerate(self._fixtures):
+            if existing == fixture:
+                if not replace_existing:
+                    raise KeyError(
+                        "Fixture index already exists:"
+                        f"[plugin_id:{fixture.plugin_id}]"
+                        f"[instance_id:{fixture.instance_id}]"
+                    )
+                self._fixtures[i] = fixture
+                self._drop_instance_indexes(fixture.interfaces)
+                return fixture
 
         self._fixtures.append(fixture)
+        self._drop_instance_indexes(fixture.interfaces)
 
         return fixture
 
+    def remove(self, fixture: Fixture) -> bool:
+        """Remove the fixture matching the metadata of a fixture.
+
+        Parameters:
+        -----------
+        fixture (Fixture) : fixture to remove, matched on plugin_id and
+            instance_id.
+
+        Returns:
+        --------
+        True if a fixture was removed, False if none matched.
+
+        """
+        for i, existing in enumerate(self._fixtures):
+            if existing == fixture:
+                del self._fixtures[i]
+                self._drop_instance_indexes(existing.interfaces)
+                return True
+        return False
+
+    def instance_index(self, interface: str) -> Mapping[str, Fixture]:
+        """Return a map of instance_id to fixture, for fixtures with an interface.
+
+        This is for hot paths which look up fixtures by instance_id many
+        times, such as config formatting of output references.  The map is
+        kept until a fixture with the interface is added to the collection.
+        If more than one fixture has an instance_id, the map has the highest
+        priority one, as get() would return (priority changes made after the
+        map was built are not picked up.)
+
+        Parameters:
+        -----------
+        interface (str) : interface which the fixtures must have
+
+        Returns:
+        --------
+        Read-only Mapping of instance_id to Fixture
+
+        """
+        try:
+            index = self._instance_indexes[interface]
+        except KeyError:
+            index = {}
+            for fixture in self.to_list():
+                if interface in fixture.interfaces:
+                    index.setdefault(fixture.instance_id, fixture)
+            self._instance_indexes[interface] = index
+        return MappingProxyType(index)
+
+    def _drop_instance_indexes(self, interfaces: Iterable[str]):
+        """Forget instance_id maps for interfaces, after a fixture was added."""
+        for interface in interfaces:
+            self._instance_indexes.pop(interface, None)
+
     def get(
         self,
         plugin_id: str = "",
@@ -518,29 +734,20 @@ class Fixtures:
         filtered = Fixtures()
         for fixture in self._fixtures:
             try:
-                if interfaces:
-                    for required_interface in interfaces:
-                        if required_interface not in fixture.interfaces:
-                            raise DoesNotMatchError("does not contain required interface")
-
-                if has_labels:
-                    for required_label in has_labels:
-                        if required_label not in fixture.labels:
-                            raise DoesNotMatchError("does not contain required label")
-
-                if labels:
-                    for key, value in labels.items():
-                        if key not in fixture.labels:
-                            raise DoesNotMatchError("does not contain required label")
-                        if not fixture.labels[key] == value:
-                            raise DoesNotMatchError("required label does not match")
+                if interfaces and not fixture.has_interfaces(interfaces):
+                    raise DoesNotMatchError("does not contain required interface")
+                if has_labels and not fixture.has_labels(has_labels):
+                    raise DoesNotMatchError("does not contain required label")
+                if labels and not fixture.matches_labels(labels):
+                    raise DoesNotMatchError("required label does not match")
 
                 if plugin_id and not fixture.plugin_id == plugin_id:
                     raise DoesNotMatchError("plugin_id does not match")
                 if instance_id and not fixture.instance_id == instance_id:
                     raise DoesNotMatchError("instance_id does not match")
 
-                filtered.add(fixture, replace_existing=True)
+                # self has no duplicates, so there is no need to check them
+                filtered._fixtures.append(fixture)  # pylint: disable=protected-access
 
             except DoesNotMatchError:
                 pass
@@ -584,22 +791,12 @@ class Fixtures:
         filtered = Fixtures()
         for fixture in self._fixtures:
             try:
-                if interfaces:
-                    for required_interface in interfaces:
-                        if required_interface not in fixture.interfaces:
-                            raise DoesNotMatchError("does not contain required interface")
-
-                if has_labels:
-                    for required_label in has_labels:
-                        if required_label not in fixture.labels:
-                            raise DoesNotMatchError("does not contain required label")
-
-                if labels:
-                    for key, value in labels.items():
-                        if key not in fixture.labels:
-                            raise DoesNotMatchError("does not contain required label")
-                        if not fixture.labels[key] == value:
-                            raise DoesNotMatchError("required label does not match")
+                if interfaces and not fixture.has_interfaces(interfaces):
+                    raise DoesNotMatchError("does not contain required interface")
+                if has_labels and not fixture.has_labels(has_labels):
+                    raise DoesNotMatchError("does not contain required label")
+                if labels and not fixture.matches_labels(labels):
+                    raise DoesNotMatchError("required label does not match")
 
                 if plugin_id and not fixture.plugin_id == plugin_id:
                     raise DoesNotMatchError("plugin_id does not match")
@@ -608,7 +805,8 @@ class Fixtures:
                     raise DoesNotMatchError("instance_id does not match")
 
             except DoesNotMatchError:
-                filtered.add(fixture, replace_existing=True)
+                # self has no duplicates, so there is no need to check them
+                filtered._fixtures.append(fixture)  # pylint: disable=protected-access
 
         if exception_if_missing and len(filtered) == 0:
             raise KeyError(f"Filter found matches [{plugin_id}][{instance_id}]")
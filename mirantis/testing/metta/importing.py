@@ -2,20 +2,27 @@
 
 Dynamic python module loading
 
+Modules are imported once per resolved path for the life of the process, even
+if many configs, environments and states ask for them, and the time taken to
+import each module is kept so that slow imports can be found.
+
 """
 import os.path
 import sys
+import time
 import logging
 import importlib
 from importlib.util import spec_from_file_location, module_from_spec
 from importlib.machinery import ModuleSpec
 from types import ModuleType
-from typing import List, Union, Any
+from typing import Dict, List, Union, Any
 
 from configerus.config import Config
 from configerus.loaded import LOADED_KEY_ROOT
 from configerus.contrib.files import CONFIGERUS_PATH_KEY
 
+from .timings import global_timings, METTA_TIMINGS_CATEGORY_IMPORT
+
 logger = logging.getLogger("metta.import")
 
 METTA_IMPORT_CONFIG_LABEL = "imports"
@@ -23,12 +30,72 @@ METTA_IMPORT_CONFIG_LABEL = "imports"
 METTA_IMPORT_CONFIG_IMPORTS_KEY = LOADED_KEY_ROOT
 """ This config key is used to find modules to import """
 
+_imported_modules: Dict[str, "ImportRecord"] = {}
+""" Modules imported from config, by resolved module path """
+
+
+class ImportRecord:
+    """A module imported from config, and how long the import took."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, name: str, path: str, module: ModuleType, duration: float):
+        """Keep the import details."""
+        self.name: str = name
+        """ module name """
+        self.path: str = path
+        """ resolved module path """
+        self.module: ModuleType = module
+        """ imported module """
+        self.duration: float = duration
+        """ wall time in seconds taken to import the module """
+        self.requests: int = 1
+        """ how many times the module import was requested """
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about the import for introspection."""
+        return {
+            "name": self.name,
+            "path": self.path,
+            "duration": self.duration,
+            "requests": self.requests,
+        }
+
+
+def imported_modules() -> Dict[str, ImportRecord]:
+    """Return the modules imported from config, by resolved module path."""
+    return dict(_imported_modules)
+
+
+def imports_info(module_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Return dict data about some imported modules, by resolved module path."""
+    return {
+        path: _imported_modules[path].info() for path in module_paths if path in _imported_modules
+    }
+
+
+def _imported_elsewhere(import_name: str, module_path: str) -> ModuleType:
+    """Find a module in sys.modules under the import name, from the resolved path.
+
+    Returns:
+    --------
+    The module if it was already imported from that path, otherwise None.
+
+    """
+    module = sys.modules.get(import_name)
+    module_file = getattr(module, "__file__", None)
+    if module_file:
+        module_file = os.path.realpath(module_file)
+        # packages are imported from a folder, but their file is the __init__
+        if module_path in (module_file, os.path.dirname(module_file)):
+            return module
+    return None
+
 
 def add_imports_from_config(
     config: Config,
     label: str = METTA_IMPORT_CONFIG_LABEL,
     base: Union[str, List[Any]] = METTA_IMPORT_CONFIG_IMPORTS_KEY,
-):
+) -> List[str]:
     """Look in config for module imports.
 
     Use this if you want to dynamically import some modules defined in config.
@@ -44,15 +111,32 @@ def add_imports_from_config(
     label (str) : config label to load to search for sources
     base (str) : config key that should contain the list of sources
 
+    Returns:
+    --------
+    List of resolved module paths for the imports, @see imported_modules()
+
     """
     metta_config = config.load(label)
 
     imports_config = metta_config.get(base, default={})
 
+    module_paths: List[str] = []
     for import_name in imports_config:
         module_path = metta_config.get([base, import_name, CONFIGERUS_PATH_KEY])
+        resolved_path = os.path.realpath(module_path)
+        module_paths.append(resolved_path)
+
+        if resolved_path in _imported_modules:
+            _imported_modules[resolved_path].requests += 1
+            logger.debug("Already imported: %s : %s", import_name, module_path)
+            continue
+
+        start = time.perf_counter()
+        module = _imported_elsewhere(import_name, resolved_path)
+        if module is not None:
+            logger.debug("Already imported outside of metta: %s : %s", import_name, module_path)
 
-        if os.path.isdir(module_path):
+        elif os.path.isdir(module_path):
             module_path_dir = os.path.dirname(module_path)
             module_path_basename = os.path.basename(module_path)
             if not module_path_basename == import_name:
@@ -64,12 +148,12 @@ def add_imports_from_config(
                 )
             if module_path_dir not in sys.path:
                 sys.path.append(module_path_dir)
-            importlib.import_module(module_path_basename)
+            module = importlib.import_module(module_path_basename)
             logger.debug("Loaded package: %s : %s", module_path_basename, module_path)
 
         elif os.path.isfile(module_path):
             spec: ModuleSpec = spec_from_file_location(import_name, module_path)
-            module: ModuleType = module_from_spec(spec)
+            module = module_from_spec(spec)
             spec.loader.exec_module(module)
             logger.debug("Loaded module: %s : %s", import_name, module_path)
 
@@ -77,3 +161,13 @@ def add_imports_from_config(
             raise ValueError(
                 f"Could not import requested metta import {import_name} : {module_path}"
             )
+
+        duration = time.perf_counter() - start
+        _imported_modules[resolved_path] = ImportRecord(
+            name=import_name, path=resolved_path, module=module, duration=duration
+        )
+        global_timings.record(
+            METTA_TIMINGS_CATEGORY_IMPORT, resolved_path, duration, {"name": import_name}
+        )
+
+    return module_paths
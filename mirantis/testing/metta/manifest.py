@@ -0,0 +1,241 @@
+"""
+
+MANIFEST: an on-disk record of a discovered project.
+
+Discovery walks the file system looking for project roots and scans the
+installed package metadata for bootstrap entrypoints, for every process (each
+metta cli call, each pytest worker.)  A discover manifest records what was
+found, so that a later process can skip that work for as long as the manifest
+is still valid.
+
+The manifest records:
+
+1. the project root paths found from the start path,
+2. the config source paths with their modification times,
+3. the entrypoint values that were found for bootstraps.
+
+It is valid as long as the python executable, the start path and any pinned
+project root are the same and none of the directories involved (start path
+parents, config source paths and python package paths) have been modified.
+Adding or removing a marker file, config file or installed package changes a
+directory modification time.
+
+Writing the manifest modifies its own directory, which is often one of those
+directories (e.g. the project root) so that directory is recorded by its
+entry names, not counting the manifest, instead of by modification time.
+
+Manifests are optional, and only used if a manifest path is given.
+
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from configerus.config import Config
+from configerus.plugin import Type as ConfigerusType
+
+from .discover import METTA_PROJECT_ROOT_ENV
+
+logger = logging.getLogger("metta.manifest")
+
+METTA_DISCOVER_MANIFEST_ENV = "METTA_DISCOVER_MANIFEST"
+""" Environment variable which can give a path for the discover manifest """
+
+METTA_DISCOVER_MANIFEST_VERSION = 2
+""" Manifest format version, manifests of other versions are ignored """
+
+
+def _mtimes(paths: List[str]) -> Dict[str, int]:
+    """Get the modification time (ns) for each path, or -1 if it is missing."""
+    mtimes: Dict[str, int] = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = -1
+    return mtimes
+
+
+def _entries(path: str, manifest_name: str) -> str:
+    """Hash the entry names of a directory, skipping a manifest and its temp files."""
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return ""
+    return hashlib.sha256(
+        "\0".join(
+            sorted(
+                name
+                for name in names
+                if not (name == manifest_name or name.startswith(f".{manifest_name}."))
+            )
+        ).encode("utf8")
+    ).hexdigest()
+
+
+def _parent_paths(start_path: str) -> List[str]:
+    """List start_path and all of its parents, as searched for project roots."""
+    check_path = os.path.realpath(start_path)
+    paths: List[str] = []
+    while check_path != os.path.dirname(check_path):
+        paths.append(check_path)
+        check_path = os.path.dirname(check_path)
+    return paths
+
+
+class DiscoverManifest:
+    """A discover manifest file, which can be loaded and saved."""
+
+    def __init__(self, path: str):
+        """Keep the manifest file path.
+
+        Parameters:
+        -----------
+        path (str) : path to the manifest json file.  It doesn't have to exist.
+
+        """
+        self.path: str = path
+        """ Path to the manifest json file """
+        self.data: Dict[str, Any] = {}
+        """ Manifest data, empty if there is no valid manifest """
+
+    def load(self, start_path: str) -> bool:
+        """Load the manifest file and check that it is still valid.
+
+        Parameters:
+        -----------
+        start_path (str) : path from which the project would be discovered
+
+        Returns:
+        --------
+        True if the manifest was loaded and is valid.  If not then the
+        manifest data is emptied.
+
+        """
+        self.data = {}
+        try:
+            with open(self.path, encoding="utf8") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            logger.debug("No usable discover manifest found: %s", self.path)
+            return False
+
+        if not (
+            isinstance(data, dict)
+            and data.get("version") == METTA_DISCOVER_MANIFEST_VERSION
+            and data.get("python") == sys.executable
+            and data.get("start_path") == os.path.realpath(start_path)
+            and data.get("pinned_root") == os.environ.get(METTA_PROJECT_ROOT_ENV, "")
+        ):
+            logger.debug("Discover manifest is for a different discovery: %s", self.path)
+            return False
+
+        for key in ["parents", "sources", "site"]:
+            recorded: Dict[str, int] = data.get(key, {})
+            if _mtimes(list(recorded)) != recorded:
+                logger.debug("Discover manifest is out of date (%s): %s", key, self.path)
+                return False
+        if data.get("manifest_dir") != self._manifest_dir_entries():
+            logger.debug("Discover manifest is out of date (manifest_dir): %s", self.path)
+            return False
+
+        self.data = data
+        return True
+
+    def roots(self) -> List[str]:
+        """Return the recorded project root paths."""
+        return list(self.data.get("roots", []))
+
+    def entrypoints(self) -> Dict[str, Dict[str, str]]:
+        """Return the recorded entrypoint values, by group and name."""
+        return dict(self.data.get("entrypoints", {}))
+
+    def save(
+        self,
+        start_path: str,
+        roots: List[str],
+        config: Config,
+        entrypoints: Dict[str, Dict[str, str]],
+    ):
+        """Record a discovery, writing the manifest file if anything changed.
+
+        Parameters:
+        -----------
+        start_path (str) : path from which the project was discovered
+
+        roots (List[str]) : project root paths that were found
+
+        config (Config) : bootstrapped config, used for config source paths.
+
+        entrypoints (Dict[str, Dict[str, str]]) : entrypoint values that were
+            found, by group and name.
+
+        """
+        data = self._record(start_path, roots, config, entrypoints)
+        if data == self.data:
+            return
+
+        # write to a temporary file and move it into place so that concurrent
+        # processes never read a partial manifest
+        manifest_dir = self._manifest_dir()
+        os.makedirs(manifest_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf8",
+            dir=manifest_dir,
+            delete=False,
+            prefix=f".{os.path.basename(self.path)}.",
+        ) as manifest_file:
+            json.dump(data, manifest_file, indent=2, sort_keys=True)
+        os.replace(manifest_file.name, self.path)
+        self.data = data
+        logger.debug("Wrote discover manifest: %s", self.path)
+
+    def _manifest_dir(self) -> str:
+        """Return the real path of the directory that holds the manifest."""
+        return os.path.realpath(os.path.dirname(os.path.abspath(self.path)))
+
+    def _manifest_dir_entries(self) -> str:
+        """Hash the entry names of the manifest directory, without the manifest."""
+        return _entries(self._manifest_dir(), os.path.basename(self.path))
+
+    def _record(
+        self,
+        start_path: str,
+        roots: List[str],
+        config: Config,
+        entrypoints: Dict[str, Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Build the manifest data for a discovery."""
+        source_paths: List[str] = []
+        for instance in config.plugins.get_instances(type=ConfigerusType.SOURCE):
+            path = getattr(instance.plugin, "path", "")
+            if path:
+                source_paths.append(os.path.realpath(path))
+
+        # the manifest directory is recorded by its entries, as writing the
+        # manifest changes its modification time.
+        manifest_dir = self._manifest_dir()
+
+        def mtimes(paths: List[str]) -> Dict[str, int]:
+            """Get the modification times of paths, other than the manifest directory."""
+            return _mtimes([path for path in paths if path != manifest_dir])
+
+        return {
+            "version": METTA_DISCOVER_MANIFEST_VERSION,
+            "python": sys.executable,
+            "start_path": os.path.realpath(start_path),
+            "pinned_root": os.environ.get(METTA_PROJECT_ROOT_ENV, ""),
+            "roots": list(roots),
+            "parents": mtimes(_parent_paths(start_path)),
+            "sources": mtimes(sorted(set(source_paths))),
+            "site": mtimes(
+                [path for path in sys.path if path not in roots and os.path.isdir(path)]
+            ),
+            "manifest_dir": self._manifest_dir_entries(),
+            "entrypoints": entrypoints,
+        }
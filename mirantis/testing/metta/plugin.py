@@ -33,6 +33,8 @@ import logging
 import functools
 from typing import List, Dict, Callable, Any
 
+from .timings import global_timings, METTA_TIMINGS_CATEGORY_PLUGIN
+
 logger = logging.getLogger("metta.plugin")
 
 METTA_PLUGIN_CONFIG_KEY_PLUGIN = "plugin"
@@ -110,6 +112,12 @@ class Factory:
 
     _registry: Dict[str, PluginInstanceFactory] = {}
     """ A dict of registered factory functions."""
+    _interface_index: Dict[str, Dict[str, None]] = {}
+    """ Reverse index of interface to the plugin_ids which registered it.
+
+    The inner dict is used as an insertion ordered set, so that queries return
+    plugin_ids in registration order.
+    """
 
     def __init__(
         self, plugin_id: str, interfaces: List[str] = None, labels: Dict[str, str] = None
@@ -166,6 +174,8 @@ class Factory:
         self._registry[self._plugin_id] = PluginInstanceFactory(
             self._plugin_id, self._interfaces, self._labels, wrapper
         )
+        for interface in self._interfaces:
+            self._interface_index.setdefault(interface, {})[self._plugin_id] = None
         return wrapper
 
     @classmethod
@@ -218,7 +228,12 @@ class Factory:
                 f"Could not create Plugin instance '{plugin_id}' due to an unknown error."
             ) from err
 
-        plugin = factory.factory_method(*args, **kwargs)
+        with global_timings.timer(
+            METTA_TIMINGS_CATEGORY_PLUGIN,
+            f"{plugin_id}/{instance_id}",
+            labels={"plugin_id": plugin_id, "instance_id": instance_id},
+        ):
+            plugin = factory.factory_method(*args, **kwargs)
         return Instance(
             plugin_id=plugin_id,
             instance_id=instance_id,
@@ -233,19 +248,14 @@ class Factory:
 
         Returns:
         --------
-        A list of string registered plugin ids
+        A list of string registered plugin interfaces
 
         """
-        plugin_interfaces: List[str] = []
-        for factory in cls._registry.values():
-            for factory_interface in factory.interfaces:
-                if factory_interface not in plugin_interfaces:
-                    plugin_interfaces.append(factory_interface)
-        return plugin_interfaces
+        return list(cls._interface_index.keys())
 
     @classmethod
     def plugin_ids(cls, interfaces_filter: List[str] = None) -> List[str]:
-        """Build a generator of matching registered plugins.
+        """Build a list of matching registered plugins.
 
         Parameters:
         -----------
@@ -257,19 +267,48 @@ class Factory:
         A List of plugin ids for all matching plugins (which is all plugins
         if you passed an empty filter list)
         """
-        if interfaces_filter is None:
-            interfaces_filter = []
-
-        if len(interfaces_filter) == 0:
+        if not interfaces_filter:
             return list(cls._registry.keys())
 
-        plugin_ids: List[str] = []
-        for factory in cls._registry.values():
-            for interface_filter in interfaces_filter:
-                if interface_filter not in factory.interfaces:
-                    break
-            else:
-                # interfaces do intersect
-                plugin_ids.append(factory.plugin_id)
+        try:
+            indexes = [cls._interface_index[interface] for interface in interfaces_filter]
+        except KeyError:
+            # an interface that nothing registered can't match anything
+            return []
+
+        # walk the smallest index, checking membership in the others
+        indexes.sort(key=len)
+        smallest, others = indexes[0], indexes[1:]
+        return [plugin_id for plugin_id in smallest if all(plugin_id in index for index in others)]
+
+    @classmethod
+    def has_plugin(cls, plugin_id: str) -> bool:
+        """Return True if a plugin with the plugin_id has been registered."""
+        return plugin_id in cls._registry
+
+    @classmethod
+    def plugin_info(cls, plugin_id: str) -> Dict[str, Any]:
+        """Return registration metadata for a plugin.
+
+        The returned data is a copy, so changing it does not change the
+        registry.
 
-        return plugin_ids
+        Parameters:
+        -----------
+        plugin_id (str) : registered plugin id
+
+        Returns:
+        --------
+        Dict with the plugin_id, interfaces and labels from the registration
+
+        Raises:
+        -------
+        KeyError if no plugin has been registered with the plugin_id
+
+        """
+        registration = cls._registry[plugin_id]
+        return {
+            "plugin_id": registration.plugin_id,
+            "interfaces": list(registration.interfaces),
+            "labels": dict(registration.labels),
+        }
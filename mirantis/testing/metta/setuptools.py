@@ -8,6 +8,11 @@ Functions:
 setuptools_entrypoint: run a setuptools entrypoint to bootstrap an argument
     using code provided by any python module.
 
+Scanning the installed package metadata for entrypoints is slow, so the
+entrypoint values that have been found are kept.  They can also be seeded from
+a previous run (@see .manifest) in which case nothing is scanned unless an
+entrypoint can't be found or loaded.
+
 """
 import logging
 from typing import List, Dict, Any
@@ -18,6 +23,29 @@ logger = logging.getLogger("metta.bootstrapp")
 METTA_CONFIG_SETUPTOOLS_BOOTSTRAPS_KEY = "bootstraps"
 """Configerus .get() key for finding bootstrap entries."""
 
+_resolved_entrypoints: Dict[str, Dict[str, str]] = {}
+"""Entrypoint values (module:attr) that have been found, by entrypoint group and name."""
+
+
+def resolved_entrypoints() -> Dict[str, Dict[str, str]]:
+    """Return the entrypoint values that have been found, by group and name."""
+    return {group: dict(entries) for group, entries in _resolved_entrypoints.items()}
+
+
+def add_resolved_entrypoints(entrypoints: Dict[str, Dict[str, str]]):
+    """Seed entrypoint values, by group and name, so that they don't need to be found."""
+    for group, entries in entrypoints.items():
+        _resolved_entrypoints.setdefault(group, {}).update(entries)
+
+
+def _find_entrypoint(entrypoint: str, entry: str) -> metadata.EntryPoint:
+    """Find an entrypoint in the installed package metadata, and keep its value."""
+    for metta_ep in metadata.entry_points()[entrypoint]:
+        if metta_ep.name == entry:
+            _resolved_entrypoints.setdefault(entrypoint, {})[entry] = metta_ep.value
+            return metta_ep
+    raise KeyError(f"Bootstrap not found {entrypoint}:{entry}")
+
 
 def setuptools_entrypoint(
     entrypoint: str, entries: List[str], args: List[Any], kwargs: Dict[str, Any]
@@ -55,10 +83,13 @@ def setuptools_entrypoint(
     """
     for entry in entries:
         logger.debug("Running bootstrap entrypoint: %s=>%s ", entrypoint, entry)
-        for metta_ep in metadata.entry_points()[entrypoint]:
-            if metta_ep.name == entry:
-                plugin = metta_ep.load()
-                plugin(*args, **kwargs)
-                break
-        else:
-            raise KeyError(f"Bootstrap not found {entrypoint}:{entry}")
+        try:
+            value = _resolved_entrypoints[entrypoint][entry]
+            plugin = metadata.EntryPoint(name=entry, value=value, group=entrypoint).load()
+        except KeyError:
+            plugin = _find_entrypoint(entrypoint, entry).load()
+        except (ImportError, AttributeError):
+            # a seeded value that is out of date, so look for it again
+            logger.debug("Resolved entrypoint could not be loaded: %s=>%s ", entrypoint, entry)
+            plugin = _find_entrypoint(entrypoint, entry).load()
+        plugin(*args, **kwargs)
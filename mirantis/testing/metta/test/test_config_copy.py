@@ -0,0 +1,102 @@
+"""
+
+Test config copies which share loaded data with their parent.
+
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+import yaml
+from configerus import new_config
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+from configerus.contrib.files import PLUGIN_ID_SOURCE_PATH
+
+from mirantis.testing.metta.config import copy_config
+
+BENCHMARK_LABEL_COUNT = 10
+""" How many config labels (files) the benchmark config tree has """
+BENCHMARK_KEY_COUNT = 50
+""" How many keys each benchmark config file has """
+BENCHMARK_STATE_COUNT = 3
+""" How many copies (e.g. states) the benchmark makes of the config """
+BENCHMARK_ENV = "METTA_TEST_BENCHMARK"
+""" Environment variable which enables the timing and memory benchmark """
+
+
+def _write_tree(path: str):
+    """Write a config tree of yaml files, one per label."""
+    for label_index in range(BENCHMARK_LABEL_COUNT):
+        with open(os.path.join(path, f"label{label_index}.yml"), "w", encoding="utf8") as file:
+            yaml.safe_dump(
+                {
+                    f"key{key_index}": {"value": key_index, "list": ["a", "b", "c"]}
+                    for key_index in range(BENCHMARK_KEY_COUNT)
+                },
+                file,
+            )
+
+
+def _load_copies(config, copier) -> list:
+    """Copy the config for each state and load every label in each copy."""
+    copies = []
+    for _ in range(BENCHMARK_STATE_COUNT):
+        config_copy = copier(config)
+        for label_index in range(BENCHMARK_LABEL_COUNT):
+            config_copy.load(f"label{label_index}")
+        copies.append(config_copy)
+    return copies
+
+
+class ConfigCopyTest(unittest.TestCase):
+    """Copies share loaded label data with the parent config."""
+
+    def test_shared(self):
+        """Loaded labels are shared until the copy gets new sources."""
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "metta.yml"), "w", encoding="utf8") as file:
+                yaml.safe_dump({"name": "parent"}, file)
+            config = new_config()
+            config.add_source(PLUGIN_ID_SOURCE_PATH, "base").set_path(path)
+            loaded = config.load("metta")
+
+            config_copy = copy_config(config)
+            copy_loaded = config_copy.load("metta")
+            self.assertIs(copy_loaded.data, loaded.data)
+            self.assertIs(copy_loaded.parent, config_copy)
+
+            config_copy.add_source(PLUGIN_ID_SOURCE_DICT, "child", priority=90).set_data(
+                {"metta": {"name": "child"}}
+            )
+            self.assertEqual(config_copy.load("metta").get("name"), "child")
+            self.assertEqual(config.load("metta").get("name"), "parent")
+
+    @unittest.skipUnless(os.environ.get(BENCHMARK_ENV), f"set {BENCHMARK_ENV} to benchmark")
+    def test_benchmark(self):
+        """Copies of a large config tree are faster and smaller than plain copies."""
+        with tempfile.TemporaryDirectory() as path:
+            _write_tree(path)
+            config = new_config()
+            config.add_source(PLUGIN_ID_SOURCE_PATH, "tree").set_path(path)
+            for label_index in range(BENCHMARK_LABEL_COUNT):
+                config.load(f"label{label_index}")
+
+            results = {}
+            for name, copier in [("plain", lambda config: config.copy()), ("shared", copy_config)]:
+                tracemalloc.start()
+                start = time.perf_counter()
+                copies = _load_copies(config, copier)
+                duration = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results[name] = (duration, peak)
+                del copies
+
+        self.assertLess(results["shared"][0], results["plain"][0])
+        self.assertLess(results["shared"][1], results["plain"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+
+Test project root discovery.
+
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mirantis.testing.metta.discover import (
+    clear_project_roots_cache,
+    find_project_roots,
+    METTA_PROJECT_ROOT_ENV,
+)
+
+
+class FindProjectRootsTest(unittest.TestCase):
+    """Memoized and pinned project root discovery."""
+
+    def setUp(self):
+        """Write a project with a nested folder to discover from."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.project = os.path.realpath(self.tmpdir.name)
+        with open(os.path.join(self.project, "metta.yml"), "w", encoding="utf8") as metta_file:
+            metta_file.write("environments: {}\n")
+        self.start_path = os.path.join(self.project, "a", "b", "c")
+        os.makedirs(self.start_path)
+        clear_project_roots_cache()
+
+    def tearDown(self):
+        """Remove the project."""
+        clear_project_roots_cache()
+        self.tmpdir.cleanup()
+
+    def test_memoized(self):
+        """The file system is searched once per start path and marker files."""
+        with mock.patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+            self.assertEqual(find_project_roots(self.start_path), [self.project])
+            searched = isfile.call_count
+            self.assertGreater(searched, 0)
+
+            self.assertEqual(find_project_roots(self.start_path), [self.project])
+            self.assertEqual(
+                find_project_roots(os.path.join(self.start_path, "..", "c")), [self.project]
+            )
+            self.assertEqual(isfile.call_count, searched)
+
+            # different marker files are a different search
+            self.assertEqual(find_project_roots(self.start_path, ["other.yml"]), [])
+            self.assertGreater(isfile.call_count, searched)
+
+        # the cache is not handed out for changing
+        find_project_roots(self.start_path).append("changed")
+        self.assertEqual(find_project_roots(self.start_path), [self.project])
+
+    def test_pinned(self):
+        """A pinned project root skips the search."""
+        with mock.patch.dict(os.environ, {METTA_PROJECT_ROOT_ENV: self.start_path}):
+            with mock.patch("os.path.isfile") as isfile:
+                self.assertEqual(find_project_roots(self.project), [self.start_path])
+                isfile.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+
+Unit testing for lazy fixtures
+
+Lazy fixtures only create their plugin when it is first used.
+
+"""
+
+import unittest
+from typing import List
+
+from mirantis.testing.metta.plugin import Factory
+from mirantis.testing.metta.environment import Environment
+from mirantis.testing.metta.fixture import LazyFixture
+
+LAZY_PLUGIN_ID: str = "lazy_fixture_test"
+LAZY_PLUGIN_INTERFACES: List[str] = ["lazy"]
+LAZY_PLUGIN_BUILDS: List[str] = []
+""" instance_ids of the lazy test plugins that have been created """
+
+
+class LazyTestPlugin:
+    """testing plugin class which records its creation."""
+
+    def __init__(self, environment: Environment, instance_id: str, value: str):
+        """Keep the value and record that we were created."""
+        self._environment: Environment = environment
+        self.instance_id: str = instance_id
+        self.value: str = value
+        LAZY_PLUGIN_BUILDS.append(instance_id)
+
+
+@Factory(plugin_id=LAZY_PLUGIN_ID, interfaces=LAZY_PLUGIN_INTERFACES, labels={"lazy": "yes"})
+def lazy_test_factory(environment: Environment, instance_id: str, value: str) -> LazyTestPlugin:
+    """Create a lazy test plugin object."""
+    return LazyTestPlugin(environment, instance_id, value)
+
+
+class TestLazyFixture(unittest.TestCase):
+    """Unit tests for LazyFixture and Environment.new_lazy_fixture."""
+
+    def setUp(self):
+        """Start with no recorded builds."""
+        LAZY_PLUGIN_BUILDS.clear()
+
+    def test_lazy_fixture(self):
+        """The plugin is built once, on first access."""
+        builds: List[str] = []
+        fixture = LazyFixture(
+            build=lambda: builds.append("built") or "plugin",
+            plugin_id=LAZY_PLUGIN_ID,
+            instance_id="one",
+            interfaces=LAZY_PLUGIN_INTERFACES,
+            labels={},
+            priority=50,
+        )
+
+        self.assertFalse(fixture.is_built())
+        self.assertFalse(fixture.info()["fixture"]["built"])
+        self.assertEqual(builds, [])
+
+        self.assertEqual(fixture.plugin, "plugin")
+        self.assertEqual(fixture.plugin, "plugin")
+        self.assertEqual(builds, ["built"])
+        self.assertTrue(fixture.is_built())
+
+        fixture.plugin = "replaced"
+        self.assertEqual(fixture.plugin, "replaced")
+
+    def test_lazy_fixture_set_before_build(self):
+        """Setting the plugin skips the build."""
+        fixture = LazyFixture(
+            build=lambda: self.fail("should not be built"),
+            plugin_id=LAZY_PLUGIN_ID,
+            instance_id="one",
+            interfaces=LAZY_PLUGIN_INTERFACES,
+            labels={},
+            priority=50,
+        )
+        fixture.plugin = "set"
+        self.assertEqual(fixture.plugin, "set")
+
+    def test_new_lazy_fixture(self):
+        """Lazy environment fixtures can be filtered without building plugins."""
+        environment = Environment(config=None, instance_id="lazy_env")
+        for index in range(100):
+            environment.new_lazy_fixture(
+                plugin_id=LAZY_PLUGIN_ID,
+                instance_id=f"output_{index}",
+                priority=50,
+                arguments={"value": str(index)},
+                labels={"index": str(index)},
+            )
+
+        fixtures = environment.fixtures().filter(interfaces=LAZY_PLUGIN_INTERFACES)
+        self.assertEqual(len(fixtures), 100)
+        fixture = fixtures.get(instance_id="output_7")
+        self.assertEqual(
+            dict(fixture.labels), {"lazy": "yes", "index": "7", "environment": "lazy_env"}
+        )
+        self.assertEqual(LAZY_PLUGIN_BUILDS, [])
+
+        plugin = environment.fixtures().get_plugin(instance_id="output_7")
+        self.assertEqual(plugin.value, "7")
+        self.assertIs(plugin._environment, environment)  # pylint: disable=protected-access
+        self.assertEqual(LAZY_PLUGIN_BUILDS, ["output_7"])
+
+        with self.assertRaises(NotImplementedError):
+            environment.new_lazy_fixture(plugin_id="not_registered", instance_id="x", priority=50)
+
+
+if __name__ == "__main__":
+    unittest.main()
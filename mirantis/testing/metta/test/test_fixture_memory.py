@@ -0,0 +1,144 @@
+"""
+
+Unit testing for lean Fixture records
+
+Test that fixture metadata is immutable, that matching works against the
+frozen metadata, and that a large number of fixtures uses less memory than
+the old dict-backed struct did.
+
+"""
+
+import unittest
+import tracemalloc
+from typing import Any, Dict, List
+
+from mirantis.testing.metta.fixture import Fixture
+
+BENCHMARK_FIXTURE_COUNT = 10000
+""" How many fixtures the memory benchmark creates """
+
+
+class DictFixture:
+    """Reproduction of the old dict-backed fixture struct, for comparison."""
+
+    # pylint: disable=too-many-arguments, too-few-public-methods
+    def __init__(
+        self,
+        plugin: Any,
+        plugin_id: str,
+        instance_id: str,
+        interfaces: List[str],
+        labels: Dict[str, str],
+        priority: int,
+    ):
+        """Initialize struct contents the old way."""
+        self.plugin_id = plugin_id
+        self.instance_id = instance_id
+        self.interfaces = interfaces
+        self.labels = labels
+        self.priority = priority
+        self.plugin = plugin
+
+
+def _traced_fixtures_size(fixture_class, instance_ids: List[str]) -> int:
+    """Create a fixture per instance_id and return how much memory they hold."""
+    interfaces = ["output", "dict"]
+    tracemalloc.start()
+    try:
+        fixtures = [
+            fixture_class(
+                plugin=None,
+                plugin_id="output_dict",
+                instance_id=instance_id,
+                interfaces=interfaces,
+                labels={"container": "terraform"},
+                priority=70,
+            )
+            for instance_id in instance_ids
+        ]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del fixtures
+    return size
+
+
+class TestFixtureRecord(unittest.TestCase):
+    """Unit tests for the Fixture struct metadata."""
+
+    def test_metadata_is_frozen(self):
+        """Fixture metadata is a copy, and can't be changed."""
+        interfaces = ["one", "two"]
+        labels = {"a": "1"}
+        fixture = Fixture(
+            plugin=None,
+            plugin_id="frozen",
+            instance_id="frozen",
+            interfaces=interfaces,
+            labels=labels,
+            priority=50,
+        )
+
+        interfaces.append("three")
+        labels["b"] = "2"
+        self.assertEqual(fixture.interfaces, frozenset(["one", "two"]))
+        self.assertEqual(dict(fixture.labels), {"a": "1"})
+
+        with self.assertRaises(TypeError):
+            fixture.labels["c"] = "3"
+        with self.assertRaises(AttributeError):
+            fixture.something_else = True
+
+        # priority is allowed to be changed
+        fixture.priority = 60
+        self.assertEqual(fixture.priority, 60)
+
+        info = fixture.info()["fixture"]
+        self.assertEqual(info["interfaces"], ["one", "two"])
+        self.assertEqual(info["labels"], {"a": "1"})
+
+    def test_metadata_matching(self):
+        """Subset checks work against the frozen metadata."""
+        fixture = Fixture(
+            plugin=None,
+            plugin_id="match",
+            instance_id="match",
+            interfaces=["one", "two"],
+            labels={"a": "1", "b": "2"},
+            priority=50,
+        )
+
+        self.assertTrue(fixture.has_interfaces(["one"]))
+        self.assertTrue(fixture.has_interfaces(["one", "two"]))
+        self.assertFalse(fixture.has_interfaces(["one", "three"]))
+        self.assertTrue(fixture.has_labels(["a", "b"]))
+        self.assertFalse(fixture.has_labels(["c"]))
+        self.assertTrue(fixture.matches_labels({"a": "1"}))
+        self.assertFalse(fixture.matches_labels({"a": "2"}))
+        self.assertFalse(fixture.matches_labels({"c": "1"}))
+
+    def test_metadata_is_shared(self):
+        """Fixtures with the same metadata share the frozen objects."""
+        first = Fixture(None, "shared", "first", ["one"], {"a": "1"}, 50)
+        second = Fixture(None, "shared", "second", ["one"], {"a": "1"}, 50)
+
+        self.assertIs(first.interfaces, second.interfaces)
+        self.assertIs(first.labels, second.labels)
+
+    def test_memory_benchmark(self):
+        """Many fixtures take less memory than the dict-backed struct did."""
+        instance_ids = [f"output_{i}" for i in range(BENCHMARK_FIXTURE_COUNT)]
+
+        dict_size = _traced_fixtures_size(DictFixture, instance_ids)
+        slots_size = _traced_fixtures_size(Fixture, instance_ids)
+
+        self.assertLess(
+            slots_size,
+            dict_size / 2,
+            f"{BENCHMARK_FIXTURE_COUNT} fixtures: "
+            f"dict-backed {dict_size} bytes, slots {slots_size} bytes",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+
+Unit testing for merging Fixtures collections
+
+"""
+
+import unittest
+
+from mirantis.testing.metta.fixture import Fixture, Fixtures
+
+
+def _fixtures(plugin_id: str, instance_ids: list, priority: int = 50, plugin=None) -> Fixtures:
+    """Make a Fixtures collection with a fixture per instance_id."""
+    fixtures = Fixtures()
+    for instance_id in instance_ids:
+        fixtures.add(
+            Fixture(
+                plugin=plugin,
+                plugin_id=plugin_id,
+                instance_id=instance_id,
+                interfaces=["merge"],
+                labels={},
+                priority=priority,
+            )
+        )
+    return fixtures
+
+
+class TestFixturesMerge(unittest.TestCase):
+    """Unit tests for Fixtures.merge."""
+
+    def test_merge(self):
+        """Merged fixtures are all available and in priority order."""
+        target = _fixtures("merge", ["one", "two"], priority=20)
+        target.merge(_fixtures("merge", ["three", "four"], priority=80))
+
+        self.assertEqual(len(target), 4)
+        self.assertEqual(
+            [fixture.instance_id for fixture in target], ["three", "four", "one", "two"]
+        )
+        self.assertEqual(target.get(instance_id="one").priority, 20)
+
+    def test_merge_conflict(self):
+        """A conflicting merge raises and leaves the target alone."""
+        target = _fixtures("merge", ["one", "two"])
+
+        with self.assertRaises(KeyError):
+            target.merge(_fixtures("merge", ["three", "two"]))
+        self.assertEqual(len(target), 2)
+        self.assertIsNone(target.get(instance_id="three", exception_if_missing=False))
+
+        # same instance_id for a different plugin is not a conflict
+        target.merge(_fixtures("other", ["two"]))
+        self.assertEqual(len(target), 3)
+
+    def test_merge_replace(self):
+        """A replacing merge swaps out the matching fixtures."""
+        target = _fixtures("merge", ["one", "two"], plugin="old")
+        target.merge(_fixtures("merge", ["two", "three"], plugin="new"), replace_existing=True)
+
+        self.assertEqual(len(target), 3)
+        self.assertEqual(target.get_plugin(instance_id="one"), "old")
+        self.assertEqual(target.get_plugin(instance_id="two"), "new")
+        self.assertEqual(target.get_plugin(instance_id="three"), "new")
+
+    def test_merge_large(self):
+        """Merging large collections keeps order, and conflicts merge nothing."""
+        count = 2000
+        target = _fixtures("merge", [f"target_{i}" for i in range(count)], priority=20)
+        target.merge(_fixtures("merge", [f"source_{i}" for i in range(count)], priority=80))
+
+        self.assertEqual(len(target), 2 * count)
+        instance_ids = [fixture.instance_id for fixture in target]
+        self.assertEqual(
+            instance_ids,
+            [f"source_{i}" for i in range(count)] + [f"target_{i}" for i in range(count)],
+        )
+
+        # the conflict comes after many new fixtures, none of which are merged
+        with self.assertRaises(KeyError):
+            target.merge(
+                _fixtures("merge", [f"extra_{i}" for i in range(count)] + [f"target_{count - 1}"])
+            )
+        self.assertEqual([fixture.instance_id for fixture in target], instance_ids)
+
+        # replaced fixtures keep their place
+        target.merge(
+            _fixtures(
+                "merge", [f"target_{i}" for i in range(0, count, 2)], priority=20, plugin="new"
+            ),
+            replace_existing=True,
+        )
+        self.assertEqual([fixture.instance_id for fixture in target], instance_ids)
+        self.assertEqual(target.get(instance_id="target_0").plugin, "new")
+        self.assertIsNone(target.get(instance_id="target_1").plugin)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+
+Test importing python modules from config.
+
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+from configerus import new_config
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+
+from mirantis.testing.metta import importing
+from mirantis.testing.metta.environment import FixtureBuilderEnvironment
+from mirantis.testing.metta.importing import add_imports_from_config, imported_modules
+
+MODULE_SOURCE = """
+with open({log!r}, "a", encoding="utf8") as log:
+    log.write(__name__ + "\\n")
+"""
+""" Module contents which log each time that the module is executed """
+
+
+class ImportingTest(unittest.TestCase):
+    """Imports from config are de-duplicated and timed."""
+
+    def setUp(self):
+        """Write a module file and a package, and config which imports both."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.realpath(self.tmpdir.name)
+        self.log = os.path.join(path, "imports.log")
+
+        self.module_path = os.path.join(path, "metta_test_module.py")
+        with open(self.module_path, "w", encoding="utf8") as module_file:
+            module_file.write(MODULE_SOURCE.format(log=self.log))
+        self.package_path = os.path.join(path, "metta_test_package")
+        os.makedirs(self.package_path)
+        with open(os.path.join(self.package_path, "__init__.py"), "w", encoding="utf8") as init:
+            init.write(MODULE_SOURCE.format(log=self.log))
+
+        self.config = new_config()
+        self.config.add_source(PLUGIN_ID_SOURCE_DICT, "imports").set_data(
+            {
+                "metta": {
+                    "imports": {
+                        "metta_test_module": {"path": self.module_path},
+                        "metta_test_package": {"path": self.package_path},
+                    },
+                },
+            }
+        )
+
+    def tearDown(self):
+        """Forget the imported modules."""
+        # pylint: disable=protected-access
+        for path in [self.module_path, self.package_path]:
+            importing._imported_modules.pop(path, None)
+        sys.modules.pop("metta_test_package", None)
+        if os.path.dirname(self.package_path) in sys.path:
+            sys.path.remove(os.path.dirname(self.package_path))
+        self.tmpdir.cleanup()
+
+    def _executed(self):
+        """Return the names of modules executed, in order."""
+        with open(self.log, encoding="utf8") as log:
+            return log.read().split()
+
+    def test_deduplicated(self):
+        """Each module is imported once, however many configs ask for it."""
+        paths = add_imports_from_config(self.config, label="metta", base="imports")
+        self.assertEqual(paths, [self.module_path, self.package_path])
+        add_imports_from_config(self.config.copy(), label="metta", base="imports")
+        add_imports_from_config(self.config, label="metta", base="imports")
+
+        self.assertEqual(self._executed(), ["metta_test_module", "metta_test_package"])
+        records = imported_modules()
+        self.assertEqual(records[self.module_path].requests, 3)
+        self.assertEqual(records[self.package_path].name, "metta_test_package")
+        self.assertGreater(records[self.module_path].duration, 0)
+
+    def test_environment_info(self):
+        """Environment deep info shows the imports with their timing."""
+        environment = FixtureBuilderEnvironment(self.config, "imports", label="metta")
+        self.assertNotIn("imports", environment.info())
+
+        imports_info = environment.info(deep=True)["imports"]
+        self.assertEqual(list(imports_info), [self.module_path, self.package_path])
+        self.assertEqual(imports_info[self.module_path]["name"], "metta_test_module")
+        self.assertIn("duration", imports_info[self.package_path])
+
+
+if __name__ == "__main__":
+    unittest.main()
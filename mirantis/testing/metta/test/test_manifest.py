@@ -0,0 +1,132 @@
+"""
+
+Test project bootstrapping with a discover manifest.
+
+"""
+import json
+import os
+import tempfile
+import unittest
+from importlib import metadata
+from unittest import mock
+
+import yaml
+from configerus import new_config
+
+# make sure that the files source plugin is registered
+import configerus.contrib.files  # pylint: disable=unused-import
+
+from mirantis.testing.metta import bootstrap, setuptools
+from mirantis.testing.metta.bootstrap import METTA_ENTRYPOINT_BOOTSTRAPPER, project_bootstrap
+from mirantis.testing.metta.discover import clear_project_roots_cache
+
+NOOP_ENTRYPOINT = metadata.EntryPoint(
+    name="noop", value="logging:debug", group=METTA_ENTRYPOINT_BOOTSTRAPPER
+)
+""" A bootstrapper entrypoint which can be called with the builder and does nothing """
+
+
+class DiscoverManifestTest(unittest.TestCase):
+    """Warm starts from a discover manifest."""
+
+    def setUp(self):
+        """Write a project with a sub-folder to discover from."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.project = os.path.realpath(self.tmpdir.name)
+        with open(os.path.join(self.project, "metta.yml"), "w", encoding="utf8") as metta_file:
+            yaml.safe_dump({"bootstraps": ["noop"], "environments": {}}, metta_file)
+        self.start_path = os.path.join(self.project, "tests")
+        os.makedirs(self.start_path)
+        self.manifest = os.path.join(self.project, ".metta_manifest.json")
+
+        # pylint: disable=protected-access
+        self.resolved = dict(setuptools._resolved_entrypoints)
+        setuptools._resolved_entrypoints.clear()
+
+    def tearDown(self):
+        """Remove the project and restore the resolved entrypoints."""
+        # pylint: disable=protected-access
+        setuptools._resolved_entrypoints.clear()
+        setuptools._resolved_entrypoints.update(self.resolved)
+        self.tmpdir.cleanup()
+
+    def _bootstrap(self):
+        """Bootstrap the project as a new process would, returning call mocks."""
+        setuptools._resolved_entrypoints.clear()  # pylint: disable=protected-access
+        clear_project_roots_cache()
+        config = new_config()
+        with mock.patch.object(
+            setuptools.metadata,
+            "entry_points",
+            return_value={METTA_ENTRYPOINT_BOOTSTRAPPER: [NOOP_ENTRYPOINT]},
+        ) as entry_points, mock.patch.object(
+            bootstrap, "find_project_roots", wraps=bootstrap.find_project_roots
+        ) as find_project_roots:
+            project_bootstrap(config, "bootstrapper", path=self.start_path, manifest=self.manifest)
+        return entry_points, find_project_roots
+
+    def test_warm_start(self):
+        """A valid manifest skips the root search and the entrypoint scan."""
+        entry_points, find_project_roots = self._bootstrap()
+        entry_points.assert_called()
+        find_project_roots.assert_called_once()
+
+        with open(self.manifest, encoding="utf8") as manifest_file:
+            manifest = json.load(manifest_file)
+        self.assertEqual(manifest["roots"], [self.project])
+        self.assertEqual(
+            manifest["entrypoints"], {METTA_ENTRYPOINT_BOOTSTRAPPER: {"noop": "logging:debug"}}
+        )
+        manifest_mtime = os.stat(self.manifest).st_mtime_ns
+        # the manifest is moved into place, leaving no temporary files behind
+        self.assertEqual(
+            sorted(os.listdir(self.project)), [".metta_manifest.json", "metta.yml", "tests"]
+        )
+
+        entry_points, find_project_roots = self._bootstrap()
+        entry_points.assert_not_called()
+        find_project_roots.assert_not_called()
+        # nothing changed so the manifest is not written again
+        self.assertEqual(os.stat(self.manifest).st_mtime_ns, manifest_mtime)
+
+    def test_invalidated(self):
+        """Changing the project invalidates the manifest."""
+        self._bootstrap()
+
+        # a new marker file closer to the start path is a new project root
+        with open(os.path.join(self.start_path, "metta.yml"), "w", encoding="utf8") as metta_file:
+            yaml.safe_dump({"environments": {}}, metta_file)
+
+        entry_points, find_project_roots = self._bootstrap()
+        entry_points.assert_called()
+        find_project_roots.assert_called_once()
+        with open(self.manifest, encoding="utf8") as manifest_file:
+            self.assertEqual(json.load(manifest_file)["roots"], [self.start_path, self.project])
+
+    def test_manifest_dir_changed(self):
+        """Adding a file beside the manifest invalidates it."""
+        self._bootstrap()
+        with open(os.path.join(self.project, "other.yml"), "w", encoding="utf8") as other_file:
+            yaml.safe_dump({}, other_file)
+
+        _, find_project_roots = self._bootstrap()
+        find_project_roots.assert_called_once()
+
+        _, find_project_roots = self._bootstrap()
+        find_project_roots.assert_not_called()
+
+    def test_stale_entrypoint(self):
+        """A recorded entrypoint which can't be loaded is looked for again."""
+        self._bootstrap()
+        with open(self.manifest, encoding="utf8") as manifest_file:
+            manifest = json.load(manifest_file)
+        manifest["entrypoints"][METTA_ENTRYPOINT_BOOTSTRAPPER]["noop"] = "logging:missing"
+        with open(self.manifest, "w", encoding="utf8") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        entry_points, _ = self._bootstrap()
+        entry_points.assert_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
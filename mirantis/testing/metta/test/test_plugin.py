@@ -124,3 +124,31 @@ class test_plugin_interface_filter(unittest.TestCase):
         self.assertNotIn("test_1", ids_for_3)
         self.assertIn("test_2", ids_for_3)
         self.assertIn("test_3", ids_for_3)
+
+        ids_for_1_3 = Factory.plugin_ids(interfaces_filter=["1", "3"])
+        self.assertEqual(ids_for_1_3, ["test_2"])
+        self.assertEqual(Factory.plugin_ids(interfaces_filter=["not-registered"]), [])
+
+    def test_plugin_info(self):
+        """Test that plugin registration info is available, and is a copy."""
+
+        @Factory(plugin_id="test_info", interfaces=["info"], labels={"a": "b"})
+        def my_test_plugin_factory(testcase):
+            """Inline disposable factory."""
+            return TestPlugin(testcase)
+
+        self.assertTrue(Factory.has_plugin("test_info"))
+        self.assertFalse(Factory.has_plugin("test_info_missing"))
+
+        info = Factory.plugin_info("test_info")
+        self.assertEqual(info["interfaces"], ["info"])
+        self.assertEqual(info["labels"], {"a": "b"})
+
+        info["interfaces"].append("changed")
+        info["labels"]["c"] = "d"
+        self.assertEqual(Factory.plugin_info("test_info")["interfaces"], ["info"])
+        self.assertNotIn("c", Factory.plugin_info("test_info")["labels"])
+        self.assertIn("info", Factory.interfaces())
+
+        with self.assertRaises(KeyError):
+            Factory.plugin_info("test_info_missing")
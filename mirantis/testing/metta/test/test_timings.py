@@ -0,0 +1,66 @@
+"""
+
+Unit testing for the optional timing instrumentation.
+
+"""
+import unittest
+
+from mirantis.testing.metta.plugin import Factory
+from mirantis.testing.metta.timings import (
+    global_timings,
+    Timings,
+    METTA_TIMINGS_CATEGORY_PLUGIN,
+)
+
+
+class TestTimings(unittest.TestCase):
+    """Test timing collection."""
+
+    def test_disabled_records_nothing(self):
+        """A disabled timings object ignores timers."""
+        timings = Timings(enabled=False)
+        with timings.timer("test", "one"):
+            pass
+        timings.record("test", "two", 1.0)
+        self.assertEqual(timings.records(), [])
+
+    def test_aggregation(self):
+        """Repeated timers aggregate per category/key."""
+        timings = Timings(enabled=True)
+        timings.record("test", "one", 1.0)
+        timings.record("test", "one", 3.0)
+        timings.record("test", "two", 2.0)
+        timings.record("other", "one", 0.5)
+
+        records = timings.records(category="test")
+        self.assertEqual([record.key for record in records], ["one", "two"])
+        self.assertEqual(records[0].count, 2)
+        self.assertEqual(records[0].total, 4.0)
+        self.assertEqual(records[0].max, 3.0)
+        self.assertEqual(records[0].last, 3.0)
+        self.assertEqual(records[0].mean(), 2.0)
+        self.assertEqual(len(timings.records()), 3)
+
+    def test_factory_create_is_timed(self):
+        """Factory.create records construction per plugin_id and instance_id."""
+        plugin_id = "test_timings_plugin"
+
+        @Factory(plugin_id=plugin_id)
+        def factory():
+            """Inline disposable factory."""
+            return object()
+
+        global_timings.enable()
+        try:
+            Factory.create(plugin_id, "timed")
+        finally:
+            global_timings.disable()
+
+        records = [
+            record
+            for record in global_timings.records(category=METTA_TIMINGS_CATEGORY_PLUGIN)
+            if record.labels["plugin_id"] == plugin_id
+        ]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].labels["instance_id"], "timed")
+        self.assertEqual(records[0].count, 1)
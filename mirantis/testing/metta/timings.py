@@ -0,0 +1,180 @@
+"""
+
+Optional timing instrumentation for metta internals.
+
+Slow environment startup is usually caused by one or two plugins that are
+expensive to construct, or by heavy config loading and validation.  This
+module keeps aggregated wall-clock timings for such operations so that they
+can be inspected without attaching a profiler.
+
+Instrumentation is off by default, and costs a single boolean check per timed
+operation when it is off.  Enable it by setting the METTA_TIMINGS environment
+variable to a non-empty value, or by calling global_timings.enable() before
+bootstrapping.
+
+The timings object lives here rather than in .globals, as .plugin needs it
+and .globals already imports (indirectly) from .plugin.
+
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterator
+
+logger = logging.getLogger("metta.timings")
+
+METTA_TIMINGS_ENV_VAR = "METTA_TIMINGS"
+"""Environment variable which enables timing instrumentation if not empty."""
+
+METTA_TIMINGS_CATEGORY_PLUGIN = "plugin"
+"""Timing category for plugin factory construction (Factory.create)."""
+METTA_TIMINGS_CATEGORY_FIXTURE = "fixture"
+"""Timing category for building a fixture in an environment (new_fixture)."""
+METTA_TIMINGS_CATEGORY_CONFIG_LOAD = "config.load"
+"""Timing category for configerus loads made when building fixtures."""
+METTA_TIMINGS_CATEGORY_CONFIG_VALIDATE = "config.validate"
+"""Timing category for configerus validation made when building fixtures."""
+METTA_TIMINGS_CATEGORY_IMPORT = "import"
+"""Timing category for python modules imported from config (add_imports_from_config)."""
+
+
+class DurationStats:
+    """Constant size aggregate of timed durations.
+
+    Keeps a count, total, longest and most recent duration, so that recording
+    costs the same no matter how many durations have been recorded.  This is
+    shared by the timings here and other duration metrics such as the health
+    poll latency histograms.
+
+    """
+
+    def __init__(self):
+        """Start with no durations."""
+        self.count: int = 0
+        """How many durations were added."""
+        self.total: float = 0.0
+        """Sum of all added durations."""
+        self.max: float = 0.0
+        """Longest added duration."""
+        self.last: float = 0.0
+        """Most recent added duration."""
+
+    def add(self, duration: float):
+        """Add a timed duration."""
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    def mean(self) -> float:
+        """Return the mean of the added durations."""
+        return self.total / self.count if self.count else 0.0
+
+
+class TimingRecord(DurationStats):
+    """Aggregate timing for a single category/key combination."""
+
+    def __init__(self, category: str, key: str, labels: Dict[str, str] = None):
+        """Start an empty record.
+
+        Parameters:
+        -----------
+        category (str) : what kind of operation was timed.
+        key (str) : unique identifier for the timed subject in the category.
+        labels (Dict[str, str]) : descriptive metadata such as plugin_id and
+            instance_id.
+
+        """
+        super().__init__()
+        self.category: str = category
+        self.key: str = key
+        self.labels: Dict[str, str] = labels if labels is not None else {}
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about the record for introspection."""
+        return {
+            "category": self.category,
+            "key": self.key,
+            "labels": self.labels,
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+
+class Timings:
+    """A collection of TimingRecord objects, keyed on category and key."""
+
+    def __init__(self, enabled: bool = False):
+        """Create an empty timings collection."""
+        self.enabled: bool = enabled
+        """If False then timer() and record() do nothing."""
+        self._records: Dict[str, Dict[str, TimingRecord]] = {}
+        """Records per category, per key."""
+
+    def enable(self):
+        """Turn on timing collection."""
+        self.enabled = True
+
+    def disable(self):
+        """Turn off timing collection, keeping any existing records."""
+        self.enabled = False
+
+    def reset(self):
+        """Remove all records."""
+        self._records = {}
+
+    def record(self, category: str, key: str, duration: float, labels: Dict[str, str] = None):
+        """Add a duration for a category/key, if timing is enabled."""
+        if not self.enabled:
+            return
+
+        category_records = self._records.setdefault(category, {})
+        try:
+            timing_record = category_records[key]
+        except KeyError:
+            timing_record = category_records[key] = TimingRecord(category, key, labels)
+        timing_record.add(duration)
+
+    @contextmanager
+    def timer(self, category: str, key: str, labels: Dict[str, str] = None) -> Iterator[None]:
+        """Time the wrapped block and record it under the category/key.
+
+        e.g.
+
+            with global_timings.timer("plugin", plugin_id):
+                do_something_slow()
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(category, key, time.perf_counter() - start, labels)
+
+    def records(self, category: str = "") -> List[TimingRecord]:
+        """Return records, optionally only for one category, slowest total first."""
+        if category:
+            found = list(self._records.get(category, {}).values())
+        else:
+            found = [rec for recs in self._records.values() for rec in recs.values()]
+        return sorted(found, key=lambda rec: rec.total, reverse=True)
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about all records for introspection."""
+        return {
+            "enabled": self.enabled,
+            "categories": {
+                category: {key: rec.info() for key, rec in recs.items()}
+                for category, recs in self._records.items()
+            },
+        }
+
+
+global_timings: Timings = Timings(enabled=bool(os.environ.get(METTA_TIMINGS_ENV_VAR, "")))
+""" Timings collected across the metta session """
@@ -17,6 +17,7 @@ from configerus.loaded import Loaded, LOADED_KEY_ROOT
 
 from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta_common.files import write_if_changed
 
 from .ansiblecli_client import (
     METTA_ANSIBLE_ANSIBLECLI_CORECLIENT_PLUGIN_ID,
@@ -279,7 +280,11 @@ class AnsiblePlaybookProvisionerPlugin:
         self.fixtures.add(fixture, replace_existing=True)
 
     def _update_config(self):
-        """Update config and write the cfg and inventory files."""
+        """Update config and write the cfg and inventory files.
+
+        Files are only written if their contents have changed.
+
+        """
         # refresh any loaded config
         plugin_config = self._environment.config().load(self._config_label, force_reload=True)
 
@@ -295,9 +300,7 @@ class AnsiblePlaybookProvisionerPlugin:
             # ansible doesn't like how toml keeps some quotes - so we have to do this ourselves.
             ansiblecfg_contents = toml.dumps(ansiblecfg_contents)
             ansiblecfg_contents = ansiblecfg_contents.replace('"', "")
-            os.makedirs(os.path.dirname(os.path.realpath(ansiblecfg_path)), exist_ok=True)
-            with open(ansiblecfg_path, "w", encoding="utf8") as ansiblecfg_fileobject:
-                ansiblecfg_fileobject.write(ansiblecfg_contents)
+            write_if_changed(ansiblecfg_path, ansiblecfg_contents)
 
         else:
             if ansiblecfg_path and os.path.exists(ansiblecfg_path):
@@ -312,9 +315,7 @@ class AnsiblePlaybookProvisionerPlugin:
             default="",
         )
         if inventory_contents:
-            os.makedirs(os.path.dirname(os.path.realpath(inventory_path)), exist_ok=True)
-            with open(inventory_path, "w", encoding="utf8") as inventory_fileobject:
-                inventory_fileobject.write(inventory_contents)
+            write_if_changed(inventory_path, inventory_contents)
         else:
             if inventory_path and os.path.exists(inventory_path):
                 os.remove(inventory_path)
@@ -328,9 +329,7 @@ class AnsiblePlaybookProvisionerPlugin:
             default="",
         )
         if playbook_contents:
-            os.makedirs(os.path.dirname(os.path.realpath(playbook_path)), exist_ok=True)
-            with open(playbook_path, "w", encoding="utf8") as playbook_fileobject:
-                yaml.safe_dump(playbook_contents, playbook_fileobject)
+            write_if_changed(playbook_path, yaml.safe_dump(playbook_contents))
         else:
             if playbook_path and os.path.exists(playbook_path):
                 os.remove(playbook_path)
@@ -344,9 +343,7 @@ class AnsiblePlaybookProvisionerPlugin:
             default="",
         )
         if vars_values:
-            os.makedirs(os.path.dirname(os.path.realpath(vars_path)), exist_ok=True)
-            with open(vars_path, "w", encoding="utf8") as vars_fileobject:
-                yaml.safe_dump(vars_values, vars_fileobject)
+            write_if_changed(vars_path, yaml.safe_dump(vars_values))
         else:
             if vars_path and os.path.exists(vars_path):
                 os.remove(vars_path)
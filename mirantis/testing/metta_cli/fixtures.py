@@ -12,6 +12,7 @@ from typing import List
 from mirantis.testing.metta.plugin import Factory
 from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta.timings import global_timings
 
 from .base import CliBase, cli_output, METTA_PLUGIN_INTERFACE_ROLE_CLI
 
@@ -46,7 +47,7 @@ class FixturesGroup:
     ):
         """Filter fixtures centrally."""
         matches = self._environment.fixtures().filter(
-            plugin_id=plugin_id, instance_id=instance_id, interfaces=interfaces, labels=labels
+            plugin_id=plugin_id, instance_id=instance_id, interfaces=interfaces, has_labels=labels
         )
 
         if not skip_cli_plugins:
@@ -70,21 +71,17 @@ class FixturesGroup:
         """List registered plugins and interfaces."""
         plugins_info = {}
 
-        # use a protected property just for introspection
-        # pylint: disable=protected-access
-        for registration in Factory._registry.values():
-            if skip_cli_plugins and METTA_PLUGIN_INTERFACE_ROLE_CLI in registration.interfaces:
+        for plugin_id in Factory.plugin_ids(interfaces_filter=[interface] if interface else []):
+            registration = Factory.plugin_info(plugin_id)
+            if skip_cli_plugins and METTA_PLUGIN_INTERFACE_ROLE_CLI in registration["interfaces"]:
                 continue
-
-            if interface and interface not in registration.interfaces:
-                continue
-            if label and label not in registration.labels:
+            if label and label not in registration["labels"]:
                 continue
 
-            plugins_info[registration.plugin_id] = {
-                "plugin_id": registration.plugin_id,
-                "interfaces": registration.interfaces,
-                "labels_from_factory": registration.labels,
+            plugins_info[plugin_id] = {
+                "plugin_id": plugin_id,
+                "interfaces": registration["interfaces"],
+                "labels_from_factory": registration["labels"],
             }
 
         return cli_output(plugins_info)
@@ -137,9 +134,32 @@ class FixturesGroup:
                 {
                     "plugin_id": fixture.plugin_id,
                     "instance_id": fixture.instance_id,
-                    "interfaces": fixture.interfaces,
-                    "labels": fixture.labels,
+                    "interfaces": sorted(fixture.interfaces),
+                    "labels": dict(fixture.labels),
                 }
             )
 
         return cli_output(fixture_info_list)
+
+    def timings(self, category: str = "", limit: int = 0):
+        """List recorded construction/config timings, slowest first.
+
+        Timings are only recorded if instrumentation was enabled before the
+        environment was built, e.g. by setting METTA_TIMINGS=1.
+
+        Parameters:
+        -----------
+        category (str) : only show one category, such as "plugin", "fixture",
+            "config.load" or "config.validate"
+
+        limit (int) : if positive, only show this many records.
+
+        """
+        if not global_timings.enabled:
+            logger.warning("Timings are not enabled; set METTA_TIMINGS=1 to record them.")
+
+        records = global_timings.records(category=category)
+        if limit > 0:
+            records = records[:limit]
+
+        return cli_output([record.info() for record in records])
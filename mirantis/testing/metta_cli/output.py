@@ -60,18 +60,17 @@ class OutputGroup:
         """List registered plugins and interfaces."""
         plugins_info = {}
 
-        # use a protected property just for introspection
-        # pylint: disable=protected-access
-        for registration in Factory._registry.values():
-            if METTA_PLUGIN_INTERFACE_ROLE_OUTPUT not in registration.interfaces:
-                continue
-            if has_label and has_label not in registration.labels:
+        for plugin_id in Factory.plugin_ids(
+            interfaces_filter=[METTA_PLUGIN_INTERFACE_ROLE_OUTPUT]
+        ):
+            registration = Factory.plugin_info(plugin_id)
+            if has_label and has_label not in registration["labels"]:
                 continue
 
-            plugins_info[registration.plugin_id] = {
-                "plugin_id": registration.plugin_id,
-                "interfaces": registration.interfaces,
-                "labels_from_factory": registration.labels,
+            plugins_info[plugin_id] = {
+                "plugin_id": plugin_id,
+                "interfaces": registration["interfaces"],
+                "labels_from_factory": registration["labels"],
             }
 
         return cli_output(plugins_info)
@@ -116,8 +115,8 @@ class OutputGroup:
                 {
                     "plugin_id": fixture.plugin_id,
                     "instance_id": fixture.instance_id,
-                    "interfaces": fixture.interfaces,
-                    "labels": fixture.labels,
+                    "interfaces": sorted(fixture.interfaces),
+                    "labels": dict(fixture.labels),
                 }
             )
 
@@ -78,9 +78,11 @@ class ConfigFormatOutputPlugin:
         output = match.group("output")
 
         try:
+            # the index is kept by the environment fixtures, so repeated
+            # lookups are a dict lookup rather than a scan of all fixtures.
             output_plugin = (
                 self._environment.fixtures()
-                .get(interfaces=[METTA_PLUGIN_INTERFACE_ROLE_OUTPUT], instance_id=output)
+                .instance_index(METTA_PLUGIN_INTERFACE_ROLE_OUTPUT)[output]
                 .plugin
             )
 
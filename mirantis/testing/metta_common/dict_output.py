@@ -8,8 +8,9 @@ which will enforce validation on the content, and raise
 an exception on invalid assignment.
 
 """
+import copy
 import logging
-from typing import Dict
+from typing import Any, Dict, Tuple
 
 from configerus.loaded import Loaded, LOADED_KEY_ROOT
 
@@ -60,6 +61,9 @@ class DictOutputPlugin:
         self._instance_id: str = instance_id
         """ Unique id for this plugin instance """
 
+        self._lookups: Dict[Tuple[str, str], Tuple[Any, bool]] = {}
+        """ get_output() values, and whether they are static, keyed on (key, validator) """
+
         if data is None:
             data = {}
 
@@ -76,6 +80,7 @@ class DictOutputPlugin:
         self.loaded = Loaded(
             data=data, parent=self._environment.config(), instance_id=mock_instance_id
         )
+        self._lookups = {}
 
     def get_output(self, key: str = LOADED_KEY_ROOT, validator: str = ""):
         """Retrieve an output.
@@ -86,6 +91,13 @@ class DictOutputPlugin:
 
         If you don't pass a key, you will get the entire data value
 
+        Lookups are memoized per (key, validator) until the data is re-set, as
+        config formatting can ask for the same output keys many times.  Values
+        that contain format markers (e.g. {{label:key}} or {{output::..}}) are kept
+        unformatted and formatted again on each read, as what they refer to
+        can change.  List and dict values are copied, so changing a returned
+        value does not change the cached value.
+
         Parameters:
         -----------
         key (str) : you can optionally pass a key to retrieve only a part of the
@@ -109,7 +121,24 @@ class DictOutputPlugin:
         validation failed.
 
         """
-        return self.loaded.get(key, validator=validator)
+        # keys can also be (unhashable) lists; those are keyed on their repr
+        lookup = (key if isinstance(key, str) else repr(key), validator)
+        cached = self._lookups.get(lookup)
+        if cached is not None and cached[1]:
+            value = cached[0]
+        else:
+            raw = cached[0] if cached is not None else self.loaded.get(key, format=False)
+            # formatting changes lists and dicts in place, so format a copy
+            value = self.loaded.format(copy.deepcopy(raw))
+            if validator:
+                self.loaded.validate(value, validator)
+            if cached is None:
+                # values without format markers are not changed by formatting
+                self._lookups[lookup] = (value, True) if value == raw else (raw, False)
+
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
 
     # deep argument is an info() standard across plugins
     # pylint: disable=unused-argument
@@ -0,0 +1,79 @@
+"""
+
+File writing helpers for provisioners that materialize config as files.
+
+Provisioners write tfvars, yaml and cfg files from config on every prepare or
+apply.  Rewriting a file with the same contents still bumps its mtime, which
+defeats anything downstream that caches on mtimes.  The helper here only
+writes when the contents have changed, and writes atomically so that a reader
+never sees a partial file.
+
+"""
+import hashlib
+import logging
+import os
+import uuid
+
+logger = logging.getLogger("metta.common.files")
+
+FILES_NEW_MODE = 0o666
+"""Permissions for newly created files, before the umask is applied, as open() does."""
+FILES_HASH_CHUNK_SIZE = 65536
+"""Read size used when hashing existing file contents."""
+
+
+def _file_hash(path: str) -> str:
+    """Return the sha256 hex digest of a file, or "" if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as existing:
+            for chunk in iter(lambda: existing.read(FILES_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return digest.hexdigest()
+
+
+def write_if_changed(path: str, contents: str):
+    """Write contents to a file, unless the file already has those contents.
+
+    The parent folder is created if needed.  The contents are written to a
+    temporary file in the same folder, which is then renamed over the target.
+    A rewritten file keeps its permissions, and a new file gets the same
+    permissions that open() would give it (so the umask applies.)
+
+    Parameters:
+    -----------
+    path (str) : file to write.
+
+    contents (str) : text to put in the file (utf8.)
+
+    """
+    data = contents.encode("utf8")
+    if _file_hash(path) == hashlib.sha256(data).hexdigest():
+        logger.debug("file unchanged, not writing: %s", path)
+        return
+
+    directory = os.path.dirname(os.path.realpath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = None
+
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}")
+    handle = os.open(
+        temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, FILES_NEW_MODE if mode is None else mode
+    )
+    try:
+        if mode is not None:
+            # the umask may have dropped some of the existing permissions
+            os.fchmod(handle, mode)
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, os.path.realpath(path))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    logger.debug("wrote file: %s", path)
@@ -0,0 +1,314 @@
+"""
+
+Background subprocess handling for long running external commands.
+
+Some external commands (terraform apply, launchpad apply, sonobuoy run) can run
+for a long time.  Running them with subprocess.run() blocks the calling thread
+until the process exits, and either inherits or fully buffers the output.
+
+The ProcessHandle here starts the command in the background and gives the
+caller a handle which can be polled, waited on with a timeout, cancelled, and
+used to stream stdout/stderr lines as they are produced.
+
+"""
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+
+logger = logging.getLogger("metta.common.process")
+
+PROCESS_STREAM_STDOUT = "stdout"
+"""Stream identifier for lines read from the process stdout."""
+PROCESS_STREAM_STDERR = "stderr"
+"""Stream identifier for lines read from the process stderr."""
+
+PROCESS_DEFAULT_KEEP_LINES = 500
+"""How many of the most recent output lines a handle keeps for introspection."""
+PROCESS_DEFAULT_PENDING_LINES = 10000
+"""How many output lines not yet consumed by lines() a handle keeps, oldest are dropped."""
+PROCESS_DEFAULT_CANCEL_GRACE_SECS = 10
+"""How long to wait after a terminate before killing a cancelled process."""
+
+
+# pylint: disable=too-many-instance-attributes
+class ProcessHandle:
+    """Handle for a subprocess running in the background.
+
+    Create the handle with the command, then call start().  The handle does
+    not block the caller; use poll() to check for completion, lines() to
+    stream output, wait() to block with an optional timeout and cancel() to
+    stop the process.
+
+    Output is read by two daemon threads (one per stream) so that a full pipe
+    never stalls the process, even if nobody is consuming lines().  Lines that
+    have not been consumed are kept up to a limit, after which the oldest are
+    dropped, so an undrained handle doesn't keep all of the output in memory.
+
+    """
+
+    def __init__(
+        self,
+        cmd: List[str],
+        cwd: str = None,
+        env: Dict[str, str] = None,
+        keep_lines: int = PROCESS_DEFAULT_KEEP_LINES,
+        pending_lines: int = PROCESS_DEFAULT_PENDING_LINES,
+    ):
+        """Configure the process handle.
+
+        Parameters:
+        -----------
+        cmd (List[str]) : subprocess command list, including the executable.
+
+        cwd (str) : optional working directory for the subprocess.
+
+        env (Dict[str, str]) : optional environment variables for the
+            subprocess.  If not passed then the current environment is used.
+
+        keep_lines (int) : how many recent output lines to keep, so that the
+            tail of the output is available for error reporting.
+
+        pending_lines (int) : how many output lines not yet consumed by
+            lines() to keep.  When more are produced the oldest are dropped.
+
+        """
+        self.cmd: List[str] = cmd
+        """Subprocess command list."""
+        self.cwd: str = cwd
+        """Subprocess working directory."""
+        self.env: Dict[str, str] = env
+        """Subprocess environment variables."""
+
+        self._process: subprocess.Popen = None
+        """Running subprocess, created on start()."""
+        self._readers: List[threading.Thread] = []
+        """Stream reader threads."""
+        self._pending: deque = deque(maxlen=pending_lines)
+        """(stream, line) tuples not yet consumed by lines()."""
+        self._pending_changed: threading.Condition = threading.Condition()
+        """Guards _pending and _open_streams, notified when either changes."""
+        self._tail: deque = deque(maxlen=keep_lines)
+        """Most recent (stream, line) tuples, kept for error reporting."""
+        self._open_streams: int = 0
+        """How many streams the readers have not yet finished reading."""
+        self.dropped_lines: int = 0
+        """How many output lines were dropped because lines() didn't consume them."""
+
+        self.started: float = 0
+        """perf_counter timestamp of when the process was started."""
+        self.cancelled: bool = False
+        """Was this process cancelled using cancel()."""
+
+    def __repr__(self) -> str:
+        """Represent the handle as a string."""
+        return f"ProcessHandle({' '.join(self.cmd)}, returncode={self.poll()})"
+
+    def info(self, deep: bool = False) -> Dict[str, Any]:
+        """Return dict data about the process handle for introspection."""
+        info: Dict[str, Any] = {
+            "cmd": self.cmd,
+            "cwd": self.cwd,
+            "pid": self._process.pid if self._process is not None else None,
+            "running": self.running(),
+            "returncode": self.poll(),
+            "cancelled": self.cancelled,
+            "dropped_lines": self.dropped_lines,
+        }
+        if deep:
+            info["output"] = [line for _, line in self._tail]
+        return info
+
+    def start(self) -> "ProcessHandle":
+        """Start the subprocess in the background.
+
+        Returns:
+        --------
+        self, so that the handle can be started inline.
+
+        Raises:
+        -------
+        RuntimeError if the handle has already been started.
+
+        """
+        if self._process is not None:
+            raise RuntimeError(f"Process has already been started: {self.cmd}")
+
+        logger.debug("starting background command: %s", " ".join(self.cmd))
+        self.started = time.perf_counter()
+        # pylint: disable=consider-using-with
+        self._process = subprocess.Popen(
+            self.cmd,
+            cwd=self.cwd,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+        for stream_name, stream in [
+            (PROCESS_STREAM_STDOUT, self._process.stdout),
+            (PROCESS_STREAM_STDERR, self._process.stderr),
+        ]:
+            reader = threading.Thread(
+                name=f"process-{self._process.pid}-{stream_name}",
+                target=self._read_stream,
+                args=(stream_name, stream),
+                daemon=True,
+            )
+            self._readers.append(reader)
+            self._open_streams += 1
+            reader.start()
+
+        return self
+
+    def _read_stream(self, stream_name: str, stream):
+        """Read lines from a stream into the pending lines until it closes."""
+        try:
+            for line in iter(stream.readline, ""):
+                line = line.rstrip("\n")
+                self._tail.append((stream_name, line))
+                with self._pending_changed:
+                    if len(self._pending) == self._pending.maxlen:
+                        self.dropped_lines += 1
+                    self._pending.append((stream_name, line))
+                    self._pending_changed.notify_all()
+        finally:
+            stream.close()
+            with self._pending_changed:
+                self._open_streams -= 1
+                self._pending_changed.notify_all()
+
+    def poll(self) -> Optional[int]:
+        """Check if the process has finished without blocking.
+
+        Returns:
+        --------
+        The process return code, or None if it is still running (or was never
+        started.)
+
+        """
+        if self._process is None:
+            return None
+        return self._process.poll()
+
+    def running(self) -> bool:
+        """Return True if the process was started and has not yet exited."""
+        return self._process is not None and self._process.poll() is None
+
+    def lines(self, timeout: float = None) -> Iterator[Tuple[str, str]]:
+        """Stream (stream, line) output tuples as the process produces them.
+
+        The iterator ends when both stdout and stderr have closed, which
+        happens when the process exits.  Lines are only delivered once, so two
+        consumers of lines() will split the output between them.
+
+        Parameters:
+        -----------
+        timeout (float) : optional maximum number of seconds to wait for the
+            next line.  If no line arrives in time then subprocess.TimeoutExpired
+            is raised, and lines() can be called again to resume.
+
+        Returns:
+        --------
+        Iterator of (stream, line) where stream is one of "stdout" or "stderr"
+
+        """
+        if self._process is None:
+            raise RuntimeError(f"Process has not been started: {self.cmd}")
+
+        while True:
+            with self._pending_changed:
+                if not self._pending_changed.wait_for(
+                    lambda: self._pending or self._open_streams == 0, timeout=timeout
+                ):
+                    raise subprocess.TimeoutExpired(self.cmd, timeout)
+                if not self._pending:
+                    return
+                item = self._pending.popleft()
+            yield item
+
+    def wait(self, timeout: float = None) -> int:
+        """Block until the process exits.
+
+        Parameters:
+        -----------
+        timeout (float) : optional maximum number of seconds to wait.
+
+        Returns:
+        --------
+        Integer process return code
+
+        Raises:
+        -------
+        subprocess.TimeoutExpired if the timeout passed before the process
+        exited.  The process is left running.
+
+        If the process exits but its output pipes are held open (e.g. by a
+        process that it started) then the output is left to the readers once
+        the timeout has passed.
+
+        """
+        if self._process is None:
+            raise RuntimeError(f"Process has not been started: {self.cmd}")
+
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+        returncode = self._process.wait(timeout=timeout)
+        # let the readers drain whatever output is left in the pipes.
+        for reader in self._readers:
+            if deadline is None:
+                reader.join()
+            else:
+                reader.join(timeout=max(0.0, deadline - time.perf_counter()))
+                if reader.is_alive():
+                    logger.warning("background command output is still open: %s", self.cmd[0])
+        return returncode
+
+    def check_returncode(self, timeout: float = None):
+        """Wait for the process and raise if it exited with a failure.
+
+        Raises:
+        -------
+        subprocess.CalledProcessError if the process exited non-zero, with the
+        kept output tail as the error output.
+
+        """
+        returncode = self.wait(timeout=timeout)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, self.cmd, output="\n".join(line for _, line in self._tail)
+            )
+
+    def cancel(self, grace: float = PROCESS_DEFAULT_CANCEL_GRACE_SECS) -> Optional[int]:
+        """Stop the process.
+
+        The process is sent a terminate signal, and if it has not exited after
+        the grace period, it is killed.
+
+        Returns:
+        --------
+        The process return code, or None if the process was never started.
+
+        """
+        if self._process is None:
+            return None
+
+        if self._process.poll() is None:
+            logger.info("cancelling background command: %s", " ".join(self.cmd))
+            self.cancelled = True
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                logger.warning("background command ignored terminate, killing it")
+                self._process.kill()
+
+        return self.wait()
+
+    def output(self) -> List[str]:
+        """Return the most recent output lines kept by the handle."""
+        return [line for _, line in self._tail]
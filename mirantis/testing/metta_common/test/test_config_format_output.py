@@ -0,0 +1,80 @@
+"""
+
+Test the output config formatter lookups.
+
+"""
+import unittest
+from unittest import mock
+
+from configerus import new_config
+
+from mirantis.testing.metta.environment import Environment
+from mirantis.testing.metta.fixture import Fixture, Fixtures
+from mirantis.testing.metta.output import METTA_PLUGIN_INTERFACE_ROLE_OUTPUT
+from mirantis.testing.metta_common.config_format_output import ConfigFormatOutputPlugin
+from mirantis.testing.metta_common.dict_output import DictOutputPlugin
+from mirantis.testing.metta_common.text_output import TextOutputPlugin
+
+
+def _output_fixture(
+    plugin, instance_id: str, plugin_id: str = "output", priority: int = 50
+) -> Fixture:
+    """Wrap an output plugin in a fixture."""
+    return Fixture(
+        plugin=plugin,
+        plugin_id=plugin_id,
+        instance_id=instance_id,
+        interfaces=[METTA_PLUGIN_INTERFACE_ROLE_OUTPUT],
+        labels={},
+        priority=priority,
+    )
+
+
+class ConfigFormatOutputTest(unittest.TestCase):
+    """Output references resolve through the fixtures instance_id index."""
+
+    def setUp(self):
+        """Make an environment with an output, and a formatter for it."""
+        self.environment = Environment(config=new_config(), instance_id="format_output")
+        self.environment.fixtures().add(
+            _output_fixture(
+                DictOutputPlugin(self.environment, "nodes", data={"node1": {"ip": "10.0.0.1"}}),
+                "nodes",
+            )
+        )
+        self.formatter = ConfigFormatOutputPlugin(self.environment.config(), "output")
+        self.formatter.set_environment(self.environment)
+
+    def test_format(self):
+        """Repeated references don't scan the fixtures."""
+        self.assertEqual(self.formatter.format("nodes/node1.ip", ""), "10.0.0.1")
+        with mock.patch.object(Fixtures, "filter") as fixtures_filter:
+            for _ in range(10):
+                self.assertEqual(self.formatter.format("nodes/node1.ip", ""), "10.0.0.1")
+            fixtures_filter.assert_not_called()
+
+        with self.assertRaises(KeyError):
+            self.formatter.format("missing", "")
+
+    def test_new_output(self):
+        """Adding an output fixture makes it available to the formatter."""
+        self.assertEqual(self.formatter.format("nodes/node1.ip", ""), "10.0.0.1")
+        self.environment.fixtures().add(
+            _output_fixture(TextOutputPlugin(self.environment, "name", "cluster"), "name")
+        )
+        self.assertEqual(self.formatter.format("name", ""), "cluster")
+
+        # a higher priority output with the same instance_id replaces the old one
+        self.environment.fixtures().add(
+            _output_fixture(
+                TextOutputPlugin(self.environment, "name", "override"),
+                "name",
+                plugin_id="other",
+                priority=80,
+            )
+        )
+        self.assertEqual(self.formatter.format("name", ""), "override")
+
+
+if __name__ == "__main__":
+    unittest.main()
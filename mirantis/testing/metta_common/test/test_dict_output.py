@@ -0,0 +1,90 @@
+"""
+
+Test the dict output plugin lookup memoization.
+
+"""
+import unittest
+from unittest import mock
+
+from configerus import new_config
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+from configerus.contrib.get import PLUGIN_ID_FORMAT_GET
+from configerus.loaded import Loaded
+
+from mirantis.testing.metta.environment import Environment
+from mirantis.testing.metta_common.dict_output import DictOutputPlugin
+
+LOOKUP_KEY_COUNT = 200
+""" How many distinct keys the lookup count test uses """
+LOOKUP_REPEATS = 50
+""" How many times the lookup count test asks for each key """
+
+
+def _data(count: int) -> dict:
+    """Make a nested output data set with count keys."""
+    return {
+        f"node{i}": {"address": {"public": f"10.0.0.{i}"}, "roles": ["manager"]}
+        for i in range(count)
+    }
+
+
+class DictOutputLookupTest(unittest.TestCase):
+    """Memoized dict output lookups."""
+
+    def setUp(self):
+        """Make an output plugin in a bare environment."""
+        self.environment = Environment(config=new_config(), instance_id="dict_output")
+        self.output = DictOutputPlugin(self.environment, "nodes", data=_data(5))
+
+    def test_lookup(self):
+        """Lookups return the same values as the loaded data, and are cached."""
+        self.assertEqual(self.output.get_output("node1.address.public"), "10.0.0.1")
+        self.assertEqual(self.output.get_output(["node1", "address.public"]), "10.0.0.1")
+        self.assertEqual(self.output.get_output("node1")["roles"], ["manager"])
+
+        # the cache hands out copies of containers
+        self.output.get_output("node1")["roles"].append("worker")
+        self.assertEqual(self.output.get_output("node1.roles"), ["manager"])
+
+        with self.assertRaises(KeyError):
+            self.output.get_output("node9")
+
+    def test_set_data_clears(self):
+        """Setting new data drops cached lookups."""
+        self.assertEqual(self.output.get_output("node1.address.public"), "10.0.0.1")
+        self.output.set_data({"node1": {"address": {"public": "192.168.0.1"}}})
+        self.assertEqual(self.output.get_output("node1.address.public"), "192.168.0.1")
+
+    def test_formatted_lookup(self):
+        """Values with format markers are formatted again on each lookup."""
+        config = self.environment.config()
+        config.add_formatter(PLUGIN_ID_FORMAT_GET)
+        source = config.add_source(PLUGIN_ID_SOURCE_DICT, "values")
+        source.set_data({"values": {"address": "10.0.0.1"}})
+        self.output.set_data({"node": {"address": "{{values:address}}", "name": "node"}})
+        self.assertEqual(self.output.get_output("node.address"), "10.0.0.1")
+        self.assertEqual(self.output.get_output("node"), {"address": "10.0.0.1", "name": "node"})
+
+        source.set_data({"values": {"address": "10.0.0.2"}})
+        config.load("values", force_reload=True)
+        self.assertEqual(self.output.get_output("node.address"), "10.0.0.2")
+        self.assertEqual(self.output.get_output("node"), {"address": "10.0.0.2", "name": "node"})
+        self.assertEqual(self.output.get_output("node.name"), "node")
+        # formatting does not change the output data
+        self.assertEqual(self.output.loaded.data["node"]["address"], "{{values:address}}")
+
+    def test_lookup_calls(self):
+        """Repeated lookups only go through configerus once per key."""
+        self.output.set_data(_data(LOOKUP_KEY_COUNT))
+        keys = [f"node{i}.address.public" for i in range(LOOKUP_KEY_COUNT)]
+
+        with mock.patch.object(Loaded, "get", autospec=True, side_effect=Loaded.get) as get:
+            for _ in range(LOOKUP_REPEATS):
+                for key in keys:
+                    self.output.get_output(key)
+
+        self.assertEqual(get.call_count, LOOKUP_KEY_COUNT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+
+Test the skip-if-unchanged file writer.
+
+"""
+import os
+import stat
+import tempfile
+import unittest
+
+from mirantis.testing.metta_common.files import write_if_changed
+
+
+class WriteIfChangedTest(unittest.TestCase):
+    """Files are only written when their contents change."""
+
+    def setUp(self):
+        """Make a temp dir to write into."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sub", "config.yml")
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmpdir.cleanup()
+
+    def test_write(self):
+        """A new or changed file is written, an unchanged one is left alone."""
+        write_if_changed(self.path, "a: 1\n")
+        os.utime(self.path, ns=(1, 1))
+
+        write_if_changed(self.path, "a: 1\n")
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+
+        write_if_changed(self.path, "a: 2\n")
+        self.assertNotEqual(os.stat(self.path).st_mtime_ns, 1)
+        with open(self.path, encoding="utf8") as written:
+            self.assertEqual(written.read(), "a: 2\n")
+        # no temp files are left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["config.yml"])
+
+    def test_mode(self):
+        """A rewritten file keeps its permissions."""
+        write_if_changed(self.path, "a: 1\n")
+        os.chmod(self.path, 0o600)
+        write_if_changed(self.path, "a: 2\n")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_new_file_umask(self):
+        """A new file gets its permissions from the umask, as with open()."""
+        umask = os.umask(0o077)
+        try:
+            write_if_changed(self.path, "password: secret\n")
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+
+Test the background process handle.
+
+A fake script that sleeps and writes some output is enough to exercise the
+handle without any real long-running tooling.
+
+"""
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from mirantis.testing.metta_common.process import (
+    ProcessHandle,
+    PROCESS_STREAM_STDOUT,
+    PROCESS_STREAM_STDERR,
+)
+
+FAKE_SCRIPT = """#!{python}
+import sys, time
+sleep = float(sys.argv[1])
+for i in range(3):
+    print(f"progress {{i}}", flush=True)
+    time.sleep(sleep)
+print("warning", file=sys.stderr, flush=True)
+sys.exit(int(sys.argv[2]))
+"""
+
+
+class ProcessHandleTest(unittest.TestCase):
+    """Test starting, streaming, waiting and cancelling background processes."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Write a fake long running script."""
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.script = os.path.join(cls.tmpdir.name, "fake")
+        with open(cls.script, "w", encoding="utf8") as script_file:
+            script_file.write(FAKE_SCRIPT.format(python=sys.executable))
+        os.chmod(cls.script, os.stat(cls.script).st_mode | stat.S_IEXEC)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the fake script."""
+        cls.tmpdir.cleanup()
+
+    def test_start_is_non_blocking(self):
+        """Starting returns before the process finishes, and poll reports it."""
+        started = time.perf_counter()
+        handle = ProcessHandle([self.script, "0.3", "0"]).start()
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertTrue(handle.running())
+        self.assertIsNone(handle.poll())
+
+        self.assertEqual(handle.wait(timeout=10), 0)
+        self.assertFalse(handle.running())
+        self.assertEqual(handle.poll(), 0)
+
+    def test_lines_stream(self):
+        """Output lines are streamed per stream."""
+        handle = ProcessHandle([self.script, "0.05", "0"]).start()
+        lines = list(handle.lines(timeout=10))
+
+        stdout = [line for stream, line in lines if stream == PROCESS_STREAM_STDOUT]
+        stderr = [line for stream, line in lines if stream == PROCESS_STREAM_STDERR]
+        self.assertEqual(stdout, ["progress 0", "progress 1", "progress 2"])
+        self.assertEqual(stderr, ["warning"])
+        self.assertEqual(handle.wait(), 0)
+
+    def test_wait_timeout(self):
+        """Waiting with a short timeout raises but leaves the process running."""
+        handle = ProcessHandle([self.script, "1", "0"]).start()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            handle.wait(timeout=0.1)
+        self.assertTrue(handle.running())
+        handle.cancel()
+
+    def test_cancel(self):
+        """Cancelling stops a running process."""
+        handle = ProcessHandle([self.script, "5", "0"]).start()
+        started = time.perf_counter()
+        returncode = handle.cancel(grace=2)
+        self.assertLess(time.perf_counter() - started, 4)
+        self.assertNotEqual(returncode, 0)
+        self.assertTrue(handle.cancelled)
+        self.assertFalse(handle.running())
+
+    def test_check_returncode(self):
+        """A failed process raises a CalledProcessError with the output tail."""
+        handle = ProcessHandle([self.script, "0", "3"]).start()
+        with self.assertRaises(subprocess.CalledProcessError) as context:
+            handle.check_returncode(timeout=10)
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertIn("progress 2", context.exception.output)
+
+    def test_pending_lines_bounded(self):
+        """Unconsumed output is bounded, keeping the newest lines."""
+        handle = ProcessHandle([self.script, "0", "0"], pending_lines=2).start()
+        self.assertEqual(handle.wait(timeout=10), 0)
+
+        # the two streams are read separately, so their order can vary
+        self.assertCountEqual(
+            list(handle.lines(timeout=10)),
+            [(PROCESS_STREAM_STDOUT, "progress 2"), (PROCESS_STREAM_STDERR, "warning")],
+        )
+        self.assertEqual(handle.dropped_lines, 2)
+        self.assertEqual(handle.info()["dropped_lines"], 2)
+
+    def test_wait_open_pipes(self):
+        """Waiting doesn't block on output held open by a background child."""
+        # the child leaves a sleeping process behind which keeps its output open
+        background = (
+            "import subprocess; "
+            f"subprocess.Popen([{sys.executable!r}, '-c', 'import time; time.sleep(5)'])"
+        )
+        handle = ProcessHandle([sys.executable, "-c", background]).start()
+        started = time.perf_counter()
+        self.assertEqual(handle.wait(timeout=1), 0)
+        self.assertLess(time.perf_counter() - started, 3)
@@ -189,8 +189,14 @@ class HealthpollWorkloadGroup:
 
         return cli_output(health_info)
 
-    def poll(self, instance_id: str = "", period: int = 10):
-        """Return the current health from the healthpoller."""
+    def poll(self, instance_id: str = "", period: int = 10, latency: bool = True):
+        """Return the current health from the healthpoller.
+
+        Parameters:
+        -----------
+        latency (bool) : include poll overruns and per check latency stats.
+
+        """
         fixture = self._select_fixture(instance_id=instance_id)
         plugin = fixture.plugin
 
@@ -205,18 +211,17 @@ class HealthpollWorkloadGroup:
             health = plugin.health()
             messages = list(health.messages(since=last_message_time))
 
-            print(
-                cli_output(
-                    {
-                        "poll_count": plugin.poll_count(),
-                        "status": health.status(),
-                        "messages": {
-                            "since": int(last_message_time),
-                            "items": messages,
-                        },
-                    }
-                )
-            )
+            poll_output = {
+                "poll_count": plugin.poll_count(),
+                "status": health.status(),
+                "messages": {
+                    "since": int(last_message_time),
+                    "items": messages,
+                },
+            }
+            if latency:
+                poll_output["latency"] = plugin.latency()
+            print(cli_output(poll_output))
 
             # next round we won't include many repeat messages
             if len(messages) > 0:
@@ -5,22 +5,33 @@ Metta workload plugin that polls health in the background.
 Polls health periodically in the background and answers health
 questions on demand.
 
+Each healthcheck fixture is polled on its own interval, which defaults to the
+workload period, but which can be set per fixture using a fixture label or
+the healthpoll config.  Checks are scheduled on a heap of due times which are
+anchored to the start of the run, so slow checks don't make the schedule
+drift.  If a check is still running when its next tick comes up, that tick is
+skipped rather than run late, and the skip is counted.
+
 """
+import heapq
 import logging
+from collections import deque
 import time
-from typing import Dict, Any, List
+from typing import Callable, Deque, Dict, Any, List, Tuple
 import threading
 
 from configerus.loaded import LOADED_KEY_ROOT
 
 from mirantis.testing.metta.environment import Environment
-from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta.fixture import Fixture, Fixtures
 
 from .healthcheck import (
     METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK,
     Health,
     HealthStatus,
 )
+from .metrics import LatencyHistogram
+from .prometheus import HealthMetricsExporter, HEALTH_METRICS_DEFAULT_HOST
 
 logger = logging.getLogger("metta_common.workload.healthpoller")
 
@@ -34,11 +45,25 @@ HEALTHPOLL_CONFIG_KEY_PERIOD = "poll.period"
 """Configerus key for finding period from config."""
 HEALTHPOLL_CONFIG_KEY_DURATION = "poll.duration"
 """Configerus key for finding duration from config."""
+HEALTHPOLL_CONFIG_KEY_INTERVALS = "poll.intervals"
+"""Configerus key for a dict of poll intervals per healthcheck instance_id."""
+
+HEALTHPOLL_CONFIG_KEY_EXPORT_FILE = "export.file"
+"""Configerus key for a file path to write Prometheus format metrics to after each poll."""
+HEALTHPOLL_CONFIG_KEY_EXPORT_PORT = "export.port"
+"""Configerus key for a local port to serve Prometheus format metrics on."""
+HEALTHPOLL_CONFIG_KEY_EXPORT_HOST = "export.host"
+"""Configerus key for the address to serve Prometheus format metrics on."""
+
+HEALTHPOLL_FIXTURE_LABEL_INTERVAL = "healthpoll.interval"
+"""Healthcheck fixture label which sets the poll interval for that fixture."""
 
 HEALTHPOLL_DEFAULT_PERIOD = 30
 """Default value for how frequently to poll health."""
 HEALTHPOLL_DEFAULT_DURATION = -1
 """Default value for how may seconds to run the polling for (default to forever)"""
+HEALTHPOLL_POLL_TIMINGS_KEPT = 100
+"""How many of the most recent poll start times are kept for poll_timing()."""
 
 # this is what it takes
 # pylint: disable=too-many-instance-attributes
@@ -66,6 +91,24 @@ class HealthPollWorkload:
         self.duration = healthpoll_config.get(
             [base, HEALTHPOLL_CONFIG_KEY_DURATION], default=HEALTHPOLL_DEFAULT_DURATION
         )
+        self.intervals: Dict[str, float] = healthpoll_config.get(
+            [base, HEALTHPOLL_CONFIG_KEY_INTERVALS], default={}
+        )
+        """Poll interval per healthcheck instance_id, overriding fixture labels."""
+
+        export_file = healthpoll_config.get([base, HEALTHPOLL_CONFIG_KEY_EXPORT_FILE], default="")
+        export_port = healthpoll_config.get([base, HEALTHPOLL_CONFIG_KEY_EXPORT_PORT], default=0)
+        self.exporter: HealthMetricsExporter = None
+        """Optional Prometheus format metrics exporter, kept up to date by polling."""
+        if export_file or export_port:
+            self.exporter = HealthMetricsExporter(
+                source=instance_id,
+                path=export_file,
+                port=int(export_port),
+                host=healthpoll_config.get(
+                    [base, HEALTHPOLL_CONFIG_KEY_EXPORT_HOST], default=HEALTH_METRICS_DEFAULT_HOST
+                ),
+            )
 
         self._thread: threading.Thread = None
         """Thread for polling in case we want to join it."""
@@ -73,8 +116,10 @@ class HealthPollWorkload:
         self._health: Dict[str, Health] = {}
         """Aggregate health per fixture/plugin id. Only ._run() should write to this."""
 
-        self._poll_timings: List[float] = []
-        """A list of timestamps to allow separation of messages across polls."""
+        self._poll_timings: Deque[float] = deque(maxlen=HEALTHPOLL_POLL_TIMINGS_KEPT)
+        """Recent poll start timestamps to allow separation of messages across polls."""
+        self._poll_count: int = 0
+        """How many polls have been run."""
 
         self._terminate: bool = False
         """Internal value used to allow an early poll exit."""
@@ -82,18 +127,44 @@ class HealthPollWorkload:
         self._healthcheck_fixtures: Fixtures = None
         """Fixtures list which should be searched for healthcheck fixtures."""
 
-    # deep argument is an info() standard across plugins
-    # pylint: disable=unused-argument
+        self._poll_latency: LatencyHistogram = LatencyHistogram()
+        """Histogram of how long each full poll took."""
+        self._check_latency: Dict[str, LatencyHistogram] = {}
+        """Histogram of how long each fixture .health() took, per instance_id."""
+        self._overruns: int = 0
+        """How many polls took longer than the period."""
+        self._check_overruns: Dict[str, int] = {}
+        """How many times each check took longer than its interval, per instance_id."""
+        self._skipped: Dict[str, int] = {}
+        """How many ticks were skipped per instance_id, as the check was still running."""
+
+        self._wake: threading.Event = threading.Event()
+        """Set to wake the polling thread early, e.g. to terminate."""
+
+        self.clock: Callable[[], float] = time.perf_counter
+        """Time source for scheduling and timing checks, replaceable for testing."""
+        self.sleep: Callable[[float], Any] = self._wake.wait
+        """Waits for some seconds, or until woken, replaceable along with the clock."""
+
     def info(self, deep: bool = False):
         """Return dict data about this plugin for introspection."""
-        return {
+        info = {
             "workload": {
-                "configuration": {"period": self.period, "duration": self.duration},
+                "configuration": {
+                    "period": self.period,
+                    "duration": self.duration,
+                    "intervals": self.intervals,
+                },
                 "required_fixtures": {
                     "healthchecks": {"interfaces": [METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK]}
                 },
             }
         }
+        if deep:
+            info["polling"] = self.latency()
+        if self.exporter is not None:
+            info["workload"]["exporter"] = self.exporter.info()
+        return info
 
     def prepare(self, fixtures: Fixtures = None):
         """Create a workload instance from a set of fixtures.
@@ -114,6 +185,7 @@ class HealthPollWorkload:
         if self._thread is None:
             logger.debug("%s Starting health check polling.", self._instance_id)
             self._terminate = False
+            self._wake.clear()
             self._thread = threading.Thread(name=self._instance_id, target=self._run, args=())
             """Backgroung health poll thread."""
             self._thread.daemon = True  # Daemonize thread
@@ -125,15 +197,54 @@ class HealthPollWorkload:
         """Workload instance interface method to stop the workload."""
         logger.info("Received instructions to terminate polling.")
         self._terminate = True
+        self._wake.set()
 
     def join(self):
         """Join the polling thread and wait until it is done."""
         self._thread.join()
 
+    def interval(self, health_fixture: Fixture) -> float:
+        """Return the poll interval for a healthcheck fixture.
+
+        The interval comes from the healthpoll config intervals, or from the
+        fixture label, and otherwise it is the workload period.
+
+        """
+        interval = self.intervals.get(
+            health_fixture.instance_id,
+            health_fixture.labels.get(HEALTHPOLL_FIXTURE_LABEL_INTERVAL, self.period),
+        )
+        interval = float(interval)
+        if interval <= 0:
+            raise ValueError(
+                f"Healthpoll interval for {health_fixture.instance_id} must be positive: "
+                f"{interval}"
+            )
+        return interval
+
     def _run(self):
-        """Periodic poll all healthcheck plugins for health."""
+        """Poll each healthcheck plugin for health, when it is due."""
         self._health[self._instance_id] = Health(source=self._instance_id)
-        run_start = time.perf_counter()
+        self._poll_latency = LatencyHistogram()
+        self._check_latency = {}
+        self._overruns = 0
+        self._check_overruns = {}
+        self._skipped = {}
+        run_start = self.clock()
+
+        health_fixtures = self._healthcheck_fixtures.filter(
+            interfaces=[METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK]
+        ).to_list()
+        # (due time, fixture index) - the index orders equal due times by priority
+        schedule: List[Tuple[float, int]] = [
+            (run_start, index) for index in range(len(health_fixtures))
+        ]
+
+        if not schedule:
+            logger.warning("%s found no healthcheck fixtures to poll", self._instance_id)
+
+        if self.exporter is not None:
+            self.exporter.start()
 
         try:
             while True:
@@ -142,29 +253,30 @@ class HealthPollWorkload:
                     logger.info("Terminating health poll")
                     break
 
-                poll_start = time.perf_counter()
+                poll_start = self.clock()
 
-                if 0 < self.duration < poll_start:
+                if 0 < self.duration < poll_start - run_start:
                     # expire the poll if we were given a positive expiry
                     # and if that many seconds have passed.
                     logger.info("health poll expired")
                     break
 
+                due = schedule[0][0] if schedule else poll_start + self.period
+                if due > poll_start:
+                    if self.duration > 0:
+                        # don't sleep past the expiry
+                        due = min(due, run_start + self.duration + 0.001)
+                    self.sleep(due - poll_start)
+                    continue
+
                 # Mark the start of a new poll.
                 self._health[self._instance_id].info(
                     f"Polling {self.poll_count()} started, {int(poll_start - run_start)} "
                     "seconds after start"
                 )
-                # retrieve the health results.
-                self._healthcheck()
-                # mark another poll complete
-                self._poll_timings.append(poll_start)
 
-                poll_stop = time.perf_counter() - run_start
-                sleep_dur = ((poll_stop // self.period) + 1) * self.period - poll_stop
-                """Duration in secs to the period for the next poll_start."""
-                # we may have passed over a period, so we don't just substract and divide
-                time.sleep(sleep_dur)
+                self._poll(schedule, health_fixtures, poll_start)
+                self._poll_complete(poll_start)
 
         # Outside of the polling loop, shut everything down
 
@@ -173,8 +285,71 @@ class HealthPollWorkload:
             self._reset()
             raise err
 
+        finally:
+            if self.exporter is not None:
+                self.exporter.stop()
+
         self._reset()
 
+    def _poll(
+        self, schedule: List[Tuple[float, int]], health_fixtures: List[Fixture], poll_start: float
+    ):
+        """Run every check that is due, as one poll, and schedule the next ticks."""
+        # pop everything that is due, so that they all run as one poll.
+        polled: List[Tuple[float, int]] = []
+        while schedule and schedule[0][0] <= poll_start:
+            polled.append(heapq.heappop(schedule))
+        for due, index in polled:
+            health_fixture = health_fixtures[index]
+            self._check(health_fixture)
+            heapq.heappush(schedule, (self._next_due(health_fixture, due), index))
+
+    def _poll_complete(self, poll_start: float):
+        """Mark another poll complete, recording its timing."""
+        self._poll_timings.append(poll_start)
+        self._poll_count += 1
+        poll_duration = self.clock() - poll_start
+        self._poll_latency.record(poll_duration)
+        if poll_duration > self.period:
+            self._overruns += 1
+            logger.warning(
+                "health poll took %.2fs which is longer than the %ss period",
+                poll_duration,
+                self.period,
+            )
+        if self.exporter is not None:
+            self.exporter.observe_poll(poll_duration)
+            self.exporter.write()
+
+    def _next_due(self, health_fixture: Fixture, due: float) -> float:
+        """Schedule the next tick for a check which was due at a time.
+
+        Ticks are anchored to the original due time, so the schedule does not
+        drift.  Any ticks which passed while the check was running are skipped.
+
+        """
+        instance_id = health_fixture.instance_id
+        interval = self.interval(health_fixture)
+        if self._check_latency[instance_id].last > interval:
+            self._check_overruns[instance_id] = self._check_overruns.get(instance_id, 0) + 1
+
+        now = self.clock()
+        next_due = due + interval
+        if next_due > now:
+            return next_due
+
+        missed = int((now - next_due) // interval) + 1
+        self._skipped[instance_id] = self._skipped.get(instance_id, 0) + missed
+        if self.exporter is not None:
+            self.exporter.observe_skipped(instance_id, missed)
+        logger.warning(
+            "health check %s was still running at its next %ss tick, skipping %s tick(s)",
+            instance_id,
+            interval,
+            missed,
+        )
+        return next_due + missed * interval
+
     def _reset(self):
         """Reset the thread of this object."""
         self._thread: threading.Thread = None
@@ -183,8 +358,10 @@ class HealthPollWorkload:
         self._health: Dict[str, Health] = {}
         """Aggregate health per fixture/plugin id. Only ._run() should write to this."""
 
-        self._poll_timings: List[float] = []
-        """A list of timestamps to allow separation of messages across polls."""
+        self._poll_timings: Deque[float] = deque(maxlen=HEALTHPOLL_POLL_TIMINGS_KEPT)
+        """Recent poll start timestamps to allow separation of messages across polls."""
+        self._poll_count: int = 0
+        """How many polls have been run."""
 
         self._terminate: bool = False
         """Internal value used to allow an early poll exit."""
@@ -203,25 +380,86 @@ class HealthPollWorkload:
         for health_fixture in self._healthcheck_fixtures.filter(
             interfaces=[METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK]
         ):
-            try:
-                plugin_health = health_fixture.plugin.health()
-
-            # we turn any exception right into a critical status
-            # pylint: disable=broad-except
-            except Exception as err:
-                plugin_health = Health(source=health_fixture.instance_id)
-                plugin_health.critical(
-                    f"Health plugin exception [{health_fixture.instance_id}]: {err}"
-                )
-
-            plugin_id = health_fixture.plugin_id
-            if plugin_id in self._health:
-                self._health[plugin_id].merge(plugin_health)
-            else:
-                self._health[plugin_id] = plugin_health
-            health_info[health_fixture.instance_id] = plugin_health
+            health_info[health_fixture.instance_id] = self._check(health_fixture)
         return health_info
 
+    def _check(self, health_fixture: Fixture) -> Health:
+        """Run a single fixture healthcheck, and keep the results.
+
+        Returns:
+        --------
+        The fixture plugin Health
+
+        """
+        check_start = self.clock()
+        try:
+            plugin_health = health_fixture.plugin.health()
+
+        # we turn any exception right into a critical status
+        # pylint: disable=broad-except
+        except Exception as err:
+            plugin_health = Health(source=health_fixture.instance_id)
+            plugin_health.critical(
+                f"Health plugin exception [{health_fixture.instance_id}]: {err}"
+            )
+        check_duration = self.clock() - check_start
+        self._record_check_latency(health_fixture.instance_id, check_duration)
+        if self.exporter is not None:
+            self.exporter.observe(
+                health_fixture.instance_id,
+                health_fixture.plugin_id,
+                plugin_health.status(),
+                check_duration,
+            )
+
+        plugin_id = health_fixture.plugin_id
+        if plugin_id in self._health:
+            self._health[plugin_id].merge(plugin_health)
+        else:
+            self._health[plugin_id] = plugin_health
+        return plugin_health
+
+    def _record_check_latency(self, instance_id: str, duration: float):
+        """Record how long a fixture health check took."""
+        try:
+            histogram = self._check_latency[instance_id]
+        except KeyError:
+            histogram = self._check_latency[instance_id] = LatencyHistogram()
+        histogram.record(duration)
+
+    def latency(self) -> Dict[str, Any]:
+        """Return poll and per check latency stats, with overruns and skipped ticks.
+
+        Returns:
+        --------
+        Dict of poll count, poll overruns (polls longer than the period), total
+        check overruns (checks longer than their interval) and skipped ticks,
+        the poll latency histogram info and, per healthcheck instance_id
+        (slowest mean first), the latency histogram info, overruns and skipped
+        ticks.
+
+        """
+        checks = sorted(
+            list(self._check_latency.items()), key=lambda item: item[1].mean(), reverse=True
+        )
+        overruns = dict(self._check_overruns)
+        skipped = dict(self._skipped)
+        return {
+            "polls": self.poll_count(),
+            "overruns": self._overruns,
+            "check_overruns": sum(overruns.values()),
+            "skipped": sum(skipped.values()),
+            "poll_latency": self._poll_latency.info(),
+            "check_latency": {
+                instance_id: {
+                    **histogram.info(),
+                    "overruns": overruns.get(instance_id, 0),
+                    "skipped": skipped.get(instance_id, 0),
+                }
+                for instance_id, histogram in checks
+            },
+        }
+
     def health(self) -> Health:
         """Combine all plugin healths into one Health object."""
         agg_health = Health(source=self._instance_id)
@@ -238,14 +476,19 @@ class HealthPollWorkload:
         return self._health
 
     def poll_timing(self, reverse_index: int) -> float:
-        """Get the poll timing for a poll index for use with message timing."""
+        """Get the poll timing for a poll index for use with message timing.
+
+        Only the last HEALTHPOLL_POLL_TIMINGS_KEPT poll timings are kept, and
+        0 is returned for older polls.
+
+        """
         if len(self._poll_timings) < reverse_index:
             return 0
         return self._poll_timings[-reverse_index]
 
     def poll_count(self) -> int:
         """Return how many polls have been run."""
-        return len(self._poll_timings)
+        return self._poll_count
 
 
 def health_poller_output_log(
@@ -0,0 +1,87 @@
+"""
+
+Constant cost metrics for health polling.
+
+Health polls can run for days in a soak test, so anything recorded per poll
+has to have a fixed size.  The latency histogram here keeps a count per
+fixed duration bucket rather than a list of durations.
+
+"""
+import bisect
+from typing import Dict, Any, List, Tuple
+
+from mirantis.testing.metta.timings import DurationStats
+
+HEALTHPOLL_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""Latency histogram bucket upper bounds in seconds (an overflow bucket is implied)."""
+
+
+class LatencyHistogram(DurationStats):
+    """Fixed-bucket histogram of durations.
+
+    Each bucket counts durations less than or equal to its upper bound, and
+    greater than the previous bound.  Durations over the last bound go into an
+    overflow bucket.  Recording is O(log buckets) and memory is constant.  The
+    count, total, max and last durations are kept by DurationStats.
+
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = HEALTHPOLL_LATENCY_BUCKETS):
+        """Start an empty histogram.
+
+        Parameters:
+        -----------
+        buckets (Tuple[float]) : sorted bucket upper bounds in seconds.
+
+        """
+        super().__init__()
+        self.buckets: Tuple[float, ...] = buckets
+        """Bucket upper bounds."""
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        """Count per bucket, with the last item being the overflow bucket."""
+
+    def record(self, duration: float):
+        """Add a duration to the histogram."""
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.add(duration)
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, count of durations <= bound) pairs.
+
+        The last pair has an upper bound of float("inf") and the total count,
+        which matches the Prometheus histogram bucket convention.
+
+        """
+        pairs: List[Tuple[float, int]] = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about the histogram for introspection."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean(),
+            "max": self.max,
+            "last": self.last,
+            "buckets": {
+                f"le_{bound}": count
+                for bound, count in zip(self.buckets + ("inf",), self.counts)
+                if count
+            },
+        }
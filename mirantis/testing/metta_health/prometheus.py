@@ -0,0 +1,305 @@
+"""
+
+Prometheus text format export of health poll metrics.
+
+Long soak runs need the health poll results in a form that other tools can
+scrape.  The exporter here keeps running metric values which the health
+poller updates as each check completes, so producing a snapshot only walks
+the per fixture values, no matter how many health messages have piled up.
+
+Snapshots can be written to a file (e.g. for the node-exporter textfile
+collector) after every poll, and/or served over HTTP on a local port.
+
+"""
+import http.server
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+
+from .healthcheck import HealthStatus
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger("metta_health.prometheus")
+
+HEALTH_METRICS_PREFIX = "metta_health"
+"""Prefix for all exported metric names."""
+HEALTH_METRICS_DEFAULT_HOST = "127.0.0.1"
+"""Default address to serve metrics on, if a port is given."""
+HEALTH_METRICS_FILE_MODE = 0o644
+"""Metrics file permissions, readable by a collector running as another user."""
+HEALTH_METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""HTTP content type for the Prometheus text exposition format."""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    """Render a label set for the Prometheus text format."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _number(value: float) -> str:
+    """Render a sample value for the Prometheus text format."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CheckMetrics:
+    """Running metric values for a single healthcheck fixture."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, plugin_id: str):
+        """Start with no observations."""
+        self.plugin_id: str = plugin_id
+        self.status: HealthStatus = HealthStatus.UNKNOWN
+        self.status_counts: Dict[HealthStatus, int] = {}
+        self.duration: LatencyHistogram = LatencyHistogram()
+        self.last_success: float = 0.0
+        self.skipped: int = 0
+
+
+# pylint: disable=too-many-instance-attributes
+class HealthMetricsExporter:
+    """Keep health poll metrics and export them in Prometheus text format.
+
+    Call observe() for each completed check; render() produces the text
+    snapshot, write() puts it in the file (if one was given) and start()
+    serves it over HTTP (if a port was given.)
+
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        source: str,
+        path: str = "",
+        port: int = 0,
+        host: str = HEALTH_METRICS_DEFAULT_HOST,
+    ):
+        """Configure the exporter.
+
+        Parameters:
+        -----------
+        source (str) : healthpoll instance_id, added as a label to all metrics.
+
+        path (str) : if not empty, write() puts snapshots in this file.
+
+        port (int) : if not 0, start() serves snapshots on this port.
+
+        host (str) : address to serve snapshots on.
+
+        """
+        self.source: str = source
+        self.path: str = path
+        self.port: int = port
+        self.host: str = host
+
+        self._checks: Dict[str, _CheckMetrics] = {}
+        """Metric values per healthcheck instance_id."""
+        self._polls: int = 0
+        """How many polls have completed."""
+        self._poll_duration: LatencyHistogram = LatencyHistogram()
+        """Histogram of full poll durations."""
+        self._lock: threading.Lock = threading.Lock()
+        """Keeps snapshots consistent while checks are being observed."""
+        self._server: http.server.ThreadingHTTPServer = None
+        """HTTP server, if serving."""
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about the exporter for introspection."""
+        return {
+            "path": self.path,
+            "address": self.server_address(),
+            "checks": len(self._checks),
+            "polls": self._polls,
+        }
+
+    def observe(self, instance_id: str, plugin_id: str, status: HealthStatus, duration: float):
+        """Record the result of a single healthcheck."""
+        with self._lock:
+            try:
+                check = self._checks[instance_id]
+            except KeyError:
+                check = self._checks[instance_id] = _CheckMetrics(plugin_id)
+
+            check.status = status
+            check.status_counts[status] = check.status_counts.get(status, 0) + 1
+            check.duration.record(duration)
+            if status in (HealthStatus.INFO, HealthStatus.HEALTHY):
+                check.last_success = time.time()
+
+    def observe_skipped(self, instance_id: str, skipped: int):
+        """Record ticks skipped for a healthcheck."""
+        with self._lock:
+            if instance_id in self._checks:
+                self._checks[instance_id].skipped += skipped
+
+    def observe_poll(self, duration: float):
+        """Record a completed poll."""
+        with self._lock:
+            self._polls += 1
+            self._poll_duration.record(duration)
+
+    def render(self) -> str:
+        """Render a snapshot of all metrics in Prometheus text format."""
+        prefix = HEALTH_METRICS_PREFIX
+        source = self.source
+        lines: List[str] = []
+
+        with self._lock:
+            checks: List[Tuple[str, _CheckMetrics]] = sorted(self._checks.items())
+
+            lines.append(f"# HELP {prefix}_polls_total Completed health polls.")
+            lines.append(f"# TYPE {prefix}_polls_total counter")
+            lines.append(f"{prefix}_polls_total{{{_labels(source=source)}}} {self._polls}")
+            self._render_histogram(
+                lines,
+                f"{prefix}_poll_duration_seconds",
+                "Health poll durations.",
+                [({"source": source}, self._poll_duration)],
+            )
+
+            lines.append(
+                f"# HELP {prefix}_status Current health status per check "
+                f"({', '.join(f'{status.value}={status.name}' for status in HealthStatus)})."
+            )
+            lines.append(f"# TYPE {prefix}_status gauge")
+            for instance_id, check in checks:
+                labels = _labels(source=source, instance_id=instance_id, plugin_id=check.plugin_id)
+                lines.append(f"{prefix}_status{{{labels}}} {check.status.value}")
+
+            lines.append(f"# HELP {prefix}_checks_total Completed health checks per status.")
+            lines.append(f"# TYPE {prefix}_checks_total counter")
+            for instance_id, check in checks:
+                for status, count in check.status_counts.items():
+                    labels = _labels(
+                        source=source, instance_id=instance_id, status=status.name.lower()
+                    )
+                    lines.append(f"{prefix}_checks_total{{{labels}}} {count}")
+
+            lines.append(
+                f"# HELP {prefix}_last_success_timestamp_seconds "
+                "Unix time of the last healthy check."
+            )
+            lines.append(f"# TYPE {prefix}_last_success_timestamp_seconds gauge")
+            for instance_id, check in checks:
+                labels = _labels(source=source, instance_id=instance_id)
+                lines.append(
+                    f"{prefix}_last_success_timestamp_seconds{{{labels}}} "
+                    f"{_number(check.last_success)}"
+                )
+
+            lines.append(
+                f"# HELP {prefix}_skipped_ticks_total "
+                "Check ticks skipped as the check was still running."
+            )
+            lines.append(f"# TYPE {prefix}_skipped_ticks_total counter")
+            for instance_id, check in checks:
+                labels = _labels(source=source, instance_id=instance_id)
+                lines.append(f"{prefix}_skipped_ticks_total{{{labels}}} {check.skipped}")
+
+            self._render_histogram(
+                lines,
+                f"{prefix}_check_duration_seconds",
+                "Health check durations.",
+                [
+                    ({"source": source, "instance_id": instance_id}, check.duration)
+                    for instance_id, check in checks
+                ],
+            )
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(
+        lines: List[str],
+        name: str,
+        description: str,
+        histograms: List[Tuple[Dict[str, str], LatencyHistogram]],
+    ):
+        """Render histograms with a label set each."""
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in histograms:
+            for bound, count in histogram.cumulative():
+                bucket_labels = _labels(**labels, le=_number(bound))
+                lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+            lines.append(f"{name}_sum{{{_labels(**labels)}}} {_number(histogram.total)}")
+            lines.append(f"{name}_count{{{_labels(**labels)}}} {histogram.count}")
+
+    def write(self):
+        """Write a snapshot to the file, if there is one.
+
+        The snapshot is written to a temporary file and moved into place, so
+        that readers never see a partial snapshot.  Temporary files are only
+        readable by their owner, so the file mode is set before the move, to
+        let a collector such as the node-exporter textfile collector read it.
+
+        """
+        if not self.path:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics.")
+        try:
+            os.fchmod(handle, HEALTH_METRICS_FILE_MODE)
+            with os.fdopen(handle, "w", encoding="utf8") as temp_file:
+                temp_file.write(self.render())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def start(self):
+        """Serve snapshots over HTTP in a background thread, if there is a port."""
+        if not self.port or self._server is not None:
+            return
+
+        exporter = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            """Answer every GET with a metrics snapshot."""
+
+            # pylint: disable=invalid-name
+            def do_GET(self):
+                """Send the current snapshot."""
+                body = exporter.render().encode("utf8")
+                self.send_response(200)
+                self.send_header("Content-Type", HEALTH_METRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            # pylint: disable=redefined-builtin
+            def log_message(self, format, *args):
+                """Send request logs to debug logging instead of stderr."""
+                logger.debug(format, *args)
+
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            name=f"{self.source}-metrics", target=self._server.serve_forever, daemon=True
+        ).start()
+        logger.info("serving health metrics on %s:%s", *self.server_address())
+
+    def stop(self):
+        """Stop serving snapshots over HTTP."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def server_address(self) -> Tuple[str, int]:
+        """Return the (host, port) being served on, or None if not serving."""
+        if self._server is None:
+            return None
+        return self._server.server_address[:2]
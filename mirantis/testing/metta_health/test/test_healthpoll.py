@@ -0,0 +1,331 @@
+"""
+
+Test the healthpoll workload against fake healthcheck plugins.
+
+"""
+import os
+import socket
+import stat
+import tempfile
+import time
+import unittest
+import urllib.request
+
+from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta_health.healthcheck import (
+    METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK,
+    Health,
+    HealthStatus,
+)
+from mirantis.testing.metta_health.healthpoll_workload import (
+    HealthPollWorkload,
+    HEALTHPOLL_POLL_TIMINGS_KEPT,
+)
+from mirantis.testing.metta_health.metrics import LatencyHistogram
+from mirantis.testing.metta_health.prometheus import HealthMetricsExporter
+
+
+class FakeConfig:
+    """Config stand-in which only knows about defaults."""
+
+    def __init__(self, values: dict = None):
+        """Keep some key values."""
+        self.values = values if values is not None else {}
+
+    def load(self, label: str):  # pylint: disable=unused-argument
+        """Return self as the loaded config."""
+        return self
+
+    def get(self, key, default=None):
+        """Return a value if we have one for the non-root part of the key."""
+        return self.values.get(key[1], default)
+
+
+class FakeEnvironment:
+    """Environment stand-in which only provides config."""
+
+    def __init__(self, values: dict = None):
+        """Keep fake config."""
+        self._config = FakeConfig(values)
+
+    def config(self):
+        """Return the fake config."""
+        return self._config
+
+
+class FakeClock:
+    """Clock stand-in where sleeping just moves the time on."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def time(self) -> float:
+        """Return the fake time."""
+        return self.now
+
+    def sleep(self, seconds: float):
+        """Move the fake time on."""
+        self.now += seconds
+
+
+class SleepyHealthcheck:
+    """Healthcheck plugin which takes a while to answer."""
+
+    def __init__(self, instance_id: str, delay: float, sleep=time.sleep):
+        """Keep how long to sleep for."""
+        self.instance_id = instance_id
+        self.delay = delay
+        self.sleep = sleep
+
+    def health(self) -> Health:
+        """Sleep then report healthy."""
+        self.sleep(self.delay)
+        health = Health(source=self.instance_id)
+        health.healthy("ok")
+        return health
+
+
+def _healthcheck_fixtures(delays: dict, labels: dict = None, sleep=time.sleep) -> Fixtures:
+    """Make a healthcheck fixture for each instance_id: delay pair."""
+    if labels is None:
+        labels = {}
+    fixtures = Fixtures()
+    for instance_id, delay in delays.items():
+        fixtures.new(
+            plugin=SleepyHealthcheck(instance_id, delay, sleep),
+            plugin_id="sleepy",
+            instance_id=instance_id,
+            interfaces=[METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK],
+            labels=labels.get(instance_id, {}),
+            priority=50,
+        )
+    return fixtures
+
+
+def _poll_for(workload: HealthPollWorkload, seconds: float):
+    """Run the workload poll thread for some seconds."""
+    workload.apply()
+    # the poll thread drops its own reference when it finishes
+    thread = workload._thread  # pylint: disable=protected-access
+    time.sleep(seconds)
+    workload.destroy()
+    thread.join()
+
+
+def _poll_with_clock(workload: HealthPollWorkload, clock: FakeClock):
+    """Run the workload poll in this thread on a fake clock, until its duration expires."""
+    workload.clock = clock.time
+    workload.sleep = clock.sleep
+    workload._run()  # pylint: disable=protected-access
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    """Fixed bucket histogram behaviour."""
+
+    def test_buckets(self):
+        """Durations land in the right buckets."""
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+        for duration in [0.05, 0.1, 0.5, 2.0, 3.0]:
+            histogram.record(duration)
+
+        self.assertEqual(histogram.counts, [2, 1, 2])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.max, 3.0)
+        self.assertEqual(histogram.cumulative(), [(0.1, 2), (1.0, 3), (float("inf"), 5)])
+
+
+class HealthPollLatencyTest(unittest.TestCase):
+    """Healthpoll latency and overrun recording."""
+
+    def test_check_latency(self):
+        """Each healthcheck gets its own latency histogram."""
+        workload = HealthPollWorkload(FakeEnvironment(), "poll")
+        workload.prepare(_healthcheck_fixtures({"fast": 0, "slow": 0.05}))
+        workload._healthcheck()  # pylint: disable=protected-access
+
+        latency = workload.latency()
+        self.assertEqual(list(latency["check_latency"].keys()), ["slow", "fast"])
+        self.assertEqual(latency["check_latency"]["slow"]["count"], 1)
+        self.assertGreaterEqual(latency["check_latency"]["slow"]["max"], 0.05)
+        self.assertIn("polling", workload.info(deep=True))
+
+    def test_overruns(self):
+        """Checks and polls longer than their interval are counted, and ticks skipped."""
+        clock = FakeClock()
+        workload = HealthPollWorkload(
+            FakeEnvironment({"poll.period": 1, "poll.duration": 10}), "poll"
+        )
+        workload.prepare(_healthcheck_fixtures({"slow": 2.5}, sleep=clock.sleep))
+        _poll_with_clock(workload, clock)
+
+        # checks run at 0, 3, 6 and 9, each skipping two ticks
+        latency = workload.latency()
+        self.assertEqual(latency["overruns"], 4)
+        self.assertEqual(latency["check_overruns"], 4)
+        self.assertEqual(latency["skipped"], 8)
+        self.assertEqual(latency["check_latency"]["slow"]["overruns"], 4)
+        self.assertEqual(latency["check_latency"]["slow"]["skipped"], 8)
+        self.assertEqual(latency["poll_latency"]["count"], 4)
+
+
+class HealthPollScheduleTest(unittest.TestCase):
+    """Healthpoll per fixture intervals."""
+
+    def test_intervals(self):
+        """Fixtures are polled on their own label or config intervals."""
+        clock = FakeClock()
+        workload = HealthPollWorkload(
+            FakeEnvironment(
+                {"poll.period": 0.5, "poll.duration": 5, "poll.intervals": {"config": 100}}
+            ),
+            "poll",
+        )
+        workload.prepare(
+            _healthcheck_fixtures(
+                {"default": 0, "label": 0, "config": 0},
+                labels={"label": {"healthpoll.interval": "1"}},
+                sleep=clock.sleep,
+            )
+        )
+        _poll_with_clock(workload, clock)
+
+        checks = workload.latency()["check_latency"]
+        # checks run at the start of the run, and then every interval
+        self.assertEqual(checks["config"]["count"], 1)
+        self.assertEqual(checks["label"]["count"], 6)
+        self.assertEqual(checks["default"]["count"], 11)
+        self.assertEqual(workload.latency()["skipped"], 0)
+
+    def test_poll_timings_bounded(self):
+        """Only the recent poll timings are kept, while every poll is counted."""
+        clock = FakeClock()
+        workload = HealthPollWorkload(
+            FakeEnvironment({"poll.period": 0.01, "poll.duration": 5}), "poll"
+        )
+        workload.prepare(_healthcheck_fixtures({"quick": 0}, sleep=clock.sleep))
+
+        seen = []
+
+        def sleep(seconds: float):
+            """Note the poll count and kept timings, then move the fake time on."""
+            # pylint: disable=protected-access
+            seen.append(
+                (
+                    workload.poll_count(),
+                    len(workload._poll_timings),
+                    workload.poll_timing(1) - workload.poll_timing(2),
+                )
+            )
+            clock.sleep(seconds)
+
+        workload.clock = clock.time
+        workload.sleep = sleep
+        workload._run()  # pylint: disable=protected-access
+
+        polls, kept, last_gap = seen[-1]
+        self.assertGreater(polls, HEALTHPOLL_POLL_TIMINGS_KEPT)
+        self.assertEqual(kept, HEALTHPOLL_POLL_TIMINGS_KEPT)
+        self.assertGreater(last_gap, 0)
+
+    def test_bad_interval(self):
+        """Intervals have to be positive."""
+        workload = HealthPollWorkload(FakeEnvironment({"poll.intervals": {"bad": 0}}), "poll")
+        fixture = _healthcheck_fixtures({"bad": 0}).get(instance_id="bad")
+        with self.assertRaises(ValueError):
+            workload.interval(fixture)
+
+
+def _free_port() -> int:
+    """Find a free local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class HealthMetricsExporterTest(unittest.TestCase):
+    """Prometheus text format export."""
+
+    def test_render(self):
+        """Observations show up in the snapshot."""
+        exporter = HealthMetricsExporter(source="poll")
+        exporter.observe("one", "sleepy", HealthStatus.HEALTHY, 0.02)
+        exporter.observe("one", "sleepy", HealthStatus.ERROR, 0.2)
+        exporter.observe('t"wo', "sleepy", HealthStatus.WARNING, 0.02)
+        exporter.observe_skipped("one", 2)
+        exporter.observe_poll(0.3)
+
+        snapshot = exporter.render().splitlines()
+        self.assertIn('metta_health_polls_total{source="poll"} 1', snapshot)
+        self.assertIn(
+            'metta_health_status{source="poll",instance_id="one",plugin_id="sleepy"} 7', snapshot
+        )
+        self.assertIn(
+            'metta_health_checks_total{source="poll",instance_id="one",status="healthy"} 1',
+            snapshot,
+        )
+        self.assertIn(
+            'metta_health_checks_total{source="poll",instance_id="t\\"wo",status="warning"} 1',
+            snapshot,
+        )
+        self.assertIn(
+            'metta_health_skipped_ticks_total{source="poll",instance_id="one"} 2', snapshot
+        )
+        self.assertIn(
+            "metta_health_check_duration_seconds_bucket"
+            '{source="poll",instance_id="one",le="0.05"} 1',
+            snapshot,
+        )
+        self.assertIn(
+            "metta_health_check_duration_seconds_bucket"
+            '{source="poll",instance_id="one",le="+Inf"} 2',
+            snapshot,
+        )
+        self.assertIn(
+            'metta_health_check_duration_seconds_count{source="poll",instance_id="one"} 2',
+            snapshot,
+        )
+        last_success = [
+            line
+            for line in snapshot
+            if line.startswith("metta_health_last_success_timestamp_seconds")
+        ]
+        self.assertEqual(len(last_success), 2)
+        # "one" was healthy once, "t\"wo" never was
+        self.assertGreater(float(last_success[0].split()[-1]), 0)
+        self.assertTrue(last_success[1].endswith(" 0.0"))
+
+    def test_export_file(self):
+        """The poller writes a snapshot to the export file on each poll."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "health.prom")
+            workload = HealthPollWorkload(
+                FakeEnvironment({"poll.period": 0.05, "export.file": path}), "poll"
+            )
+            workload.prepare(_healthcheck_fixtures({"one": 0}))
+            _poll_for(workload, 0.12)
+
+            with open(path, encoding="utf8") as metrics_file:
+                snapshot = metrics_file.read()
+            self.assertIn('metta_health_status{source="poll",instance_id="one"', snapshot)
+            self.assertEqual(os.listdir(tmpdir), ["health.prom"])
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+    def test_export_http(self):
+        """The exporter serves snapshots over HTTP."""
+        exporter = HealthMetricsExporter(source="poll", port=_free_port())
+        exporter.observe("one", "sleepy", HealthStatus.HEALTHY, 0.02)
+        exporter.start()
+        try:
+            host, port = exporter.server_address()
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                snapshot = response.read().decode("utf8")
+        finally:
+            exporter.stop()
+
+        self.assertIn('metta_health_checks_total{source="poll",instance_id="one"', snapshot)
+        self.assertIsNone(exporter.server_address())
+
+
+if __name__ == "__main__":
+    unittest.main()
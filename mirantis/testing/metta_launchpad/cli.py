@@ -153,9 +153,7 @@ class LaunchpadClientGroup:
 
         logger.info("Downloading client bungle for user: %s", user)
         try:
-            # access private method for manual interaction
-            # pylint: disable=protected-access
-            bundle = plugin._mke_client_bundle(user=user, reload=reload)
+            bundle = plugin.bundle(user=user, reload=reload)
         except Exception as err:
             raise Exception("Launchpad command failed.") from err
 
@@ -202,7 +202,7 @@ class LaunchpadClientPlugin:
         # client bundles.
         try:
             # this plugin client maintains a client bundle
-            self.launchpad.get_bundle(user="admin")
+            self.launchpad.get_bundle(user="admin", reload=True)
         except KeyError as err:
             raise RuntimeError("Launchpad client failed to download client bundle.") from err
 
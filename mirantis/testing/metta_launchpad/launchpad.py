@@ -7,15 +7,20 @@ executing commands.
 
 """
 import os
+import copy
 import logging
 import json
 import datetime
+import random
 import subprocess
 import shutil
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Tuple
 
 import yaml
 
+from mirantis.testing.metta_common.process import ProcessHandle
+
 logger = logging.getLogger("metta_launchpad:launchpad")
 
 METTA_LAUNCHPAD_CLI_CONFIG_FILE_DEFAULT = "./launchpad.yml"
@@ -37,6 +42,12 @@ METTA_USER_LAUNCHPAD_BUNDLE_META_FILE = "meta.json"
 
 LAUNCHPAD_CLIENT_BUNDLE_RETRY_COUNT_DEFAULT = 2
 """ default value for how many times we should retry client bundle download """
+LAUNCHPAD_CLIENT_BUNDLE_RETRY_BACKOFF_DEFAULT = 2.0
+""" default seconds to wait before the first client bundle download retry """
+LAUNCHPAD_CLIENT_BUNDLE_RETRY_BACKOFF_MAX = 60.0
+""" maximum seconds to wait between client bundle download retries """
+LAUNCHPAD_CLIENT_BUNDLE_MAX_AGE_DEFAULT = 24 * 60 * 60
+""" default seconds after download that a client bundle is no longer trusted """
 
 
 # yeah, this should probably get reduced.  Maybe combine the bools into a map
@@ -107,6 +118,13 @@ class LaunchpadClient:
 
         self.client_bundle_retry_count: int = int(LAUNCHPAD_CLIENT_BUNDLE_RETRY_COUNT_DEFAULT)
         """ how many times to rety a client bundle download """
+        self.client_bundle_retry_backoff: float = LAUNCHPAD_CLIENT_BUNDLE_RETRY_BACKOFF_DEFAULT
+        """ seconds to wait before the first retry, doubling for each further retry """
+        self.client_bundle_max_age: float = LAUNCHPAD_CLIENT_BUNDLE_MAX_AGE_DEFAULT
+        """ seconds after which a downloaded bundle is re-downloaded. 0 means never """
+
+        self._bundle_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+        """ parsed bundle data per user, with the meta file stat it was parsed from """
 
         self.cli_options: Dict[str, bool] = cli_options if cli_options is not None else {}
         """Dict of global cli bool options that the client should include on calls."""
@@ -159,6 +177,17 @@ class LaunchpadClient:
         """Install using the launchpad client."""
         self._run(["apply"], debug=debug)
 
+    def start_apply(self, debug: bool = False) -> ProcessHandle:
+        """Start a launchpad install in the background.
+
+        Non-blocking version of apply(); returns a started process handle
+        which can be polled, waited on, cancelled or used to stream output.
+
+        """
+        cmd = self._cmd(["apply"], debug=debug)
+        logger.debug("starting launchpad command: %s", " ".join(cmd))
+        return ProcessHandle(cmd, cwd=self.working_dir).start()
+
     def exec(self, host_index: int, cmds: List[str]):
         """Execute a command on a host index."""
         client_config = self.describe_config()
@@ -210,33 +239,83 @@ class LaunchpadClient:
         """List bundle users which have been downloaded."""
         return self._mke_client_downloaded_bundle_user_paths().keys()
 
-    def get_bundle(self, user: str, reload: bool = True):
-        """Retrieve the client bundle from the MKE endpoint."""
-        client_bundle_path = self._mke_client_bundle_path(user)
-        client_bundle_meta_file = os.path.join(
-            client_bundle_path, METTA_USER_LAUNCHPAD_BUNDLE_META_FILE
+    def get_bundle(self, user: str, reload: bool = False):
+        """Retrieve the client bundle from the MKE endpoint.
+
+        The download is skipped if a fresh bundle already exists (see
+        bundle_is_fresh()) unless reload is True.
+
+        Downloads are retried, waiting an exponentially growing, jittered
+        time between attempts.
+
+        Parameters:
+        -----------
+        user (str) : MKE user to download the bundle for
+
+        reload (bool) : download the bundle even if a fresh one exists.
+
+        """
+        if not reload and self.bundle_is_fresh(user):
+            logger.debug("Reusing fresh client bundle for user %s", user)
+            return
+
+        # @NOTE currently client bundle downloads are flaky.  They fail about 1/5 times
+        #    with unclear TLS issues.  Because the failures are intermittent, we should
+        #    just try again
+
+        attempts = max(1, self.client_bundle_retry_count)
+        for attempt in range(1, attempts + 1):
+            try:
+                self._run(["client-config", user])
+                return
+            except subprocess.CalledProcessError as err:
+                if attempt == attempts:
+                    raise RuntimeError(
+                        "Numerous attempts to download the client bundle failed."
+                    ) from err
+
+                delay = self._bundle_retry_delay(attempt)
+                logger.warning(
+                    "Attempt %s to download bundle failed.  Assuming flaky "
+                    "behaviour and trying again in %.1fs : %s",
+                    attempt,
+                    delay,
+                    err,
+                )
+                time.sleep(delay)
+
+    def _bundle_retry_delay(self, attempt: int) -> float:
+        """Return a jittered exponential backoff delay for a failed attempt.
+
+        The delay doubles per attempt up to a maximum, and a random value
+        between half and all of it is used, so that parallel jobs fetching
+        bundles don't retry in lock-step.
+
+        """
+        delay = min(
+            self.client_bundle_retry_backoff * (2 ** (attempt - 1)),
+            LAUNCHPAD_CLIENT_BUNDLE_RETRY_BACKOFF_MAX,
         )
+        return random.uniform(delay / 2, delay)
 
-        if reload or not os.path.isfile(client_bundle_meta_file):
+    def bundle_is_fresh(self, user: str) -> bool:
+        """Is there a usable downloaded client bundle for the user.
 
-            # @NOTE currently client bundle downloads are flaky.  They fail about 1/5 times
-            #    with unclear TLS issues.  Because the failures are intermittent, we should
-            #    just try again
+        A bundle is fresh if its meta file can be interpreted, and it was
+        downloaded less than client_bundle_max_age seconds ago.
 
-            for i in range(1, self.client_bundle_retry_count):
-                try:
-                    self._run(["client-config", user])
-                    break
-                except subprocess.CalledProcessError as err:
-                    logger.warning(
-                        "Attempt %s to download bundle failed.  Assuming flaky "
-                        "behaviour and trying again : %s",
-                        i,
-                        err,
-                    )
+        """
+        try:
+            data = self.bundle(user)
+        except (ValueError, KeyError):
+            return False
 
-            else:
-                raise RuntimeError("Numerous attempts to download the client bundle failed.")
+        if self.client_bundle_max_age:
+            age = time.time() - data["mtime"]
+            if age > self.client_bundle_max_age:
+                logger.debug("client bundle for %s is stale: %ss old", user, int(age))
+                return False
+        return True
 
     def bundle(self, user: str):
         """Interpret the bundle metadata as a dict.
@@ -250,11 +329,37 @@ class LaunchpadClient:
         downloaded.
         If you perform an action, you should consider asking for the client bundle.
 
+        The interpreted data is kept until the meta file changes, so repeated
+        calls don't re-read the bundle.  Each call returns its own copy.
+
         """
         client_bundle_path: str = self._mke_client_bundle_path(user)
         client_bundle_meta_file: str = os.path.join(
             client_bundle_path, METTA_USER_LAUNCHPAD_BUNDLE_META_FILE
         )
+        try:
+            meta_stat = os.stat(client_bundle_meta_file)
+        except FileNotFoundError as err:
+            self._bundle_cache.pop(user, None)
+            raise ValueError(
+                f"failed to open the launchpad client bundle meta "
+                f"file : {client_bundle_meta_file}"
+            ) from err
+
+        stat_key = (meta_stat.st_mtime_ns, meta_stat.st_size, meta_stat.st_ino)
+        cached = self._bundle_cache.get(user)
+        if cached is None or cached[0] != stat_key:
+            data = self._read_bundle(client_bundle_path, client_bundle_meta_file)
+            data["mtime"] = meta_stat.st_mtime
+            data["modified"] = datetime.datetime.fromtimestamp(meta_stat.st_mtime).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            cached = self._bundle_cache[user] = (stat_key, data)
+
+        return copy.deepcopy(cached[1])
+
+    def _read_bundle(self, client_bundle_path: str, client_bundle_meta_file: str):
+        """Read and interpret a bundle meta file."""
         # Will hold data pulled from the client meta data file
         data: Dict[str, Any] = {}
         try:
@@ -274,9 +379,6 @@ class LaunchpadClient:
         data["Endpoints"]["kubernetes"]["kubeconfig"] = client_bundle_kubeconfig_file
         # add some stuff that a client bundle always has
         data["path"] = client_bundle_path
-        data["modified"] = datetime.datetime.fromtimestamp(
-            os.path.getmtime(client_bundle_meta_file)
-        ).strftime("%Y-%m-%d %H:%M:%S")
         # this stuff should already be in the bundle, but it isn't
         data["tls_paths"] = {
             "docker": os.path.join(client_bundle_path, "tls", "docker"),
@@ -295,6 +397,7 @@ class LaunchpadClient:
 
         if os.path.isdir(base):
             shutil.rmtree(base)
+        self._bundle_cache = {}
 
     def _mke_client_bundle_root(self):
         """Root path to the launchpad user conf."""
@@ -373,6 +476,30 @@ class LaunchpadClient:
         debug (bool) : override class debug value if True
 
         """
+        cmd = self._cmd(args, debug=debug)
+
+        # makes it more readable
+        # pylint: disable=no-else-return
+        if return_output:
+            logger.debug("running launchpad command with output capture: %s", " ".join(cmd))
+            return_res = subprocess.run(
+                cmd,
+                cwd=self.working_dir,
+                shell=False,
+                check=True,
+                stdout=subprocess.PIPE,
+            )
+            return_res.check_returncode()
+            return return_res.stdout.decode("utf-8")
+
+        else:
+            logger.debug("running launchpad command: %s", " ".join(cmd))
+            res = subprocess.run(cmd, cwd=self.working_dir, check=True, text=True)
+            res.check_returncode()
+            return res
+
+    def _cmd(self, args: List[str], debug: bool = False) -> List[str]:
+        """Build a launchpad command list including the global cli options."""
         # if the command passed uses a config file, add the flag for it
         if not args[0] in ["help", "version"]:
             args = [args[0]] + ["-c", self.config_file] + args[1:]
@@ -396,22 +523,4 @@ class LaunchpadClient:
         if len(args) > 1:
             cmd += args[1:]
 
-        # makes it more readable
-        # pylint: disable=no-else-return
-        if return_output:
-            logger.debug("running launchpad command with output capture: %s", " ".join(cmd))
-            return_res = subprocess.run(
-                cmd,
-                cwd=self.working_dir,
-                shell=False,
-                check=True,
-                stdout=subprocess.PIPE,
-            )
-            return_res.check_returncode()
-            return return_res.stdout.decode("utf-8")
-
-        else:
-            logger.debug("running launchpad command: %s", " ".join(cmd))
-            res = subprocess.run(cmd, cwd=self.working_dir, check=True, text=True)
-            res.check_returncode()
-            return res
+        return cmd
@@ -21,6 +21,7 @@ from configerus.validator import ValidationError
 
 from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta_common.files import write_if_changed
 
 from .client import (
     METTA_LAUNCHPAD_CLIENT_PLUGIN_ID,
@@ -243,9 +244,11 @@ class LaunchpadProvisionerPlugin:
         return bool(config_file) and os.path.exists(config_file)
 
     def _write_launchpad_yml(self):
-        """Write config contents to a yaml file for launchpad."""
-        self._rm_launchpad_yml()
+        """Write config contents to a yaml file for launchpad.
 
+        The file is left alone if its contents would not change.
+
+        """
         # load and validation all of the launchpad configuration.
         launchpad_loaded = self._environment.config().load(
             self._config_label,
@@ -272,13 +275,9 @@ class LaunchpadProvisionerPlugin:
         config_contents = self._convert_launchpad_config_to_file_format(config_contents)
 
         # write the launchpad output to our yaml file target (after creating the path)
-        logger.debug(
-            "Updating launchpad yaml file: %s =>/n%s",
-            config_path,
-            yaml.dump(config_contents),
-        )
-        with open(config_path, "w", encoding="utf8") as config_file_object:
-            yaml.dump(config_contents, config_file_object)
+        config_yaml = yaml.dump(config_contents)
+        logger.debug("Updating launchpad yaml file: %s =>/n%s", config_path, config_yaml)
+        write_if_changed(config_path, config_yaml)
 
     def _rm_launchpad_yml(self):
         """Update config and write the cfg and inventory files."""
@@ -0,0 +1,143 @@
+"""
+
+Test the launchpad subprocess client using a fake launchpad binary.
+
+"""
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from mirantis.testing.metta_launchpad import launchpad
+from mirantis.testing.metta_launchpad.launchpad import LaunchpadClient
+
+FAKE_LAUNCHPAD = """#!{python}
+import json, os, sys
+with open({log!r}, "a", encoding="utf8") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if sys.argv[1] == "client-config":
+    fail_file = {fail!r}
+    if os.path.isfile(fail_file):
+        with open(fail_file, encoding="utf8") as fail_count:
+            failures = int(fail_count.read())
+        if failures > 0:
+            with open(fail_file, "w", encoding="utf8") as fail_count:
+                fail_count.write(str(failures - 1))
+            sys.exit(1)
+    bundle = os.path.join({cluster!r}, "test", "bundle", sys.argv[-1])
+    os.makedirs(bundle, exist_ok=True)
+    with open(os.path.join(bundle, "kube.yml"), "w", encoding="utf8") as kube:
+        kube.write("kubeconfig")
+    with open(os.path.join(bundle, "meta.json"), "w", encoding="utf8") as meta:
+        json.dump({{"Endpoints": {{"kubernetes": {{"Host": "https://example"}}}}}}, meta)
+"""
+
+
+class LaunchpadBundleTest(unittest.TestCase):
+    """Client bundle download and caching against a fake binary."""
+
+    def setUp(self):
+        """Write a fake launchpad binary and point the cluster path at a temp dir."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmpdir.name, "calls.log")
+        self.fail = os.path.join(self.tmpdir.name, "fail")
+        cluster = os.path.join(self.tmpdir.name, "cluster")
+        binary = os.path.join(self.tmpdir.name, "launchpad")
+        with open(binary, "w", encoding="utf8") as bin_file:
+            bin_file.write(
+                FAKE_LAUNCHPAD.format(
+                    python=sys.executable, log=self.log, fail=self.fail, cluster=cluster
+                )
+            )
+        os.chmod(binary, os.stat(binary).st_mode | stat.S_IEXEC)
+
+        patcher = mock.patch.object(launchpad, "METTA_USER_LAUNCHPAD_CLUSTER_PATH", cluster)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = LaunchpadClient(
+            config_file=os.path.join(self.tmpdir.name, "launchpad.yml"),
+            working_dir=self.tmpdir.name,
+            cluster_name_override="test",
+            binary=binary,
+        )
+        self.client.client_bundle_retry_backoff = 0.01
+
+    def tearDown(self):
+        """Remove the fake binary and bundles."""
+        self.tmpdir.cleanup()
+
+    def _downloads(self):
+        """Return how many times the bundle was downloaded."""
+        if not os.path.isfile(self.log):
+            return 0
+        with open(self.log, encoding="utf8") as log_file:
+            return sum(1 for call in log_file if call.startswith("client-config"))
+
+    def test_bundle_reuse(self):
+        """A fresh bundle is not downloaded again unless asked for."""
+        self.client.get_bundle("admin")
+        self.client.get_bundle("admin")
+        self.assertEqual(self._downloads(), 1)
+
+        self.client.get_bundle("admin", reload=True)
+        self.assertEqual(self._downloads(), 2)
+
+    def test_bundle_max_age(self):
+        """A bundle older than the max age is downloaded again."""
+        self.client.get_bundle("admin")
+        meta = os.path.join(self.client.bundle("admin")["path"], "meta.json")
+        old = time.time() - self.client.client_bundle_max_age - 10
+        os.utime(meta, (old, old))
+
+        self.assertFalse(self.client.bundle_is_fresh("admin"))
+        self.client.get_bundle("admin")
+        self.assertEqual(self._downloads(), 2)
+
+    def test_bundle_memoized(self):
+        """Bundle data is only re-read when the meta file changes."""
+        self.client.get_bundle("admin")
+        first = self.client.bundle("admin")
+        first["Endpoints"]["kubernetes"]["Host"] = "changed"
+
+        with mock.patch.object(self.client, "_read_bundle") as read_bundle:
+            second = self.client.bundle("admin")
+            read_bundle.assert_not_called()
+        self.assertEqual(second["Endpoints"]["kubernetes"]["Host"], "https://example")
+
+        self.client.get_bundle("admin", reload=True)
+        os.utime(os.path.join(second["path"], "meta.json"), (1, 1))
+        with mock.patch.object(self.client, "_read_bundle", return_value={}) as read_bundle:
+            self.client.bundle("admin")
+            read_bundle.assert_called_once()
+
+    def test_bundle_retry(self):
+        """Failed downloads are retried, until the attempts run out."""
+        self.client.client_bundle_retry_count = 3
+        with open(self.fail, "w", encoding="utf8") as fail_count:
+            fail_count.write("2")
+        self.client.get_bundle("admin")
+        self.assertEqual(self._downloads(), 3)
+        self.assertTrue(self.client.bundle_is_fresh("admin"))
+
+        with open(self.fail, "w", encoding="utf8") as fail_count:
+            fail_count.write("3")
+        with self.assertRaises(RuntimeError):
+            self.client.get_bundle("admin", reload=True)
+
+    def test_bundle_retry_delay(self):
+        """Retry delays grow exponentially, with jitter, up to a maximum."""
+        self.client.client_bundle_retry_backoff = 1
+        for attempt, delay in [(1, 1), (2, 2), (3, 4)]:
+            self.assertTrue(delay / 2 <= self.client._bundle_retry_delay(attempt) <= delay)
+        self.assertLessEqual(
+            self.client._bundle_retry_delay(20),
+            launchpad.LAUNCHPAD_CLIENT_BUNDLE_RETRY_BACKOFF_MAX,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
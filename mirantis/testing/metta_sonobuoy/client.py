@@ -15,6 +15,7 @@ from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta_health.healthcheck import Health
 
 from mirantis.testing.metta_kubernetes.kubeapi_client import KubernetesApiClientPlugin
+from mirantis.testing.metta_common.process import ProcessHandle
 
 from .sonobuoy import SonobuoyClient, SONOBUOY_DEFAULT_RESULTS_PATH
 from .plugin import Plugin
@@ -66,6 +67,10 @@ class SonobuoyClientPlugin:
         """Run sonobuoy."""
         return self._sonobuoy.run(wait=wait, run_args=run_args)
 
+    def start_run(self, wait: bool = True, run_args: List[str] = None) -> ProcessHandle:
+        """Start a sonobuoy run in the background, returning a process handle."""
+        return self._sonobuoy.start_run(wait=wait, run_args=run_args)
+
     def status(self) -> SonobuoyStatus:
         """Retrieve Sonobuoy status return."""
         return self._sonobuoy.status()
@@ -74,13 +79,13 @@ class SonobuoyClientPlugin:
         """Output sonobuoy logs."""
         return self._sonobuoy.logs(follow=follow)
 
-    def results(self) -> str:
+    def results(self, refresh: bool = False) -> str:
         """Retrieve sonobuoy results."""
-        return self._sonobuoy.results()
+        return self._sonobuoy.results(refresh=refresh)
 
-    def retrieve(self) -> SonobuoyResults:
+    def retrieve(self, refresh: bool = False) -> SonobuoyResults:
         """Retrieve sonobuoy results."""
-        return self._sonobuoy.retrieve()
+        return self._sonobuoy.retrieve(refresh=refresh)
 
     def delete(self, wait: bool = False):
         """Delete sonobuoy resources."""
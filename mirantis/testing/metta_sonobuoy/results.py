@@ -2,18 +2,28 @@
 
 Structures for interpreting Sonobuoy results.
 
+Results yaml files can be many megabytes, and reporting code tends to drill
+into the same plugin results and item files repeatedly, so parsed yaml is
+cached on the SonobuoyResults object, up to a memory cap.
+
 """
 import os
 import json
 import logging
+from collections import OrderedDict
 from enum import Enum, unique
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 import subprocess
 
 import yaml
 
 logger = logging.getLogger("sonobuoy:results")
 
+SonobuoyResultsYamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+""" yaml loader for results files, the C accelerated one if libyaml is available """
+SONOBUOY_RESULTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+""" default cap on the (on disk) size of parsed results files kept in memory """
+
 
 @unique
 # pylint: disable=too-few-public-methods
@@ -32,6 +42,8 @@ class Status(Enum):
     """ testing has completed without failure """
     PASSED = "passed"
     """ testing has passed """
+    SKIPPED = "skipped"
+    """ test was skipped """
     POSTPROCESS = "post-processing"
     """ testing has finished and is being processed """
 
@@ -76,15 +88,65 @@ class SonobuoyStatus:
         return f"[{']['.join(status)}]"
 
 
+class SonobuoyYamlCache:
+    """Parsed yaml files, kept up to a memory cap.
+
+    The cap is applied to the on-disk size of the files, which is a cheap
+    stand-in for the size of the parsed data.  The least recently used files
+    are dropped first, but the last loaded file is always kept.
+
+    Parsed data is shared between callers, so treat it as read-only.
+
+    """
+
+    def __init__(self, max_bytes: int = SONOBUOY_RESULTS_CACHE_MAX_BYTES):
+        """Start an empty cache."""
+        self.max_bytes: int = max_bytes
+        """ cap on the total size of the cached files """
+        self._files: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        """ (size, parsed data) per file path, in least recently used order """
+        self._bytes: int = 0
+        """ total size of the cached files """
+
+    def load(self, path: str) -> Any:
+        """Return the parsed contents of a yaml file."""
+        try:
+            self._files.move_to_end(path)
+            return self._files[path][1]
+        except KeyError:
+            pass
+
+        with open(path, encoding="utf8") as yaml_file:
+            data = yaml.load(yaml_file, Loader=SonobuoyResultsYamlLoader)
+        size = os.path.getsize(path)
+
+        self._files[path] = (size, data)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            _, (dropped, _) = self._files.popitem(last=False)
+            self._bytes -= dropped
+        return data
+
+    def clear(self):
+        """Drop all cached files."""
+        self._files.clear()
+        self._bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        """Return dict data about the cache for introspection."""
+        return {"files": len(self._files), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
 class SonobuoyResultsPluginItem:
     """An individual item from a sonobuoy results plugin."""
 
-    def __init__(self, item_dict: Dict[str, Any]):
+    def __init__(self, item_dict: Dict[str, Any], yaml_cache: SonobuoyYamlCache = None):
         """Single plugin result item."""
         self.name = item_dict["name"]
         self.status = Status(item_dict["status"])
-        self.meta = item_dict["meta"]
+        self.meta = item_dict.get("meta", {})
         self.details = item_dict["details"] if "details" in item_dict else {}
+        self._yaml_cache: SonobuoyYamlCache = yaml_cache
 
     def meta_file_path(self):
         """Get the path to the error item file."""
@@ -92,17 +154,44 @@ class SonobuoyResultsPluginItem:
 
     def meta_file(self):
         """Get the contents of the file."""
+        if self._yaml_cache is not None:
+            return self._yaml_cache.load(self.meta_file_path())
         with open(self.meta_file_path(), encoding="utf8") as meta_file:
-            return yaml.safe_load(meta_file)
+            return yaml.load(meta_file, Loader=SonobuoyResultsYamlLoader)
 
 
 class SonobuoyResultsPlugin:
     """The full results for a plugin."""
 
-    def __init__(self, path: str):
-        """Load results for a plugin results call."""
-        with open(os.path.join(path, "sonobuoy_results.yaml"), encoding="utf8") as results_yaml:
-            self.summary = yaml.safe_load(results_yaml)
+    def __init__(self, path: str, yaml_cache: SonobuoyYamlCache = None):
+        """Load results for a plugin results call.
+
+        Parameters:
+        -----------
+        path (str) : plugin results folder
+
+        yaml_cache (SonobuoyYamlCache) : cache to keep parsed files in.  If
+            None then a cache is created just for this plugin.
+
+        """
+        self._yaml_cache: SonobuoyYamlCache = (
+            yaml_cache if yaml_cache is not None else SonobuoyYamlCache()
+        )
+        self._results_file: str = os.path.join(path, "sonobuoy_results.yaml")
+        # parse now, so that a missing or broken file is found early
+        self._yaml_cache.load(self._results_file)
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """Return the parsed plugin results file.
+
+        The parsed file is not kept on the plugin, so that it stays under the
+        cache memory cap.  Each access is a cache lookup, and re-parses the
+        file if the cache dropped it, so read it once per operation rather
+        than once per item.
+
+        """
+        return self._yaml_cache.load(self._results_file)
 
     def name(self) -> str:
         """Return string name of plugin."""
@@ -117,15 +206,66 @@ class SonobuoyResultsPlugin:
         return len(self.summary["items"])
 
     def __getitem__(self, instance_id: Any) -> SonobuoyResultsPluginItem:
-        """Get item details from the plugin results."""
-        return SonobuoyResultsPluginItem(item_dict=self.summary["items"][instance_id])
+        """Get item details from the plugin results.
+
+        Use items() to go through all of the items, which reads the summary
+        only once.
+
+        """
+        return SonobuoyResultsPluginItem(
+            item_dict=self.summary["items"][instance_id], yaml_cache=self._yaml_cache
+        )
+
+    def items(self, status: Status = None) -> Iterator[SonobuoyResultsPluginItem]:
+        """Iterate over the leaf items in the plugin results.
+
+        Items can be nested (e.g. e2e results are grouped by junit file), so
+        the parsed tree is walked, and only items without child items are
+        yielded, in results file order.  Filtering is done on the raw status
+        string, so only matching items are wrapped in item objects.
+
+        Parameters:
+        -----------
+        status (Status) : only yield items with this status.  If None then
+            all leaf items are yielded.
+
+        """
+        status_value: str = status.value if status is not None else ""
+        # the summary is read once, and the item dicts are walked directly
+        stack: List[Dict[str, Any]] = list(reversed(self.summary.get("items") or []))
+        while stack:
+            item_dict = stack.pop()
+            children = item_dict.get("items")
+            if children:
+                stack.extend(reversed(children))
+                continue
+            if status_value and item_dict.get("status") != status_value:
+                continue
+            yield SonobuoyResultsPluginItem(item_dict=item_dict, yaml_cache=self._yaml_cache)
+
+    def failures(self) -> Iterator[SonobuoyResultsPluginItem]:
+        """Iterate over the failed leaf items in the plugin results."""
+        return self.items(status=Status.FAILED)
 
 
 class SonobuoyResults:
     """Results retrieved analyzer."""
 
-    def __init__(self, tarball: str, folder: str):
-        """Interpret tarball contents."""
+    def __init__(
+        self, tarball: str, folder: str, cache_max_bytes: int = SONOBUOY_RESULTS_CACHE_MAX_BYTES
+    ):
+        """Interpret tarball contents.
+
+        Parameters:
+        -----------
+        tarball (str) : path to the retrieved results tarball
+
+        folder (str) : path to extract the tarball into
+
+        cache_max_bytes (int) : cap on the size of parsed results files kept
+            in memory.
+
+        """
         logger.debug("un-tarring retrieved results: %s", tarball)
         res = subprocess.run(["tar", "-xzf", tarball, "-C", folder], check=True, text=True)
         res.check_returncode()
@@ -143,10 +283,28 @@ class SonobuoyResults:
         for plugin_id in self.meta_info["plugins"]:
             self.plugins.append(plugin_id)
 
+        self._yaml_cache: SonobuoyYamlCache = SonobuoyYamlCache(max_bytes=cache_max_bytes)
+        """ parsed results and item files, shared by all plugin results """
+        self._plugin_results: Dict[str, SonobuoyResultsPlugin] = {}
+        """ plugin results, by plugin_id """
+
     def plugin_list(self):
         """Return a string list of plugin ids."""
         return self.plugins
 
     def plugin(self, plugin_id) -> SonobuoyResultsPlugin:
-        """Return the results for a single plugin."""
-        return SonobuoyResultsPlugin(os.path.join(self.results_path, "plugins", plugin_id))
+        """Return the results for a single plugin.
+
+        Plugin results are kept, and their parsed files are cached (up to
+        the memory cap) so asking again does not re-parse the results.
+
+        """
+        try:
+            return self._plugin_results[plugin_id]
+        except KeyError:
+            pass
+        plugin_results = SonobuoyResultsPlugin(
+            os.path.join(self.results_path, "plugins", plugin_id), yaml_cache=self._yaml_cache
+        )
+        self._plugin_results[plugin_id] = plugin_results
+        return plugin_results
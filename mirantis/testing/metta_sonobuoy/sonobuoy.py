@@ -7,14 +7,15 @@ Use this to run the sonobuoy implementation
 """
 from typing import Dict, Any, List
 import logging
+import re
 import subprocess
 import os
 import shutil
-import tempfile
 
 import kubernetes
 
 from mirantis.testing.metta_kubernetes.kubeapi_client import KubernetesApiClientPlugin
+from mirantis.testing.metta_common.process import ProcessHandle
 
 from .plugin import Plugin
 from .results import SonobuoyResults, SonobuoyStatus
@@ -29,6 +30,10 @@ SONOBUOY_DEFAULT_BIN = "sonobuoy"
 """ Default Bin Name for running sonobuoy """
 SONOBUOY_DEFAULT_RESULTS_PATH = "./results"
 """ Default path for where to download sonobuoy results """
+SONOBUOY_RUN_UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+""" Pattern for finding the run UUID in a results tarball name """
 SONOBUOY_NAMESPACE = "sonobuoy"
 """K8s namespace where sonobuoy puts its stuff (RO)."""
 
@@ -83,6 +88,15 @@ class SonobuoyClient:
         self.create_crbs: bool = create_crbs
         """Whether or not this client should create sonobuoy CRB resources."""
 
+        self._retrieved_run: str = ""
+        """Run UUID for the cached tarball, results and report."""
+        self._retrieved_tarball: str = ""
+        """Path to the cached results tarball."""
+        self._retrieved_results: SonobuoyResults = None
+        """Cached extracted results."""
+        self._retrieved_report: str = ""
+        """Cached sonobuoy results report."""
+
     # deep is a metta info standard and expected to be here
     # pylint: disable=unused-argument
     def info(self, deep: bool = False) -> Dict[str, Any]:
@@ -96,10 +110,51 @@ class SonobuoyClient:
             "client": {
                 "sonobuoy_bin_path": self.bin,
             },
+            "retrieved": {
+                "run": self._retrieved_run,
+                "tarball": self._retrieved_tarball,
+            },
         }
 
     def run(self, wait: bool = True, run_args: List[str] = None):
         """Run sonobuoy."""
+        args = self._run_args(wait=wait, run_args=run_args)
+
+        self._forget_retrieved()
+        try:
+            if self.create_crbs:
+                logger.info("Ensuring that we have needed K8s CRBs")
+                self.create_k8s_crb()
+            logger.debug("Starting Sonobuoy run : %s", args)
+            self._run(args)
+        except subprocess.CalledProcessError as err:
+            raise RuntimeError("Sonobuoy RUN failed") from err
+
+    def start_run(self, wait: bool = True, run_args: List[str] = None) -> ProcessHandle:
+        """Start a sonobuoy run in the background.
+
+        Non-blocking version of run().  With wait=True the sonobuoy process
+        keeps running (and streaming progress) until the run completes, so the
+        returned handle can be used to follow progress, wait with a timeout or
+        cancel the wait.
+
+        Returns:
+        --------
+        A started ProcessHandle for the sonobuoy run.
+
+        """
+        args = self._run_args(wait=wait, run_args=run_args)
+        self._forget_retrieved()
+
+        if self.create_crbs:
+            logger.info("Ensuring that we have needed K8s CRBs")
+            self.create_k8s_crb()
+
+        logger.debug("Starting background Sonobuoy run : %s", args)
+        return ProcessHandle(self._cmd(args)).start()
+
+    def _run_args(self, wait: bool = True, run_args: List[str] = None) -> List[str]:
+        """Build the sonobuoy run arguments."""
         args = ["run"]
 
         if run_args is not None:
@@ -113,14 +168,7 @@ class SonobuoyClient:
             args += [f"--wait={SONODBUOY_DEFAULT_WAIT_PERIOD_SECS}"]
             args += [f"--wait-output={SONODBUOY_DEFAULT_WAIT_OUTPUT}"]
 
-        try:
-            if self.create_crbs:
-                logger.info("Ensuring that we have needed K8s CRBs")
-                self.create_k8s_crb()
-            logger.debug("Starting Sonobuoy run : %s", args)
-            self._run(args)
-        except subprocess.CalledProcessError as err:
-            raise RuntimeError("Sonobuoy RUN failed") from err
+        return args
 
     def status(self) -> "SonobuoyStatus":
         """Retrieve Sonobuoy status return."""
@@ -139,38 +187,116 @@ class SonobuoyClient:
 
         self._run(args)
 
-    def retrieve(self) -> "SonobuoyResults":
-        """Retrieve sonobuoy results."""
+    def retrieve(self, refresh: bool = False) -> "SonobuoyResults":
+        """Retrieve sonobuoy results.
+
+        The results tarball and its extraction are kept, and reused until
+        delete(), run() or start_run().
+
+        Parameters:
+        -----------
+        refresh (bool) : check the sonobuoy status for a different run (e.g.
+            one started outside of this client) before reusing results.
+
+        """
         logger.debug("retrieving sonobuoy results to %s", self.results_path)
         try:
-            os.makedirs(self.results_path, exist_ok=True)
-            args = ["retrieve", self.results_path]
-            file = self._run(args=args, return_output=True).rstrip("\n")
-            if not os.path.isfile(file):
-                raise RuntimeError("Sonobuoy did not retrieve a results tarball.")
-            return SonobuoyResults(tarball=file, folder=self.results_path)
+            self._retrieve_tarball(refresh=refresh)
+            if self._retrieved_results is None:
+                self._retrieved_results = SonobuoyResults(
+                    tarball=self._retrieved_tarball, folder=self.results_path
+                )
+            return self._retrieved_results
         except Exception as err:
             raise RuntimeError("Could not retrieve sonobuoy results") from err
 
-    def results(self) -> str:
-        """Report on sonobuoy results."""
+    def results(self, refresh: bool = False) -> str:
+        """Report on sonobuoy results.
+
+        The report is kept, and reused until delete(), run() or start_run().
+
+        Parameters:
+        -----------
+        refresh (bool) : check the sonobuoy status for a different run (e.g.
+            one started outside of this client) before reusing the report.
+
+        """
         logger.debug("retrieving sonobuoy results to %s", self.results_path)
         try:
-            with tempfile.TemporaryDirectory() as tmpdirname:
-                print("created temporary directory", tmpdirname)
-                args = ["retrieve", tmpdirname]
-                file_name = self._run(args=args, return_output=True).rstrip("\n")
-                if not os.path.isfile(file_name):
-                    raise RuntimeError("Sonobuoy did not retrieve a results tarball.")
-                args = ["results", os.path.join(tmpdirname, file_name)]
-                return self._run(args=args, include_kubeconfig=False, return_output=True)
+            self._retrieve_tarball(refresh=refresh)
+            if not self._retrieved_report:
+                args = ["results", self._retrieved_tarball]
+                self._retrieved_report = self._run(
+                    args=args, include_kubeconfig=False, return_output=True
+                )
+            return self._retrieved_report
         except Exception as err:
             raise RuntimeError("Could not retrieve sonobuoy results") from err
 
+    def _retrieve_tarball(self, refresh: bool = False):
+        """Make sure that the results tarball for the current run is retrieved.
+
+        The run is identified by the UUID in the tarball name from the status
+        payload, which is recorded when the tarball is first retrieved.  While
+        a run is recorded and its tarball is still there, the status is not
+        asked for again unless refresh is requested.  If the status reports a
+        different run then any cached results are dropped and the tarball is
+        retrieved.
+
+        """
+        if not refresh and self._retrieved_run and os.path.isfile(self._retrieved_tarball):
+            logger.debug("reusing retrieved sonobuoy results for run %s", self._retrieved_run)
+            return
+
+        run = self._run_uuid()
+        if run and run == self._retrieved_run and os.path.isfile(self._retrieved_tarball):
+            logger.debug("reusing retrieved sonobuoy results for run %s", run)
+            return
+
+        self._forget_retrieved()
+        os.makedirs(self.results_path, exist_ok=True)
+        args = ["retrieve", self.results_path]
+        tarball = self._run(args=args, return_output=True).rstrip("\n")
+        if not os.path.isfile(tarball):
+            raise RuntimeError("Sonobuoy did not retrieve a results tarball.")
+
+        self._retrieved_run = run
+        self._retrieved_tarball = tarball
+
+    def _run_uuid(self) -> str:
+        """Identify the current run from the status payload tar-info.
+
+        Returns:
+        --------
+        The run UUID from the results tarball name, or the tarball name or
+        checksum if there is no UUID in it.  An empty string if the status
+        has no results tarball info, in which case nothing is reused.
+
+        """
+        try:
+            tar_info: Dict[str, Any] = getattr(self.status(), "tar_info", None) or {}
+        except (subprocess.CalledProcessError, ValueError, KeyError):
+            # no status, or a status without results (still running)
+            return ""
+
+        name: str = tar_info.get("name", "")
+        match = SONOBUOY_RUN_UUID_PATTERN.search(name)
+        if match:
+            return match.group(0)
+        return name or tar_info.get("sha256", "")
+
+    def _forget_retrieved(self):
+        """Drop any cached results, so that they are retrieved again."""
+        self._retrieved_run = ""
+        self._retrieved_tarball = ""
+        self._retrieved_results = None
+        self._retrieved_report = ""
+
     # pylint: disable=redefined-builtin
     def delete(self, all: bool = True, wait: bool = False):
         """Delete sonobuoy resources."""
         args = ["delete"]
+        self._forget_retrieved()
 
         if wait:
             args += ["--wait"]
@@ -200,16 +326,7 @@ class SonobuoyClient:
         include_kubeconfig: bool = True,
     ):
         """Run a sonobuoy command."""
-        cmd = [self.bin]
-        cmd1: str = args[0]
-
-        if include_kubeconfig:
-            cmd += [f"--kubeconfig={self.kubeconfig}"]
-
-        if self.config_path and cmd1 in ["run"]:
-            cmd += [f"--config={self.config_path}"]
-
-        cmd += args
+        cmd = self._cmd(args, include_kubeconfig=include_kubeconfig)
 
         # this else makes it much more readable
         # pylint: disable=no-else-return
@@ -232,6 +349,20 @@ class SonobuoyClient:
 
             return res
 
+    def _cmd(self, args: List[str], include_kubeconfig: bool = True) -> List[str]:
+        """Build a sonobuoy command list."""
+        cmd = [self.bin]
+        cmd1: str = args[0]
+
+        if include_kubeconfig:
+            cmd += [f"--kubeconfig={self.kubeconfig}"]
+
+        if self.config_path and cmd1 in ["run"]:
+            cmd += [f"--config={self.config_path}"]
+
+        cmd += args
+        return cmd
+
     def create_k8s_crb(self):
         """Create the cluster role binding that sonobuoy needs."""
         rbac_authorization_v1_api = self._api_client.get_api("RbacAuthorizationV1Api")
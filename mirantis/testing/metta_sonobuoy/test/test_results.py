@@ -0,0 +1,188 @@
+"""
+
+Test sonobuoy results interpretation against a synthetic results tarball.
+
+"""
+import json
+import os
+import tarfile
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import yaml
+
+from mirantis.testing.metta_sonobuoy import results
+from mirantis.testing.metta_sonobuoy.results import SonobuoyResults, SonobuoyYamlCache, Status
+
+BENCHMARK_ITEM_COUNT = 10000
+""" How many items the failures benchmark plugin results have """
+BENCHMARK_FAILURE_EVERY = 100
+""" Every how many items of the benchmark plugin results one has failed """
+
+
+def _write_results(path: str, plugin_items: dict) -> str:
+    """Write a results folder with a plugin per plugin_id: items, and tar it."""
+    source = os.path.join(path, "source")
+    os.makedirs(os.path.join(source, "meta"))
+    for name, contents in [
+        ("config.json", {}),
+        ("info.json", {"plugins": list(plugin_items)}),
+        ("query-time.json", {}),
+    ]:
+        with open(os.path.join(source, "meta", name), "w", encoding="utf8") as meta_file:
+            json.dump(contents, meta_file)
+
+    for plugin_id, items in plugin_items.items():
+        plugin_path = os.path.join(source, "plugins", plugin_id)
+        os.makedirs(plugin_path)
+        with open(
+            os.path.join(plugin_path, "sonobuoy_results.yaml"), "w", encoding="utf8"
+        ) as results_file:
+            yaml.safe_dump({"name": plugin_id, "status": "failed", "items": items}, results_file)
+
+    tarball = os.path.join(path, "results.tar.gz")
+    with tarfile.open(tarball, "w:gz") as tar:
+        for name in os.listdir(source):
+            tar.add(os.path.join(source, name), arcname=name)
+    return tarball
+
+
+def _item(name: str, status: str, meta_file: str = "") -> dict:
+    """Make a results item."""
+    return {"name": name, "status": status, "meta": {"file": meta_file}}
+
+
+class SonobuoyResultsCacheTest(unittest.TestCase):
+    """Parsed results are cached on the results object."""
+
+    def setUp(self):
+        """Write and extract a synthetic results tarball."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.meta_file = os.path.join(self.tmpdir.name, "error.yaml")
+        with open(self.meta_file, "w", encoding="utf8") as meta_file:
+            yaml.safe_dump({"error": "it broke"}, meta_file)
+
+        tarball = _write_results(
+            self.tmpdir.name,
+            {
+                "e2e": [_item("broken", "failed", self.meta_file), _item("fine", "passed")],
+                "systemd-logs": [_item("node", "passed")],
+            },
+        )
+        folder = os.path.join(self.tmpdir.name, "results")
+        os.makedirs(folder)
+        self.results = SonobuoyResults(tarball=tarball, folder=folder)
+
+    def tearDown(self):
+        """Remove the results."""
+        self.tmpdir.cleanup()
+
+    def test_plugin_cached(self):
+        """Plugin results are parsed once."""
+        with mock.patch.object(results.yaml, "load", wraps=yaml.load) as yaml_load:
+            plugin = self.results.plugin("e2e")
+            self.assertIs(self.results.plugin("e2e"), plugin)
+            self.assertEqual(plugin.name(), "e2e")
+            self.assertEqual(plugin.status(), Status.FAILED)
+            self.assertEqual(len(plugin), 2)
+            self.assertEqual(plugin[0].status, Status.FAILED)
+            self.assertEqual(yaml_load.call_count, 1)
+
+            self.assertEqual(plugin[0].meta_file(), {"error": "it broke"})
+            self.assertEqual(plugin[0].meta_file(), {"error": "it broke"})
+            self.assertEqual(yaml_load.call_count, 2)
+
+    def test_cache_cap(self):
+        """The cache drops the least recently used files past its cap."""
+        cache = SonobuoyYamlCache(max_bytes=os.path.getsize(self.meta_file))
+        results_file = os.path.join(
+            self.results.results_path, "plugins", "e2e", "sonobuoy_results.yaml"
+        )
+
+        cache.load(self.meta_file)
+        cache.load(results_file)
+        # the last loaded file is kept even though it is over the cap
+        self.assertEqual(cache.info()["files"], 1)
+
+        with mock.patch.object(results.yaml, "load", wraps=yaml.load) as yaml_load:
+            cache.load(results_file)
+            cache.load(self.meta_file)
+            self.assertEqual(yaml_load.call_count, 1)
+
+
+class SonobuoyResultsItemsTest(unittest.TestCase):
+    """Streaming leaf items out of plugin results."""
+
+    def setUp(self):
+        """Write and extract a results tarball with nested and large plugin results."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tarball = _write_results(
+            self.tmpdir.name,
+            {
+                "e2e": [
+                    {
+                        "name": "junit_01.xml",
+                        "status": "failed",
+                        "items": [
+                            _item("one", "passed"),
+                            _item("two", "failed"),
+                            {"name": "three", "status": "skipped"},
+                        ],
+                    },
+                    _item("four", "failed"),
+                ],
+                "bench": [
+                    _item(
+                        f"test{index}",
+                        "failed" if index % BENCHMARK_FAILURE_EVERY == 0 else "passed",
+                    )
+                    for index in range(BENCHMARK_ITEM_COUNT)
+                ],
+            },
+        )
+        folder = os.path.join(self.tmpdir.name, "results")
+        os.makedirs(folder)
+        self.results = SonobuoyResults(tarball=tarball, folder=folder)
+
+    def tearDown(self):
+        """Remove the results."""
+        self.tmpdir.cleanup()
+
+    def test_items(self):
+        """Only leaf items are yielded, in order, filtered on status."""
+        plugin = self.results.plugin("e2e")
+        self.assertEqual([item.name for item in plugin.items()], ["one", "two", "three", "four"])
+        self.assertEqual([item.name for item in plugin.failures()], ["two", "four"])
+        skipped = list(plugin.items(status=Status.SKIPPED))
+        self.assertEqual([item.name for item in skipped], ["three"])
+        self.assertEqual(skipped[0].meta, {})
+
+        # the summary is read from the cache once per call, not once per item
+        with mock.patch.object(
+            SonobuoyYamlCache, "load", autospec=True, side_effect=SonobuoyYamlCache.load
+        ) as load:
+            list(plugin.failures())
+            self.assertEqual(load.call_count, 1)
+
+    def test_failures_benchmark(self):
+        """Streaming the failures is faster than wrapping every item."""
+        plugin = self.results.plugin("bench")
+
+        start = time.perf_counter()
+        wrapped = [plugin[index] for index in range(len(plugin))]
+        materialized = [item.name for item in wrapped if item.status == Status.FAILED]
+        materialized_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed = [item.name for item in plugin.failures()]
+        streamed_time = time.perf_counter() - start
+
+        self.assertEqual(streamed, materialized)
+        self.assertEqual(len(streamed), BENCHMARK_ITEM_COUNT // BENCHMARK_FAILURE_EVERY)
+        self.assertLess(streamed_time, materialized_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+
+Test the sonobuoy subprocess client using a fake sonobuoy binary.
+
+"""
+import os
+import stat
+import sys
+import tempfile
+import types
+import unittest
+
+from mirantis.testing.metta_sonobuoy.sonobuoy import SonobuoyClient
+
+FAKE_SONOBUOY = """#!{python}
+import io, json, os, sys, tarfile
+args = [arg for arg in sys.argv[1:] if not arg.startswith("--kubeconfig")]
+with open({log!r}, "a", encoding="utf8") as log:
+    log.write(" ".join(args) + "\\n")
+with open({run!r}, encoding="utf8") as run_file:
+    run = run_file.read().strip()
+if args[0] == "status":
+    print(json.dumps({{
+        "status": "complete",
+        "plugins": [],
+        "tar-info": {{"name": "202101010000_sonobuoy_" + run + ".tar.gz", "sha256": "abc"}},
+    }}))
+elif args[0] == "retrieve":
+    tarball = os.path.join(args[1], run + ".tar.gz")
+    with tarfile.open(tarball, "w:gz") as tar:
+        for name, contents in [
+            ("meta/config.json", {{}}),
+            ("meta/info.json", {{"plugins": []}}),
+            ("meta/query-time.json", {{}}),
+        ]:
+            data = json.dumps(contents).encode("utf8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    print(tarball)
+elif args[0] == "results":
+    print("report for " + os.path.basename(args[1]))
+"""
+
+RUN_ONE = "0b2f9ed4-7f3a-4c47-a1d8-6d1c3c1f0a01"
+RUN_TWO = "5c1e3f0e-3d8c-4b8a-9c7e-2a4f6b8d0e02"
+
+
+class SonobuoyClientRetrieveTest(unittest.TestCase):
+    """Retrieved results reuse against a fake binary."""
+
+    def setUp(self):
+        """Write a fake sonobuoy binary and a run file naming the current run."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmpdir.name, "calls.log")
+        self.run = os.path.join(self.tmpdir.name, "run")
+        self._set_run(RUN_ONE)
+        binary = os.path.join(self.tmpdir.name, "sonobuoy")
+        with open(binary, "w", encoding="utf8") as bin_file:
+            bin_file.write(FAKE_SONOBUOY.format(python=sys.executable, log=self.log, run=self.run))
+        os.chmod(binary, os.stat(binary).st_mode | stat.S_IEXEC)
+
+        self.client = SonobuoyClient(
+            kubeclient=types.SimpleNamespace(config_file="kubeconfig"),
+            binary=binary,
+            results_path=os.path.join(self.tmpdir.name, "results"),
+        )
+
+    def tearDown(self):
+        """Remove the fake binary and results."""
+        self.tmpdir.cleanup()
+
+    def _set_run(self, run: str):
+        """Change which run the fake binary reports."""
+        with open(self.run, "w", encoding="utf8") as run_file:
+            run_file.write(run)
+
+    def _calls(self, command: str) -> int:
+        """Return how many times a sonobuoy command was run."""
+        with open(self.log, encoding="utf8") as log_file:
+            return sum(1 for call in log_file if call.startswith(command))
+
+    def _retrieves(self):
+        """Return how many times the results tarball was retrieved."""
+        return self._calls("retrieve")
+
+    def test_reuse(self):
+        """Results for the same run are retrieved once."""
+        results = self.client.retrieve()
+        self.assertIs(self.client.retrieve(), results)
+        self.assertEqual(self.client.results().strip(), f"report for {RUN_ONE}.tar.gz")
+        self.client.results()
+        self.assertEqual(self._retrieves(), 1)
+        self.assertEqual(self._calls("status"), 1)
+
+        # a run started elsewhere is only noticed on refresh
+        self._set_run(RUN_TWO)
+        self.assertIs(self.client.retrieve(), results)
+        self.assertIsNot(self.client.retrieve(refresh=True), results)
+        self.assertEqual(self.client.results().strip(), f"report for {RUN_TWO}.tar.gz")
+        self.assertEqual(self._retrieves(), 2)
+        self.assertEqual(self._calls("status"), 2)
+
+    def test_refresh_same_run(self):
+        """Refreshing with the run unchanged does not retrieve again."""
+        results = self.client.retrieve()
+        self.assertIs(self.client.retrieve(refresh=True), results)
+        self.assertEqual(self._retrieves(), 1)
+        self.assertEqual(self._calls("status"), 2)
+
+    def test_delete(self):
+        """Deleting the run drops the retrieved results."""
+        self.client.retrieve()
+        self.client.delete()
+        self.client.retrieve()
+        self.assertEqual(self._retrieves(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -313,10 +313,10 @@ class SonobuoyWorkloadPlugin:
         """Retrieve Sonobuoy status return."""
         return self.get_client_plugin().status()
 
-    def retrieve(self) -> SonobuoyResults:
+    def retrieve(self, refresh: bool = False) -> SonobuoyResults:
         """Retrieve sonobuoy results."""
         logger.debug("retrieving sonobuoy results")
-        return self.get_client_plugin().retrieve()
+        return self.get_client_plugin().retrieve(refresh=refresh)
 
     def destroy(self, wait: bool = True):
         """Delete sonobuoy resources."""
@@ -2,18 +2,32 @@
 
 A state that uses labels to manage fixtures on activation.
 
+Fixtures are activated one at a time by default.  Independent fixtures (e.g.
+a helm chart, a sonobuoy run and a deployment) can instead be activated
+concurrently, by setting the state config "activate-parallel" key to:
+
+- "priority" : fixtures of the same priority are activated together, and each
+    priority tier waits for the higher priority tiers to finish;
+- "after" : all fixtures are activated together, except that a fixture waits
+    for the fixtures that it declares it comes after.  This is declared using
+    the "state-activate-after" fixture label (comma separated instance_ids)
+    or an "after" list in a state config "state-activate" entry.
+
 """
-from typing import List, Dict, Any, Union
+import concurrent.futures
+import time
+from typing import List, Dict, Any, Union, Tuple
 from logging import getLogger
 
-from configerus.loaded import Loaded
+from configerus.loaded import Loaded, LOADED_KEY_ROOT
 
+from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta.fixture import Fixture
 from mirantis.testing.metta.provisioner import METTA_PLUGIN_INTERFACE_ROLE_PROVISIONER
 from mirantis.testing.metta.workload import METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD
 from mirantis.testing.metta_health.healthcheck import METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK
 
-from .state import EnvironmentStatePlugin
+from .state import EnvironmentStatePlugin, METTA_FIXTURES_CONFIG_STATES_KEY
 
 
 logger = getLogger("metta_state:activatingstate")
@@ -27,10 +41,44 @@ METTA_STATE_FIXTURE_LABEL_ACTIVATE = "state-activate"
 METTA_STATE_FIXTURE_LABEL_DEACTIVATE = "state-deactivate"
 """Metta fixture label that indicates that this fixture should deactivate on a state."""
 
+METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER = "state-activate-after"
+"""Metta fixture label listing (comma separated) instance_ids to activate before the fixture."""
+
+METTA_STATE_CONFIG_KEY_ACTIVATE_AFTER = "after"
+"""Key in a state config activate entry listing instance_ids to activate before the fixture."""
+
+METTA_STATE_CONFIG_KEY_ACTIVATE_PARALLEL = "activate-parallel"
+"""State config key for the concurrent activation mode (see the module docs.)"""
+
+METTA_STATE_CONFIG_KEY_ACTIVATE_WORKERS = "activate-workers"
+"""State config key for the most fixtures to activate at the same time."""
+
+METTA_STATE_ACTIVATE_PARALLEL_PRIORITY = "priority"
+"""Concurrent activation mode: activate fixtures in tiers of the same priority."""
+
+METTA_STATE_ACTIVATE_PARALLEL_AFTER = "after"
+"""Concurrent activation mode: activate fixtures once their "after" fixtures are done."""
+
+METTA_STATE_ACTIVATE_DEFAULT_WORKERS = 8
+"""Default for the most fixtures to activate at the same time."""
+
 
 class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
     """A State piece of a StateBasedEnvironment that processes fixture labels on activate."""
 
+    def __init__(
+        self,
+        environment: Environment,
+        instance_id: str,
+        label: str = METTA_FIXTURES_CONFIG_STATES_KEY,
+        base: Any = LOADED_KEY_ROOT,
+    ):
+        """Run the super constructor and start with no activation times."""
+        super().__init__(environment=environment, instance_id=instance_id, label=label, base=base)
+
+        self._activation_times: Dict[Tuple[str, str], float] = {}
+        """ Wall time in seconds taken to activate each fixture, by (plugin_id, instance_id) """
+
     def info(self, deep: bool = False) -> Dict[str, Any]:
         """Return Dict of introspective information about the plugin."""
         state_config: Loaded = self.config().load(self._config_label)
@@ -39,6 +87,13 @@ class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
         plugin_info["activate"] = state_config.get(
             [self._config_base, METTA_STATE_FIXTURE_LABEL_ACTIVATE], default="NONE"
         )
+        plugin_info["activate_parallel"] = state_config.get(
+            [self._config_base, METTA_STATE_CONFIG_KEY_ACTIVATE_PARALLEL], default=""
+        )
+        plugin_info["activation_times"] = {
+            f"{plugin_id}:{instance_id}": duration
+            for (plugin_id, instance_id), duration in self._activation_times.items()
+        }
 
         return plugin_info
 
@@ -48,6 +103,8 @@ class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
         This means using config data for the state plugin, and labels for the
         contained fixtures for taking actions on them.
         """
+        self._activation_times = {}
+
         # parent activate to load fixtures/config
         super().activate()
 
@@ -60,8 +117,6 @@ class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
 
     def _activate_fixture_using_state_config(self):
         """Use state config to decide to activate fixtures."""
-        errors: List[Exception] = []
-
         state_config: Loaded = self.config().load(self._config_label)
 
         fixtures_to_activate: List[Union[str, Dict[str, str]]] = state_config.get(
@@ -74,28 +129,18 @@ class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
                 f"Fixtures to activate was not an iterator of instance_ids: {fixtures_to_activate}"
             ) from err
 
+        activations: List[Tuple[Fixture, List[str]]] = []
         for fixture_def in fixtures_to_activate:
             if isinstance(fixture_def, str):
                 fixture_def = {"instance_id": fixture_def}
-            fixture = self.fixtures().get(**fixture_def)
-
-            try:
-                _activate_fixture(fixture)
-
-            # pylint: disable=broad-except
-            except Exception as err:
-                logger.warning(
-                    "Failed checking health %s:%s : %s",
-                    fixture.plugin_id,
-                    fixture.instance_id,
-                    err,
-                )
-                errors.append(
-                    RuntimeError(
-                        f"Failed checking fixture health {fixture.plugin_id}:{fixture.instance_id}"
-                        f" : {err}"
-                    )
-                )
+            else:
+                fixture_def = dict(fixture_def)
+            after = fixture_def.pop(METTA_STATE_CONFIG_KEY_ACTIVATE_AFTER, [])
+            if isinstance(after, str):
+                after = [after]
+            activations.append((self.fixtures().get(**fixture_def), list(after)))
+
+        errors = self._activate_fixtures(activations)
 
         if len(errors) > 0:
             raise RuntimeError(
@@ -104,37 +149,222 @@ class EnvironmentLabelActivateStatePlugin(EnvironmentStatePlugin):
 
     def _activate_fixtures_with_labels(self):
         """Activate contained fixtures if they have the right labels."""
-        errors: List[Exception] = []
+        activations: List[Tuple[Fixture, List[str]]] = []
         for fixture in self.fixtures().filter(
             labels={METTA_STATE_FIXTURE_LABEL_ACTIVATE: self.instance_id()},
             exception_if_missing=False,
         ):
-            try:
-                _activate_fixture(fixture)
-
-            # pylint: disable=broad-except
-            except Exception as err:
-                logger.warning(
-                    "Failed checking health %s:%s : %s",
-                    fixture.plugin_id,
-                    fixture.instance_id,
-                    err,
-                )
-                errors.append(
-                    RuntimeError(
-                        f"Failed checking fixture health {fixture.plugin_id}:{fixture.instance_id}"
-                        f" : {err}"
-                    )
-                )
+            after = fixture.labels.get(METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER, "")
+            activations.append(
+                (fixture, [instance_id.strip() for instance_id in after.split(",") if instance_id])
+            )
+
+        errors = self._activate_fixtures(activations)
 
         if len(errors) > 0:
             raise RuntimeError(
                 "Environment state encountered errors while activating on labels.", errors
             )
 
+    def _activate_fixtures(self, activations: List[Tuple[Fixture, List[str]]]) -> List[Exception]:
+        """Activate fixtures, one at a time or concurrently depending on config.
+
+        Parameters:
+        -----------
+        activations (List[Tuple[Fixture, List[str]]]) : fixtures to activate,
+            in order, each with the instance_ids that it should come after.
+
+        Returns:
+        --------
+        List of errors for fixtures which failed to activate.
+
+        """
+        state_config: Loaded = self.config().load(self._config_label)
+        mode: str = state_config.get(
+            [self._config_base, METTA_STATE_CONFIG_KEY_ACTIVATE_PARALLEL], default=""
+        )
+        workers: int = state_config.get(
+            [self._config_base, METTA_STATE_CONFIG_KEY_ACTIVATE_WORKERS],
+            default=METTA_STATE_ACTIVATE_DEFAULT_WORKERS,
+        )
+
+        if not mode:
+            return [
+                error
+                for error in (self._timed_activate(fixture) for fixture, _ in activations)
+                if error is not None
+            ]
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"{self.instance_id()}-activate"
+        ) as executor:
+            if mode == METTA_STATE_ACTIVATE_PARALLEL_PRIORITY:
+                return self._activate_by_priority(executor, activations)
+            if mode == METTA_STATE_ACTIVATE_PARALLEL_AFTER:
+                return self._activate_by_after(executor, activations)
+
+        raise ValueError(f"Unknown state activation mode '{mode}' for {self.instance_id()}")
+
+    def _activate_by_priority(
+        self,
+        executor: concurrent.futures.Executor,
+        activations: List[Tuple[Fixture, List[str]]],
+    ) -> List[Exception]:
+        """Activate fixtures in tiers of the same priority, highest first."""
+        tiers: Dict[int, List[Fixture]] = {}
+        for fixture, _ in activations:
+            tiers.setdefault(fixture.priority, []).append(fixture)
+
+        errors: List[Exception] = []
+        for priority in sorted(tiers, reverse=True):
+            logger.info("Activating priority %s fixtures for %s", priority, self.instance_id())
+            for future in [self._submit(executor, fixture) for fixture in tiers[priority]]:
+                error = future.result()
+                if error is not None:
+                    errors.append(error)
+        return errors
+
+    def _activate_by_after(
+        self,
+        executor: concurrent.futures.Executor,
+        activations: List[Tuple[Fixture, List[str]]],
+    ) -> List[Exception]:
+        """Activate fixtures as soon as the fixtures they come after are done.
+
+        Fixtures that come after a fixture that failed are not activated.
+        "after" instance_ids that are not being activated here are ignored, and
+        an "after" instance_id shared by fixtures from different plugins waits
+        for all of them.
+
+        """
+        activating: Dict[str, List[Tuple[str, str]]] = {}
+        """ (plugin_id, instance_id) keys of the activating fixtures, by instance_id """
+        for fixture, _ in activations:
+            activating.setdefault(fixture.instance_id, []).append(
+                (fixture.plugin_id, fixture.instance_id)
+            )
+        pending: Dict[Tuple[str, str], Tuple[Fixture, List[Tuple[str, str]]]] = {
+            (fixture.plugin_id, fixture.instance_id): (
+                fixture,
+                [key for before in after for key in activating.get(before, [])],
+            )
+            for fixture, after in activations
+        }
+        running: Dict[concurrent.futures.Future, Tuple[str, str]] = {}
+        done: Dict[Tuple[str, str], bool] = {}
+        """ activated (plugin_id, instance_id) keys, and whether they succeeded """
+        errors: List[Exception] = []
+
+        while pending or running:
+            for key, (fixture, after) in list(pending.items()):
+                if any(done.get(before) is False for before in after):
+                    del pending[key]
+                    done[key] = False
+                    errors.append(
+                        RuntimeError(
+                            f"Fixture {fixture.plugin_id}:{fixture.instance_id} was not "
+                            f"activated as a fixture that it comes after failed: {after}"
+                        )
+                    )
+                elif all(done.get(before) for before in after):
+                    del pending[key]
+                    running[self._submit(executor, fixture)] = key
+
+            if not running:
+                if pending:
+                    errors.append(
+                        RuntimeError(
+                            "Fixtures were not activated as they come after each other: "
+                            f"{[':'.join(key) for key in sorted(pending)]}"
+                        )
+                    )
+                break
+
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in finished:
+                error = future.result()
+                done[running.pop(future)] = error is None
+                if error is not None:
+                    errors.append(error)
+
+        return errors
+
+    def _submit(
+        self, executor: concurrent.futures.Executor, fixture: Fixture
+    ) -> concurrent.futures.Future:
+        """Start activating a fixture in a worker thread.
+
+        The fixture plugin is retrieved here, on the calling thread, so that
+        lazy fixtures are built (and any fixtures that they register are
+        added) one at a time.  The worker only runs the plugin activation.
+
+        Returns:
+        --------
+        A future for the error if the fixture failed to activate, otherwise None
+
+        """
+        try:
+            plugin = fixture.plugin
+
+        # pylint: disable=broad-except
+        except Exception as err:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_result(_activation_error(fixture, err))
+            return future
+
+        return executor.submit(self._timed_activate, fixture, plugin)
+
+    def _timed_activate(self, fixture: Fixture, plugin: Any = None) -> Union[Exception, None]:
+        """Activate a fixture, recording its wall time.
+
+        Parameters:
+        -----------
+        fixture (Fixture) : fixture to activate
+        plugin (Any) : the fixture plugin, if it has already been retrieved
+
+        Returns:
+        --------
+        An error if the fixture failed to activate, otherwise None
+
+        """
+        start = time.perf_counter()
+        try:
+            _activate_fixture(fixture, fixture.plugin if plugin is None else plugin)
+
+        # pylint: disable=broad-except
+        except Exception as err:
+            return _activation_error(fixture, err)
+
+        finally:
+            duration = time.perf_counter() - start
+            self._activation_times[(fixture.plugin_id, fixture.instance_id)] = duration
+            logger.info(
+                "Fixture %s:%s activation took %.3fs",
+                fixture.plugin_id,
+                fixture.instance_id,
+                duration,
+            )
+
+        return None
+
+
+def _activation_error(fixture: Fixture, err: Exception) -> Exception:
+    """Log and return the error for a fixture that failed to activate."""
+    logger.warning(
+        "Failed checking health %s:%s : %s",
+        fixture.plugin_id,
+        fixture.instance_id,
+        err,
+    )
+    return RuntimeError(
+        f"Failed checking fixture health {fixture.plugin_id}:{fixture.instance_id} : {err}"
+    )
+
 
-def _activate_fixture(fixture: Fixture):
-    """Activate a passed fixture, depending on interfaces.
+def _activate_fixture(fixture: Fixture, plugin: Any):
+    """Activate a passed fixture plugin, depending on the fixture interfaces.
 
     Returns:
     --------
@@ -146,12 +376,12 @@ def _activate_fixture(fixture: Fixture):
         or METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD in fixture.interfaces
     ):
         logger.warning("Activating fixture %s:%s", fixture.plugin_id, fixture.instance_id)
-        fixture.plugin.prepare()
-        fixture.plugin.apply()
+        plugin.prepare()
+        plugin.apply()
 
     elif METTA_PLUGIN_INTERFACE_ROLE_HEALTHCHECK in fixture.interfaces:
         logger.warning("Checking fixture health %s:%s", fixture.plugin_id, fixture.instance_id)
-        fixture.plugin.health()
+        plugin.health()
 
     else:
         raise ValueError(
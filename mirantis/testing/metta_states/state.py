@@ -24,12 +24,23 @@ be added if we decide that this code is worth keeping.
 I think that these state plugins are not safe to generate across threads at the
 same time. This comes down to the need to copy/duplicate the config option.
 
+Building a state (copying config, importing, bootstrapping and building the
+fixtures) happens on the first activation.  A fingerprint of the config that
+went into it (config sources, the mtimes and sizes of the files under source
+paths, and source data) is kept, and as long as it still matches on later
+activations the built config and fixtures are reused, so that switching back
+to a state is cheap.
+
 """
-from typing import Dict, Any
+from typing import Dict, List, Any
 from logging import getLogger
+import hashlib
+import json
+import os
 
 from configerus.config import Config
 from configerus.loaded import LOADED_KEY_ROOT
+from configerus.plugin import Type
 
 from mirantis.testing.metta.fixture import (
     Fixtures,
@@ -46,9 +57,14 @@ from mirantis.testing.metta.building import (
 )
 from mirantis.testing.metta.config import (
     add_config_sources_from_config,
+    copy_config,
     METTA_CONFIG_CONFIG_SOURCE_KEY,
 )
-from mirantis.testing.metta.importing import add_imports_from_config, METTA_IMPORT_CONFIG_LABEL
+from mirantis.testing.metta.importing import (
+    add_imports_from_config,
+    imports_info,
+    METTA_IMPORT_CONFIG_LABEL,
+)
 from mirantis.testing.metta.setuptools import (
     setuptools_entrypoint,
     METTA_CONFIG_SETUPTOOLS_BOOTSTRAPS_KEY,
@@ -71,7 +87,7 @@ METTA_STATE_DEFAULT_PLUGIN_ID = "metta_state_default"
 
 
 # we use the parent methods, but override the constructor.
-# pylint: disable=super-init-not-called
+# pylint: disable=super-init-not-called, too-many-instance-attributes
 class EnvironmentStatePlugin(FixtureBuilderEnvironment):
     """A State piece of a StateBasedEnvironment."""
 
@@ -96,8 +112,14 @@ class EnvironmentStatePlugin(FixtureBuilderEnvironment):
         self._instance_id: str = instance_id
         """ Unique id for this plugin instance """
 
+        self._base_config: Config = environment._config
+        """Config object that activate() copies to build the state config."""
         self._config: Config = environment._config
         """Config object, overridden in activate()."""
+        self._fingerprint: str = ""
+        """Fingerprint of the config the state was last built from."""
+        self._imports: List[str] = []
+        """Module paths imported for the state, for introspection."""
 
         self._config_label = label
         """ configerus load label that should contain all of the config """
@@ -112,9 +134,18 @@ class EnvironmentStatePlugin(FixtureBuilderEnvironment):
         """Respond to the state being activated."""
         logger.debug("Default state plugin activated: %s", self.instance_id())
 
+        if self._fingerprint and self._fingerprint == self._config_fingerprint():
+            logger.debug("Reusing built state config and fixtures: %s", self.instance_id())
+            return
+
         # Use the protected config so that we don't use a state config by accident
         # pylint: disable=protected-access`
-        self._config = self._config.copy()
+        self._config = copy_config(self._base_config)
+        if self._config_label:
+            # The copy shares the labels that the environment config has
+            # loaded, which may be older than the state config files, so
+            # refresh the state label in the copy only.
+            self._config.load(self._config_label, force_reload=True)
         Environment.__init__(self, config=self._config, instance_id=self._instance_id)
         FixtureBuildingFromConfigMixin.__init__(
             self, config=self._config, builder_callback=self.new_fixture
@@ -134,7 +165,7 @@ class EnvironmentStatePlugin(FixtureBuilderEnvironment):
             # 2. import any python code requested, to make sure that all funxtionality
             #    is in scope that is needed.
             #    Here we say look in the "metta" config for a "imports" section.
-            add_imports_from_config(
+            self._imports = add_imports_from_config(
                 config=self._config,
                 label=self._config_label,
                 base=[self._config_base, METTA_IMPORT_CONFIG_LABEL],
@@ -165,15 +196,58 @@ class EnvironmentStatePlugin(FixtureBuilderEnvironment):
                 labels=labels,
             )
 
+        self._fingerprint = self._config_fingerprint()
+
+    def _config_fingerprint(self) -> str:
+        """Fingerprint the config that the state is built from.
+
+        This covers the config sources of the environment config and of the
+        built state config (which can have sources added from config), the
+        modification times and sizes of all of the files under any source
+        paths (including subdirectories), and any source dict data.
+
+        """
+        hasher = hashlib.sha256()
+        for config in [self._base_config, self._config]:
+            for instance in config.plugins.get_instances(type=Type.SOURCE):
+                hasher.update(
+                    f"{instance.plugin_id}:{instance.instance_id}:{instance.priority}".encode()
+                )
+                path = getattr(instance.plugin, "path", "")
+                if path and os.path.isdir(path):
+                    _hash_files(hasher, path)
+                data = getattr(instance.plugin, "data", None)
+                if data is not None:
+                    hasher.update(json.dumps(data, sort_keys=True, default=str).encode())
+
+        return hasher.hexdigest()
+
     # pylint: disable=unused-argument
     def info(self, deep: bool = False) -> Dict[str, Any]:
         """Return dict plugin info."""
         state_info = {
             "name": self.instance_id(),
+            "fingerprint": self._fingerprint,
             # "boostraps": self._environment_boostraps,
         }
 
         if deep:
             state_info["fixtures"] = self._fixtures.info(deep=deep)
+            state_info["imports"] = imports_info(self._imports)
 
         return state_info
+
+
+def _hash_files(hasher: Any, path: str):
+    """Add the relative path, mtime and size of each file under a path to a hash."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            hasher.update(
+                f"{os.path.relpath(file_path, path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+            )
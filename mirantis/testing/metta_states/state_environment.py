@@ -117,10 +117,8 @@ class StateBasedEnvironment(FixtureBuilderEnvironment):
 
     def _get_active_state_fixture(self) -> Fixture:
         """Get the active state fixture."""
-        return self._fixtures.get(
-            instance_id=self._active_state_id,
-            interfaces=[METTA_PLUGIN_INTERFACE_ROLE_ENVIRONMENTSTATE],
-        )
+        states = self._fixtures.instance_index(METTA_PLUGIN_INTERFACE_ROLE_ENVIRONMENTSTATE)
+        return states[self._active_state_id]
 
     def config(self) -> Config:
         """Return the Config from the active state."""
@@ -0,0 +1,212 @@
+"""
+
+Test label activate state fixture activation against fake workloads.
+
+"""
+import threading
+import time
+import unittest
+from typing import Dict, List
+
+from mirantis.testing.metta.fixture import Fixture, Fixtures, LazyFixture
+from mirantis.testing.metta.workload import METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD
+from mirantis.testing.metta_states.labelactivate_state import (
+    EnvironmentLabelActivateStatePlugin,
+    METTA_STATE_FIXTURE_LABEL_ACTIVATE,
+    METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER,
+)
+
+
+class FakeConfig:
+    """Config stand-in which only knows about defaults."""
+
+    def __init__(self, values: dict = None):
+        """Keep some key values."""
+        self.values = values if values is not None else {}
+
+    def load(self, label: str):  # pylint: disable=unused-argument
+        """Return self as the loaded config."""
+        return self
+
+    def get(self, key, default=None):
+        """Return a value if we have one for the non-root part of the key."""
+        return self.values.get(key[1], default)
+
+
+class FakeEnvironment:
+    """Environment stand-in which only provides config."""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self, values: dict = None):
+        """Keep fake config."""
+        self._config = FakeConfig(values)
+
+
+class SleepyWorkload:
+    """Workload plugin which takes a while to apply, and records the order."""
+
+    def __init__(self, instance_id: str, delay: float, log: List[str], fail: bool = False):
+        """Keep how long to sleep for."""
+        self.instance_id = instance_id
+        self.delay = delay
+        self.log = log
+        self.fail = fail
+
+    def prepare(self):
+        """Nothing to prepare."""
+
+    def apply(self):
+        """Sleep then record that we finished."""
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"{self.instance_id} failed")
+        self.log.append(self.instance_id)
+
+
+def _state(values: dict, workloads: Dict[str, tuple], log: List[str]):
+    """Make a state with a workload fixture per instance_id: (delay, priority, labels)."""
+    state = EnvironmentLabelActivateStatePlugin(FakeEnvironment(values), "state", "state")
+    state._fixtures = Fixtures()  # pylint: disable=protected-access
+    for instance_id, (delay, priority, labels) in workloads.items():
+        state.fixtures().add(
+            Fixture(
+                plugin=SleepyWorkload(instance_id, delay, log, fail=labels.pop("fail", False)),
+                plugin_id="sleepy",
+                instance_id=instance_id,
+                interfaces=[METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD],
+                labels={METTA_STATE_FIXTURE_LABEL_ACTIVATE: "state", **labels},
+                priority=priority,
+            )
+        )
+    return state
+
+
+def _activate(state: EnvironmentLabelActivateStatePlugin) -> float:
+    """Activate the state fixtures on labels, returning the wall time."""
+    start = time.perf_counter()
+    state._activate_fixtures_with_labels()  # pylint: disable=protected-access
+    return time.perf_counter() - start
+
+
+class LabelActivateStateTest(unittest.TestCase):
+    """Sequential and concurrent fixture activation."""
+
+    def test_sequential(self):
+        """By default fixtures are activated one at a time, in priority order."""
+        log: List[str] = []
+        state = _state({}, {"low": (0.1, 40, {}), "high": (0.1, 60, {})}, log)
+        self.assertGreaterEqual(_activate(state), 0.2)
+        self.assertEqual(log, ["high", "low"])
+        self.assertEqual(sorted(state.info()["activation_times"]), ["sleepy:high", "sleepy:low"])
+
+    def test_priority(self):
+        """Fixtures of the same priority are activated together, tier by tier."""
+        log: List[str] = []
+        state = _state(
+            {"activate-parallel": "priority"},
+            {"a": (0.2, 60, {}), "b": (0.2, 60, {}), "c": (0.01, 40, {})},
+            log,
+        )
+        self.assertLess(_activate(state), 0.35)
+        self.assertEqual(log[-1], "c")
+        self.assertGreaterEqual(state.info()["activation_times"]["sleepy:a"], 0.2)
+
+    def test_after(self):
+        """Fixtures wait only for the fixtures they come after."""
+        log: List[str] = []
+        state = _state(
+            {"activate-parallel": "after"},
+            {
+                "slow": (0.3, 50, {}),
+                "first": (0.1, 50, {}),
+                "second": (0.1, 50, {METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER: "first"}),
+            },
+            log,
+        )
+        self.assertLess(_activate(state), 0.45)
+        self.assertEqual(log, ["first", "second", "slow"])
+
+    def test_errors(self):
+        """Errors are aggregated, and fixtures after a failure are skipped."""
+        log: List[str] = []
+        state = _state(
+            {"activate-parallel": "after"},
+            {
+                "broken": (0, 50, {"fail": True}),
+                "after_broken": (0, 50, {METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER: "broken"}),
+                "fine": (0, 50, {}),
+            },
+            log,
+        )
+        with self.assertRaises(RuntimeError) as context:
+            _activate(state)
+        self.assertEqual(len(context.exception.args[1]), 2)
+        self.assertEqual(log, ["fine"])
+
+    def test_after_cycle(self):
+        """Fixtures that come after each other are reported, not waited on forever."""
+        state = _state(
+            {"activate-parallel": "after"},
+            {
+                "one": (0, 50, {METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER: "two"}),
+                "two": (0, 50, {METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER: "one"}),
+            },
+            [],
+        )
+        with self.assertRaises(RuntimeError) as context:
+            _activate(state)
+        self.assertIn("come after each other", str(context.exception.args[1][0]))
+
+    def test_after_shared_instance_id(self):
+        """Fixtures sharing an instance_id across plugins are all activated, and waited for."""
+        log: List[str] = []
+        state = _state(
+            {"activate-parallel": "after"},
+            {"last": (0, 50, {METTA_STATE_FIXTURE_LABEL_ACTIVATE_AFTER: "shared"})},
+            log,
+        )
+        for plugin_id, delay in [("quick", 0.01), ("slow", 0.2)]:
+            state.fixtures().add(
+                Fixture(
+                    plugin=SleepyWorkload(plugin_id, delay, log),
+                    plugin_id=plugin_id,
+                    instance_id="shared",
+                    interfaces=[METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD],
+                    labels={METTA_STATE_FIXTURE_LABEL_ACTIVATE: "state"},
+                    priority=50,
+                )
+            )
+        _activate(state)
+        self.assertEqual(log, ["quick", "slow", "last"])
+        self.assertEqual(
+            sorted(state.info()["activation_times"]),
+            ["quick:shared", "sleepy:last", "slow:shared"],
+        )
+
+    def test_lazy_built_on_main_thread(self):
+        """Lazy fixtures are built on the activating thread, not in the workers."""
+        builders: List[str] = []
+
+        def build():
+            builders.append(threading.current_thread().name)
+            return SleepyWorkload("lazy", 0, [])
+
+        for mode in ["priority", "after"]:
+            builders.clear()
+            state = _state({"activate-parallel": mode}, {}, [])
+            state.fixtures().add(
+                LazyFixture(
+                    build=build,
+                    plugin_id="lazy",
+                    instance_id="lazy",
+                    interfaces=[METTA_PLUGIN_INTERFACE_ROLE_WORKLOAD],
+                    labels={METTA_STATE_FIXTURE_LABEL_ACTIVATE: "state"},
+                    priority=50,
+                )
+            )
+            _activate(state)
+            self.assertEqual(builders, [threading.current_thread().name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+
+Test state activation reuse of the built config and fixtures.
+
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import yaml
+from configerus import new_config
+from configerus.contrib.dict import PLUGIN_ID_SOURCE_DICT
+from configerus.contrib.files import PLUGIN_ID_SOURCE_PATH
+
+from mirantis.testing.metta.environment import Environment
+from mirantis.testing.metta import importing
+from mirantis.testing.metta_common import METTA_PLUGIN_ID_OUTPUT_TEXT
+from mirantis.testing.metta_states import state
+from mirantis.testing.metta_states.state import EnvironmentStatePlugin
+
+
+def _state_config(text: str) -> dict:
+    """Make state config with a single text output fixture."""
+    return {
+        "one": {
+            "fixtures": {
+                "message": {"plugin_id": METTA_PLUGIN_ID_OUTPUT_TEXT, "arguments": {"text": text}},
+            },
+        },
+    }
+
+
+class StateActivateTest(unittest.TestCase):
+    """Repeated activation reuses the built state."""
+
+    def setUp(self):
+        """Make an environment with state config in a dict source."""
+        config = new_config()
+        self.source = config.add_source(PLUGIN_ID_SOURCE_DICT, "states")
+        self.source.set_data({"states": _state_config("hello")})
+        self.environment = Environment(config=config, instance_id="states")
+        self.state = EnvironmentStatePlugin(self.environment, "one", label="states", base="one")
+
+    def _message(self) -> str:
+        """Return the text from the state output fixture."""
+        return self.state.fixtures().get_plugin(instance_id="message").get_output()
+
+    def test_reuse(self):
+        """Activating again with the same config does not rebuild."""
+        self.state.activate()
+        config = self.state.config()
+        fixture = self.state.fixtures().get(instance_id="message")
+        self.assertTrue(self.state.info()["fingerprint"])
+
+        with mock.patch.object(
+            state, "add_imports_from_config", wraps=importing.add_imports_from_config
+        ) as add_imports:
+            self.state.activate()
+            add_imports.assert_not_called()
+        self.assertIs(self.state.config(), config)
+        self.assertIs(self.state.fixtures().get(instance_id="message"), fixture)
+
+    def test_changed_config(self):
+        """Changed config rebuilds the state on activation."""
+        self.state.activate()
+        self.assertEqual(self._message(), "hello")
+
+        self.source.set_data({"states": _state_config("goodbye")})
+        self.state.activate()
+        self.assertEqual(self._message(), "goodbye")
+
+    def test_changed_file(self):
+        """Changed files in a config source path rebuild the state."""
+        with tempfile.TemporaryDirectory() as path:
+            config_file = os.path.join(path, "states.yml")
+            with open(config_file, "w", encoding="utf8") as states_file:
+                yaml.safe_dump(_state_config("from file"), states_file)
+
+            config = new_config()
+            config.add_source(PLUGIN_ID_SOURCE_PATH, "files").set_path(path)
+            environment = Environment(config=config, instance_id="files")
+            self.state = EnvironmentStatePlugin(environment, "one", label="states", base="one")
+            self.state.activate()
+            fingerprint = self.state.info()["fingerprint"]
+
+            self.state.activate()
+            self.assertEqual(self.state.info()["fingerprint"], fingerprint)
+
+            # make sure that the modification time moves on
+            stat = os.stat(config_file)
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+            self.state.activate()
+            self.assertNotEqual(self.state.info()["fingerprint"], fingerprint)
+
+    def test_edited_file(self):
+        """Editing a config file and activating again builds from the new contents."""
+        with tempfile.TemporaryDirectory() as path:
+            config_file = os.path.join(path, "states.yml")
+            with open(config_file, "w", encoding="utf8") as states_file:
+                yaml.safe_dump(_state_config("old"), states_file)
+
+            config = new_config()
+            config.add_source(PLUGIN_ID_SOURCE_PATH, "files").set_path(path)
+            environment = Environment(config=config, instance_id="files")
+            self.state = EnvironmentStatePlugin(environment, "one", label="states", base="one")
+            self.state.activate()
+            self.assertEqual(self._message(), "old")
+
+            with open(config_file, "w", encoding="utf8") as states_file:
+                yaml.safe_dump(_state_config("new"), states_file)
+            # make sure that the modification time moves on
+            stat = os.stat(config_file)
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+            self.state.activate()
+            self.assertEqual(self._message(), "new")
+
+    def test_edited_nested_file(self):
+        """Editing a file in a source path subdirectory rebuilds the state."""
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "states.yml"), "w", encoding="utf8") as states_file:
+                yaml.safe_dump(_state_config("files"), states_file)
+            os.makedirs(os.path.join(path, "nested", "deeper"))
+            nested_file = os.path.join(path, "nested", "deeper", "values.yml")
+            with open(nested_file, "w", encoding="utf8") as values_file:
+                yaml.safe_dump({"value": "old"}, values_file)
+
+            config = new_config()
+            config.add_source(PLUGIN_ID_SOURCE_PATH, "files").set_path(path)
+            environment = Environment(config=config, instance_id="files")
+            self.state = EnvironmentStatePlugin(environment, "one", label="states", base="one")
+            self.state.activate()
+            built = self.state.config()
+
+            self.state.activate()
+            self.assertIs(self.state.config(), built)
+
+            with open(nested_file, "w", encoding="utf8") as values_file:
+                yaml.safe_dump({"value": "new"}, values_file)
+            # make sure that the modification time moves on
+            stat = os.stat(nested_file)
+            os.utime(nested_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+            self.state.activate()
+            self.assertIsNot(self.state.config(), built)
+
+    def test_siblings_keep_loaded(self):
+        """Rebuilding a state leaves the environment and sibling config caches alone."""
+        self.source.set_data(
+            {
+                "states": {**_state_config("one"), "two": _state_config("two")["one"]},
+                "other": {"value": "shared"},
+            }
+        )
+        self.environment.config().load("other")
+        two = EnvironmentStatePlugin(self.environment, "two", label="states", base="two")
+        self.state.activate()
+        two.activate()
+        other = two.config().load("other")
+
+        self.source.set_data(
+            {
+                "states": {**_state_config("changed"), "two": _state_config("two")["one"]},
+                "other": {"value": "shared"},
+            }
+        )
+        self.state.activate()
+        self.assertEqual(self._message(), "changed")
+        self.assertIn("other", self.environment.config().loaded)
+        self.assertIs(two.config().loaded["other"], other)
+
+    def test_sources_added_share_loaded(self):
+        """Labels which state config sources don't provide stay shared with the environment."""
+        states = _state_config("hello")
+        states["one"]["config"] = {
+            "sources": {
+                "extra": {
+                    "plugin_id": PLUGIN_ID_SOURCE_DICT,
+                    "priority": 80,
+                    "data": {"extra": {"value": "from state"}},
+                },
+            },
+        }
+        self.source.set_data({"states": states, "other": {"value": "shared"}})
+        other = self.environment.config().load("other")
+
+        self.state.activate()
+        # still loaded, not reloaded from the sources
+        self.assertIn("other", self.state.config().loaded)
+        self.assertIs(self.state.config().loaded["other"].data, other.data)
+        self.assertEqual(self.state.config().load("extra").get("value"), "from state")
+
+    def test_reuse_benchmark(self):
+        """Reusing the built state is faster than building it."""
+        start = time.perf_counter()
+        self.state.activate()
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.state.activate()
+        reused = time.perf_counter() - start
+
+        self.assertLess(reused, built)
+
+
+if __name__ == "__main__":
+    unittest.main()
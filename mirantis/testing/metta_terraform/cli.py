@@ -85,10 +85,10 @@ class TerraformClientGroup:
         plugin = self._select_client(instance_id=client).plugin
         plugin.init(upgrade=upgrade)
 
-    def plan(self, client: str = ""):
-        """Run client plan."""
+    def plan(self, client: str = "", save: bool = False):
+        """Run client plan, optionally saving it for the next apply."""
         plugin = self._select_client(instance_id=client).plugin
-        plugin.plan()
+        plugin.plan(save=save)
 
     def apply(self, client: str = "", nolock: bool = False):
         """Run terraform apply."""
@@ -118,7 +118,7 @@ class TerraformClientGroup:
     def graph(self, type: str = "plan", client: str = ""):
         """Retrieve Terraform graph."""
         plugin = self._select_client(instance_id=client).plugin
-        return plugin.graph()
+        return plugin.graph(type=type)
 
     def providers_schema(self, client: str = ""):
         """Retrieve Terraform providers schema."""
@@ -12,14 +12,17 @@ import os
 import json
 
 from mirantis.testing.metta.environment import Environment
-from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta.fixture import Fixtures, LazyFixture
 from mirantis.testing.metta.output import METTA_PLUGIN_INTERFACE_ROLE_OUTPUT
 from mirantis.testing.metta_common import (
     METTA_PLUGIN_ID_OUTPUT_DICT,
     METTA_PLUGIN_ID_OUTPUT_TEXT,
 )
 
-from .terraform import TerraformClient
+from mirantis.testing.metta_common.files import write_if_changed
+from mirantis.testing.metta_common.process import ProcessHandle
+
+from .terraform import TerraformClient, TERRAFORM_CLIENT_DEFAULT_INIT_LOCK_TIMEOUT
 
 
 logger = logging.getLogger("metta_terraform:client")
@@ -94,9 +97,13 @@ class TerraformClientPlugin:
         """Return the terraform state contents."""
         return self._tf_handler.state()
 
-    def init(self, upgrade: bool = False):
-        """Run terraform init."""
-        self._tf_handler.init(upgrade=upgrade)
+    def init(
+        self,
+        upgrade: bool = False,
+        lock_timeout: float = TERRAFORM_CLIENT_DEFAULT_INIT_LOCK_TIMEOUT,
+    ):
+        """Run terraform init, waiting up to lock_timeout for any parallel init."""
+        self._tf_handler.init(upgrade=upgrade, lock_timeout=lock_timeout)
 
     def apply(self, lock: bool = True):
         """Apply a terraform plan."""
@@ -104,6 +111,16 @@ class TerraformClientPlugin:
         self._tf_handler.apply(lock=lock)
         self.make_fixtures()
 
+    def start_apply(self, lock: bool = True) -> ProcessHandle:
+        """Start applying a terraform plan in the background.
+
+        The caller should run make_fixtures() once the returned handle has
+        completed successfully, as apply() would have.
+
+        """
+        self._make_tfvars_file()
+        return self._tf_handler.start_apply(lock=lock)
+
     def destroy(self, lock: bool = True):
         """Apply a terraform plan."""
         self._tf_handler.destroy(lock=lock)
@@ -114,10 +131,10 @@ class TerraformClientPlugin:
         self._make_tfvars_file()
         return self._tf_handler.test()
 
-    def plan(self):
-        """Check a terraform plan."""
+    def plan(self, save: bool = False):
+        """Check a terraform plan, optionally saving it for the next apply()."""
         self._make_tfvars_file()
-        return self._tf_handler.plan()
+        return self._tf_handler.plan(save=save)
 
     def providers_schema(self):
         """Retrieve terraform providers schema.
@@ -155,10 +172,8 @@ class TerraformClientPlugin:
         return self._tf_handler.output(name=name)
 
     def _make_tfvars_file(self):
-        """Write the vars file."""
-        os.makedirs(os.path.dirname(self._tfvars_path), exist_ok=True)
-        with open(self._tfvars_path, "w", encoding="utf8") as var_file:
-            json.dump(self.tfvars, var_file, sort_keys=True, indent=4)
+        """Write the vars file, if its contents have changed."""
+        write_if_changed(self._tfvars_path, json.dumps(self.tfvars, sort_keys=True, indent=4))
 
     def _rm_tfvars_file(self):
         """Remove any created vars file."""
@@ -188,6 +203,10 @@ class TerraformClientPlugin:
 
         Priorities can be used in the config.
 
+        Fixtures that we create for root module outputs are lazy: they hold the
+        output value and only create their output plugin when it is first
+        used, as modules can export many outputs that are never read.
+
         """
         # now we ask TF what output it nows about and merge together those as
         # new output plugins.
@@ -208,6 +227,13 @@ class TerraformClientPlugin:
                 instance_id=output_key,
                 exception_if_missing=False,
             )
+            if isinstance(fixture, LazyFixture) and not fixture.is_built():
+                # an output we created, which was never used; drop it and make
+                # a new one, as the output type (so plugin_id) may have changed
+                self.fixtures.remove(fixture)
+                self._environment.fixtures().remove(fixture)
+                fixture = None
+
             if fixture is not None:
                 if hasattr(fixture.plugin, "set_data"):
                     fixture.plugin.set_data(output_value)
@@ -217,7 +243,7 @@ class TerraformClientPlugin:
             else:
                 # we only know how to create 2 kinds of outputs
                 if output_type == "object":
-                    fixture = self._environment.new_fixture(
+                    fixture = self._environment.new_lazy_fixture(
                         plugin_id=METTA_PLUGIN_ID_OUTPUT_DICT,
                         instance_id=output_key,
                         priority=self._environment.plugin_priority(delta=5),
@@ -226,9 +252,10 @@ class TerraformClientPlugin:
                             "parent_plugin_id": METTA_TERRAFORM_CLIENT_PLUGIN_ID,
                             "parent_instance_id": self._instance_id,
                         },
+                        replace_existing=True,
                     )
                 else:
-                    fixture = self._environment.new_fixture(
+                    fixture = self._environment.new_lazy_fixture(
                         plugin_id=METTA_PLUGIN_ID_OUTPUT_TEXT,
                         instance_id=output_key,
                         priority=self._environment.plugin_priority(delta=5),
@@ -237,6 +264,7 @@ class TerraformClientPlugin:
                             "parent_plugin_id": METTA_TERRAFORM_CLIENT_PLUGIN_ID,
                             "parent_instance_id": self._instance_id,
                         },
+                        replace_existing=True,
                     )
 
-                self.fixtures.add(fixture)
+                self.fixtures.add(fixture, replace_existing=True)
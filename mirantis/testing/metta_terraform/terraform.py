@@ -11,14 +11,34 @@ import logging
 import json
 import os
 import time
+import fcntl
+import functools
+import hashlib
 import subprocess
 import shutil
-from typing import List
+import tempfile
+from typing import List, Tuple
+
+from mirantis.testing.metta_common.process import ProcessHandle
 
 logger = logging.getLogger("metta_terraform:client")
 
 TERRAFORM_CLIENT_DEFAULT_BINARY = "terraform"
 """ default terraform executable for subprocess """
+TERRAFORM_CLIENT_DEFAULT_INIT_LOCK_TIMEOUT = None
+""" default number of seconds to wait for another process to finish init, None to block """
+TERRAFORM_CLIENT_INIT_LOCK_FILENAME = ".terraform.metta_mirantis.init.lock"
+""" init lock file, kept in the terraform root (working dir) """
+TERRAFORM_CLIENT_INIT_STAMP_FILENAME = ".metta_mirantis.init.done"
+""" completed-init stamp file, kept in the terraform root .terraform dir """
+TERRAFORM_CLIENT_INIT_LOCK_POLL_INTERVAL = 0.05
+""" seconds between attempts to take the init lock when a timeout is used """
+TERRAFORM_CLIENT_PLAN_FILENAME = "metta.tfplan"
+""" saved plan file name, kept beside the state file """
+TERRAFORM_CLIENT_PLAN_KEY_SUFFIX = ".key"
+""" suffix for the file which records the inputs hash for a saved plan """
+TERRAFORM_CLIENT_CACHE_DIRNAME = ".metta_mirantis.cache"
+""" output cache folder, kept in the terraform root .terraform dir """
 
 
 class TerraformClient:
@@ -73,56 +93,131 @@ class TerraformClient:
             "tfvars_path": self._tfvars_path,
         }
 
+        if deep:
+            cache_dir = self._cache_dir()
+            if os.path.isdir(cache_dir):
+                # only report the cached files, parsing them can be expensive
+                info["cache"] = {
+                    name: os.path.getsize(os.path.join(cache_dir, name))
+                    for name in sorted(os.listdir(cache_dir))
+                    if not name.startswith(".")
+                }
+
         return info
 
-    def init(self, upgrade: bool = False):
+    def init(
+        self,
+        upgrade: bool = False,
+        lock_timeout: float = TERRAFORM_CLIENT_DEFAULT_INIT_LOCK_TIMEOUT,
+    ):
         """Run terraform init.
 
         init is something that can be run once for a number of jobs in parallel
-        we lock the process. If a lock is in place, then we just wait for an
-        unlock and return.
-        Other terraform actions lock themselves, and we want to fail if the
-        operation is locked, but here we just want to skip it.
+        (e.g. pytest-xdist workers sharing a terraform root) so we hold an
+        exclusive advisory (flock) lock on the terraform root while running it.
+        Other processes block on the lock until it is released, or until the
+        timeout passes.  The kernel drops the lock if the process dies, so a
+        crashed init can't leave a stale lock behind.
+
+        A successful init writes a stamp into the .terraform folder.  Whoever
+        takes the lock next will skip init if the stamp is still valid, which
+        means that the root module files are unchanged and the .terraform
+        folder was not removed.  An upgrade always runs init.
+
+        Parameters:
+        -----------
+        upgrade (bool) : run init with -upgrade
+
+        lock_timeout (float) : seconds to wait for the init lock.  If None
+            then wait forever.
+
+        Raises:
+        -------
+        BlockingIOError if the lock could not be taken within the timeout.
 
         """
-        try:
-            lockfile = os.path.join(
-                os.path.dirname(self._state_path), ".terraform.metta_mirantis.init.lock"
-            )
-            if os.path.exists(lockfile):
-                logger.info(
-                    "terraform .init lock file found.  Skipping init, but waiting for it to finish"
+        lockfile = os.path.join(self._working_dir, TERRAFORM_CLIENT_INIT_LOCK_FILENAME)
+        os.makedirs(self._working_dir, exist_ok=True)
+        with open(lockfile, "a+", encoding="utf8") as lockfile_object:
+            _flock(lockfile_object, lock_timeout)
+            try:
+                lockfile_object.truncate(0)
+                lockfile_object.write(f"{os.getpid()} is running init")
+                lockfile_object.flush()
+
+                if not upgrade and self._init_stamp() == self._init_fingerprint():
+                    logger.info("terraform init already completed for %s", self._working_dir)
+                    return
+
+                cmds: List[str] = ["init"]
+                if upgrade:
+                    cmds.append("-upgrade")
+                self._run(cmds, with_tfvars=False, with_state=False)
+                # init creates or updates the dependency lock file, so the
+                # fingerprint is taken after it has run.
+                self._write_init_stamp(self._init_fingerprint())
+
+            except subprocess.CalledProcessError as err:
+                logger.error(
+                    "Terraform client failed to run init in %s: %s",
+                    self._working_dir,
+                    err.output,
                 )
-                time_to_wait = 120
-                time_counter = 0
-                while not os.path.exists(lockfile):
-                    time.sleep(5)
-                    time_counter += 5
-                    if time_counter > time_to_wait:
-                        raise BlockingIOError("Timed out when waiting for init lock to go away")
-            else:
-                os.makedirs(os.path.dirname(os.path.abspath(lockfile)), exist_ok=True)
-                with open(lockfile, "w", encoding="utf8") as lockfile_object:
-                    lockfile_object.write(f"{os.getpid()} is running init")
-                try:
-                    cmds: List[string] = ["init"]
-                    if upgrade:
-                        cmds.append("-upgrade")
-                    self._run(cmds, with_tfvars=False, with_state=False)
-                finally:
-                    os.remove(lockfile)
-        except subprocess.CalledProcessError as err:
-            logger.error(
-                "Terraform client failed to run init in %s: %s",
-                self._working_dir,
-                err.output,
-            )
-            raise Exception("Terraform client failed to run init") from err
+                raise Exception("Terraform client failed to run init") from err
+
+            finally:
+                fcntl.flock(lockfile_object, fcntl.LOCK_UN)
+
+    def _init_stamp_path(self) -> str:
+        """Return the path to the completed-init stamp."""
+        return os.path.join(self._working_dir, ".terraform", TERRAFORM_CLIENT_INIT_STAMP_FILENAME)
+
+    def _init_fingerprint(self) -> str:
+        """Fingerprint the root module files which init depends on."""
+        fingerprint = hashlib.sha256()
+        for name in sorted(os.listdir(self._working_dir)):
+            if not (
+                name.endswith(".tf") or name.endswith(".tf.json") or name == ".terraform.lock.hcl"
+            ):
+                continue
+            stat = os.stat(os.path.join(self._working_dir, name))
+            fingerprint.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf8"))
+        return fingerprint.hexdigest()
+
+    def _init_stamp(self) -> str:
+        """Return the fingerprint recorded by the last completed init, if any."""
+        try:
+            with open(self._init_stamp_path(), encoding="utf8") as stamp_file:
+                return stamp_file.read().strip()
+        except FileNotFoundError:
+            return ""
+
+    def _write_init_stamp(self, fingerprint: str):
+        """Record a completed init, if init created the .terraform folder."""
+        stamp_path = self._init_stamp_path()
+        if not os.path.isdir(os.path.dirname(stamp_path)):
+            return
+        with open(stamp_path, "w", encoding="utf8") as stamp_file:
+            stamp_file.write(fingerprint)
+
+    def plan(self, save: bool = False):
+        """Check a terraform plan.
+
+        Parameters:
+        -----------
+        save (bool) : save the plan to a file, so that a following apply() can
+            use it instead of planning again.  The plan is recorded against a
+            hash of its inputs (tfvars, module sources and state) and is only
+            used if those have not changed.
 
-    def plan(self):
-        """Check a terraform plan."""
+        """
+        args: List[str] = ["plan"]
+        if save:
+            self._rm_saved_plan()
+            os.makedirs(os.path.dirname(self._plan_path()), exist_ok=True)
+            args += ["-input=false", f"-out={self._plan_path()}"]
         try:
-            self._run(["plan"], with_state=True, with_tfvars=True, return_output=False)
+            self._run(args, with_state=True, with_tfvars=True, return_output=False)
         except subprocess.CalledProcessError as err:
             logger.error(
                 "Terraform client failed to run plan in %s: %s",
@@ -131,23 +226,31 @@ class TerraformClient:
             )
             raise RuntimeError("Terraform client failed to plan()") from err
 
+        if save:
+            with open(
+                self._plan_path() + TERRAFORM_CLIENT_PLAN_KEY_SUFFIX, "w", encoding="utf8"
+            ) as key_file:
+                key_file.write(self._plan_key())
+
     def apply(self, lock: bool = True):
         """Apply a terraform plan.
 
+        If plan(save=True) saved a plan for the current inputs, then that plan
+        is applied, and then discarded.
+
         Parameters:
         -----------
         lock (bool) : if False then -lock=false is passed to terraform meaning
             that the state file is ignored.
 
         """
+        args, append_args, with_tfvars = self._apply_args(lock)
         try:
-            cmd: List[str] = ["apply", "-auto-approve"]
-            if not lock:
-                cmd.append("-lock=false")
             self._run(
-                cmd,
+                args,
+                append_args,
                 with_state=True,
-                with_tfvars=True,
+                with_tfvars=with_tfvars,
                 return_output=False,
             )
         except subprocess.CalledProcessError as err:
@@ -157,6 +260,113 @@ class TerraformClient:
                 err.stderr,
             )
             raise RuntimeError("Terraform client failed to run apply()") from err
+        finally:
+            if append_args:
+                self._rm_saved_plan()
+
+    def _apply_args(self, lock: bool = True) -> Tuple[List[str], List[str], bool]:
+        """Decide how to run apply, using a saved plan if one is still valid.
+
+        Returns:
+        --------
+        (args, append_args, with_tfvars) for _cmd/_run/_start.  Variables
+        can't be passed when applying a saved plan, as they are in the plan.
+
+        """
+        args: List[str] = ["apply", "-auto-approve"]
+        if not lock:
+            args.append("-lock=false")
+
+        plan_path = self._plan_path()
+        if not os.path.isfile(plan_path):
+            return args, [], True
+
+        try:
+            with open(plan_path + TERRAFORM_CLIENT_PLAN_KEY_SUFFIX, encoding="utf8") as key_file:
+                saved_key = key_file.read()
+        except FileNotFoundError:
+            saved_key = ""
+
+        if saved_key and saved_key == self._plan_key():
+            logger.info("applying saved terraform plan %s", plan_path)
+            return args, [plan_path], False
+
+        logger.info("discarding saved terraform plan as its inputs have changed")
+        self._rm_saved_plan()
+        return args, [], True
+
+    def _plan_path(self) -> str:
+        """Return the path to the saved plan file."""
+        return os.path.join(os.path.dirname(self._state_path), TERRAFORM_CLIENT_PLAN_FILENAME)
+
+    def _rm_saved_plan(self):
+        """Remove any saved plan file."""
+        for path in [
+            self._plan_path(),
+            self._plan_path() + TERRAFORM_CLIENT_PLAN_KEY_SUFFIX,
+        ]:
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def _plan_key(self) -> str:
+        """Hash the inputs that a plan depends on.
+
+        That is the tfvars file, the terraform module source files and the
+        state file (terraform refuses to apply a plan made against an older
+        state.)
+
+        """
+        key = hashlib.sha256()
+        paths = [self._tfvars_path, self._state_path] + self._module_files()
+        for path in paths:
+            key.update(path.encode("utf8") + b"\0")
+            try:
+                with open(path, "rb") as key_source:
+                    for chunk in iter(functools.partial(key_source.read, 65536), b""):
+                        key.update(chunk)
+            except FileNotFoundError:
+                key.update(b"-missing-")
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def _module_files(self) -> List[str]:
+        """List the terraform source files for the root module and local modules.
+
+        The .terraform folder is skipped; downloaded module and provider
+        versions are pinned by .terraform.lock.hcl, which is included.
+
+        """
+        module_files: List[str] = []
+        for dirpath, dirnames, filenames in os.walk(self._working_dir):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith(".terraform"))
+            for name in sorted(filenames):
+                if (
+                    name.endswith(".tf")
+                    or name.endswith(".tf.json")
+                    or name == ".terraform.lock.hcl"
+                ):
+                    module_files.append(os.path.join(dirpath, name))
+        return module_files
+
+    def start_apply(self, lock: bool = True) -> ProcessHandle:
+        """Start applying a terraform plan in the background.
+
+        Non-blocking version of apply(); the caller gets a started process
+        handle which can be polled, waited on, cancelled or used to stream
+        terraform output.
+
+        Parameters:
+        -----------
+        lock (bool) : if False then -lock=false is passed to terraform meaning
+            that the state file is ignored.
+
+        Returns:
+        --------
+        A started ProcessHandle for the terraform apply.
+
+        """
+        args, append_args, with_tfvars = self._apply_args(lock)
+        return self._start(args, append_args, with_state=True, with_tfvars=with_tfvars)
 
     def destroy(self, lock: bool = True):
         """Remove resources that should have been created.
@@ -203,13 +413,15 @@ class TerraformClient:
             raise RuntimeError("Terraform client failed to run validate") from err
 
     def providers_schema(self):
-        """Output providers schema."""
+        """Output providers schema.
+
+        The schema JSON is cached on disk (see _cached_output) and is parsed
+        from the cache file on each call, rather than kept in memory.
+
+        """
         try:
-            output = self._run(
-                ["providers", "schema", "-json"],
-                with_state=False,
-                with_tfvars=False,
-                return_output=True,
+            cache_path = self._cached_output(
+                "providers_schema.json", ["providers", "schema", "-json"]
             )
         except subprocess.CalledProcessError as err:
             logger.error(
@@ -219,17 +431,17 @@ class TerraformClient:
             )
             raise RuntimeError("Terraform client failed to retrieve providers schema.") from err
 
-        return json.loads(output)
+        with open(cache_path, encoding="utf8") as schema_file:
+            return json.load(schema_file)
 
     def graph(self, type: str = "plan"):
-        """Output terraform graph."""
+        """Output terraform graph.
+
+        The graph is cached on disk per graph type (see _cached_output.)
+
+        """
         try:
-            output = self._run(
-                ["graph", f"-type={type}"],
-                with_state=False,
-                with_tfvars=False,
-                return_output=True,
-            )
+            cache_path = self._cached_output(f"graph-{type}.dot", ["graph", f"-type={type}"])
         except subprocess.CalledProcessError as err:
             logger.error(
                 "Terraform client failed to run graph() in %s: %s",
@@ -238,7 +450,71 @@ class TerraformClient:
             )
             raise RuntimeError("Terraform client failed to retrieve graph.") from err
 
-        return output
+        with open(cache_path, encoding="utf8") as graph_file:
+            return graph_file.read()
+
+    def _cache_dir(self) -> str:
+        """Return the path to the output cache folder."""
+        return os.path.join(self._working_dir, ".terraform", TERRAFORM_CLIENT_CACHE_DIRNAME)
+
+    def _cache_key(self) -> str:
+        """Hash the inputs that cached output depends on.
+
+        That is the contents of .terraform.lock.hcl, which pins the provider
+        versions, and the size and mtime of the module source files.
+
+        """
+        key = hashlib.sha256()
+        for path in self._module_files():
+            if os.path.basename(path) == ".terraform.lock.hcl":
+                with open(path, "rb") as lock_file:
+                    key.update(path.encode("utf8") + b"\0" + lock_file.read() + b"\0")
+            else:
+                stat = os.stat(path)
+                key.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf8"))
+        return key.hexdigest()
+
+    def _cached_output(self, name: str, args: List[str]) -> str:
+        """Return the path to a file holding the output of a terraform command.
+
+        Output is kept in the .terraform folder, so that removing it (which
+        forces a new init) also drops the cache.  The file name includes the
+        cache key, and older files for the same name are removed when the
+        command is run again, so an entry is used only while the lock file
+        and module files are unchanged.
+
+        Raises:
+        -------
+        subprocess.CalledProcessError if the command had to be run and failed.
+
+        """
+        cache_dir = self._cache_dir()
+        cache_path = os.path.join(cache_dir, f"{self._cache_key()}.{name}")
+        if os.path.isfile(cache_path):
+            logger.debug("using cached terraform output: %s", cache_path)
+            return cache_path
+
+        output = self._run(args, with_state=False, with_tfvars=False, return_output=True)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for stale in os.listdir(cache_dir):
+            stale_path = os.path.join(cache_dir, stale)
+            if stale.endswith(f".{name}") and stale_path != cache_path:
+                # another process may be cleaning up at the same time
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass
+
+        handle, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".output.")
+        try:
+            with os.fdopen(handle, "w", encoding="utf8") as temp_file:
+                temp_file.write(output)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return cache_path
 
     def test(self):
         """Apply a terraform plan."""
@@ -305,6 +581,17 @@ class TerraformClient:
 
         return json.loads(output)
 
+    def _start(
+        self,
+        args: List[str],
+        append_args: List[str] = None,
+        with_state=True,
+        with_tfvars=True,
+    ) -> ProcessHandle:
+        """Start a terraform CLI command in the background."""
+        cmd = self._cmd(args, append_args, with_state=with_state, with_tfvars=with_tfvars)
+        return ProcessHandle(cmd).start()
+
     def _run(
         self,
         args: List[str],
@@ -314,17 +601,7 @@ class TerraformClient:
         return_output=False,
     ):
         """Run terraform CLI command."""
-        cmd = [self._terraform_bin]
-        cmd += [f"-chdir={self._working_dir}"]
-        cmd += args
-
-        if with_tfvars and os.path.isfile(self._tfvars_path):
-            cmd += [f"-var-file={self._tfvars_path}"]
-        if with_state:
-            cmd += [f"-state={self._state_path}"]
-
-        if append_args is not None:
-            cmd += append_args
+        cmd = self._cmd(args, append_args, with_state=with_state, with_tfvars=with_tfvars)
 
         # improve readability
         # pylint: disable=no-else-return
@@ -338,3 +615,55 @@ class TerraformClient:
             res = subprocess.run(cmd, shell=False, check=True, stdout=subprocess.PIPE)
             res.check_returncode()
             return res.stdout.decode("utf-8")
+
+    def _cmd(
+        self,
+        args: List[str],
+        append_args: List[str] = None,
+        with_state=True,
+        with_tfvars=True,
+    ) -> List[str]:
+        """Build a terraform CLI command list."""
+        cmd = [self._terraform_bin]
+        cmd += [f"-chdir={self._working_dir}"]
+        cmd += args
+
+        if with_tfvars and os.path.isfile(self._tfvars_path):
+            cmd += [f"-var-file={self._tfvars_path}"]
+        if with_state:
+            cmd += [f"-state={self._state_path}"]
+
+        if append_args is not None:
+            cmd += append_args
+
+        return cmd
+
+
+def _flock(file_object, timeout: float = None):
+    """Take an exclusive flock on an open file, waiting up to timeout seconds.
+
+    Without a timeout we just block in the kernel, which wakes us as soon as
+    the lock is released.  flock has no timeout of its own, so with a timeout
+    we retry a non-blocking lock at a short interval.
+
+    Raises:
+    -------
+    BlockingIOError if the timeout passed before the lock was taken.
+
+    """
+    if timeout is None:
+        fcntl.flock(file_object, fcntl.LOCK_EX)
+        return
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(file_object, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError as err:
+            if time.monotonic() >= deadline:
+                raise BlockingIOError(
+                    f"Timed out after {timeout}s waiting for lock {file_object.name}"
+                ) from err
+            logger.debug("waiting for lock %s", file_object.name)
+            time.sleep(TERRAFORM_CLIENT_INIT_LOCK_POLL_INTERVAL)
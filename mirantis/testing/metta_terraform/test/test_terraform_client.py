@@ -0,0 +1,298 @@
+"""
+
+Test the terraform subprocess client using a fake terraform binary.
+
+"""
+import fcntl
+import multiprocessing
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from configerus import new_config
+
+from mirantis.testing.metta.building import DEFAULT_FIXTURE_PRIORITY
+from mirantis.testing.metta.environment import Environment
+from mirantis.testing.metta_common import METTA_PLUGIN_ID_OUTPUT_DICT, METTA_PLUGIN_ID_OUTPUT_TEXT
+from mirantis.testing.metta_terraform import terraform
+from mirantis.testing.metta_terraform.client import TerraformClientPlugin
+from mirantis.testing.metta_terraform.terraform import TerraformClient
+
+FAKE_TERRAFORM = """#!{python}
+import os, sys, time
+with open({log!r}, "a", encoding="utf8") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if "apply" in sys.argv:
+    for i in range(3):
+        print(f"applying {{i}}", flush=True)
+        time.sleep(0.1)
+for arg in sys.argv:
+    if arg.startswith("-out="):
+        with open(arg[len("-out="):], "w", encoding="utf8") as plan:
+            plan.write("saved plan")
+if "providers" in sys.argv:
+    print('{{"format_version": "1.0", "provider_schemas": {{}}}}')
+if "graph" in sys.argv:
+    print("digraph {{ " + sys.argv[-1] + " }}")
+if "init" in sys.argv:
+    time.sleep(0.5)
+    chdir = sys.argv[1][len("-chdir="):]
+    os.makedirs(os.path.join(chdir, ".terraform"), exist_ok=True)
+    lock_file = os.path.join(chdir, ".terraform.lock.hcl")
+    if not os.path.isfile(lock_file):
+        with open(lock_file, "w", encoding="utf8") as lock:
+            lock.write("# provider locks")
+"""
+
+
+def _init_client(client: TerraformClient):
+    """Run init in a child process, exiting non-zero on failure."""
+    try:
+        client.init()
+    except Exception:  # pylint: disable=broad-except
+        sys.exit(1)
+
+
+class TerraformClientTest(unittest.TestCase):
+    """Terraform client behaviour against a fake binary."""
+
+    def setUp(self):
+        """Write a fake terraform binary and a chart path."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmpdir.name, "calls.log")
+        self.binary = os.path.join(self.tmpdir.name, "terraform")
+        with open(self.binary, "w", encoding="utf8") as bin_file:
+            bin_file.write(FAKE_TERRAFORM.format(python=sys.executable, log=self.log))
+        os.chmod(self.binary, os.stat(self.binary).st_mode | stat.S_IEXEC)
+
+        self.chart = os.path.join(self.tmpdir.name, "chart")
+        os.makedirs(self.chart)
+        self.client = TerraformClient(
+            working_dir=self.chart,
+            state_path=os.path.join(self.chart, "state", "terraform.tfstate"),
+            tfvars_path=os.path.join(self.chart, "terraform.tfvars.json"),
+            binary=self.binary,
+        )
+
+    def tearDown(self):
+        """Remove the fake binary and chart."""
+        self.tmpdir.cleanup()
+
+    def _calls(self):
+        """Return the list of recorded fake terraform calls."""
+        if not os.path.isfile(self.log):
+            return []
+        with open(self.log, encoding="utf8") as log_file:
+            return log_file.read().splitlines()
+
+    def test_start_apply(self):
+        """A background apply streams output and completes."""
+        handle = self.client.start_apply(lock=False)
+        lines = [line for _, line in handle.lines(timeout=10)]
+        self.assertEqual(lines, ["applying 0", "applying 1", "applying 2"])
+        self.assertEqual(handle.wait(timeout=10), 0)
+        self.assertIn("-lock=false", self._calls()[0])
+
+    def _init_calls(self):
+        """Return the recorded fake terraform init calls."""
+        return [call for call in self._calls() if call.split()[1] == "init"]
+
+    def test_init_stamp(self):
+        """A completed init is skipped until the root module changes."""
+        with open(os.path.join(self.chart, "main.tf"), "w", encoding="utf8") as tf_file:
+            tf_file.write("# empty")
+
+        self.client.init()
+        self.client.init()
+        self.assertEqual(len(self._init_calls()), 1)
+
+        with open(os.path.join(self.chart, "main.tf"), "w", encoding="utf8") as tf_file:
+            tf_file.write("# changed")
+        self.client.init()
+        self.assertEqual(len(self._init_calls()), 2)
+
+        self.client.init(upgrade=True)
+        self.assertEqual(len(self._init_calls()), 3)
+
+    def test_init_lock_file(self):
+        """The dependency lock file written by init doesn't invalidate the stamp."""
+        for _ in range(3):
+            self.client.init()
+        self.assertTrue(os.path.isfile(os.path.join(self.chart, ".terraform.lock.hcl")))
+        self.assertEqual(len(self._init_calls()), 1)
+
+    def test_init_parallel(self):
+        """Parallel processes wait for one init, and then skip theirs."""
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=_init_client, args=(self.client,)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=30)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(len(self._init_calls()), 1)
+
+    def test_init_lock_timeout(self):
+        """Init gives up if another process holds the lock for too long."""
+        lockfile = os.path.join(self.chart, ".terraform.metta_mirantis.init.lock")
+        with open(lockfile, "a+", encoding="utf8") as lock_object:
+            fcntl.flock(lock_object, fcntl.LOCK_EX)
+            context = multiprocessing.get_context("fork")
+            process = context.Process(target=self._init_with_timeout)
+            process.start()
+            process.join(timeout=30)
+
+        self.assertEqual(process.exitcode, 3)
+        self.assertEqual(self._init_calls(), [])
+
+    def _init_with_timeout(self):
+        """Run init with a short lock timeout, exit 3 if it times out."""
+        try:
+            self.client.init(lock_timeout=0.2)
+        except BlockingIOError:
+            sys.exit(3)
+
+    def _write_tfvars(self, tfvars: str):
+        """Write the tfvars file as the plugin would."""
+        with open(
+            os.path.join(self.chart, "terraform.tfvars.json"), "w", encoding="utf8"
+        ) as var_file:
+            var_file.write(tfvars)
+
+    def test_saved_plan(self):
+        """Apply uses a saved plan if its inputs are unchanged, then discards it."""
+        self._write_tfvars('{"a": 1}')
+        self.client.plan(save=True)
+        plan_path = os.path.join(self.chart, "state", "metta.tfplan")
+        self.assertTrue(os.path.isfile(plan_path))
+
+        self.client.apply()
+        apply_call = self._calls()[-1].split()
+        self.assertEqual(apply_call[-1], plan_path)
+        self.assertFalse([arg for arg in apply_call if arg.startswith("-var-file")])
+        self.assertFalse(os.path.isfile(plan_path))
+
+        # without a saved plan, apply plans for itself
+        self.client.apply()
+        apply_call = self._calls()[-1].split()
+        self.assertNotIn(plan_path, apply_call)
+        self.assertTrue([arg for arg in apply_call if arg.startswith("-var-file")])
+
+    def test_saved_plan_stale(self):
+        """A saved plan is discarded if the tfvars or module sources change."""
+        plan_path = os.path.join(self.chart, "state", "metta.tfplan")
+        for change in [
+            lambda: self._write_tfvars('{"a": 2}'),
+            lambda: open(os.path.join(self.chart, "main.tf"), "a", encoding="utf8").close(),
+        ]:
+            self._write_tfvars('{"a": 1}')
+            self.client.plan(save=True)
+            change()
+            self.client.apply()
+
+            self.assertNotIn(plan_path, self._calls()[-1].split())
+            self.assertFalse(os.path.isfile(plan_path))
+
+    def test_output_cache(self):
+        """Schema and graph output is cached until the lock file or modules change."""
+        main_tf = os.path.join(self.chart, "main.tf")
+        lock_file = os.path.join(self.chart, ".terraform.lock.hcl")
+        with open(main_tf, "w", encoding="utf8") as tf_file:
+            tf_file.write("# empty")
+
+        def schema_calls():
+            return len([call for call in self._calls() if "providers" in call.split()])
+
+        self.assertEqual(self.client.providers_schema()["format_version"], "1.0")
+        self.client.providers_schema()
+        self.assertEqual(schema_calls(), 1)
+
+        self.assertEqual(self.client.graph().strip(), "digraph { -type=plan }")
+        self.assertEqual(self.client.graph(type="apply").strip(), "digraph { -type=apply }")
+        self.client.graph()
+        self.assertEqual(len([call for call in self._calls() if "graph" in call.split()]), 2)
+
+        os.utime(main_tf, ns=(1, 1))
+        self.client.providers_schema()
+        self.assertEqual(schema_calls(), 2)
+
+        with open(lock_file, "w", encoding="utf8") as lock:
+            lock.write('provider "example" {}')
+        self.client.providers_schema()
+        self.client.providers_schema()
+        self.assertEqual(schema_calls(), 3)
+
+        # stale entries are dropped, so there is one file per command
+        cache = self.client.info(deep=True)["cache"]
+        self.assertEqual(
+            sorted(name.split(".", 1)[1] for name in cache),
+            ["graph-apply.dot", "graph-plan.dot", "providers_schema.json"],
+        )
+
+    def test_output_cache_concurrent(self):
+        """A cache entry written by another process while running is not removed."""
+        # pylint: disable=protected-access
+        cache_dir = self.client._cache_dir()
+        cache_path = os.path.join(cache_dir, f"{self.client._cache_key()}.providers_schema.json")
+        run = self.client._run
+
+        def run_alongside(*args, **kwargs):
+            """Run the command while another process writes the same cache entry."""
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf8") as cache_file:
+                cache_file.write("{}")
+            return run(*args, **kwargs)
+
+        with mock.patch.object(self.client, "_run", side_effect=run_alongside), mock.patch.object(
+            terraform.os, "remove", wraps=os.remove
+        ) as remove:
+            self.client.providers_schema()
+        self.assertNotIn(mock.call(cache_path), remove.call_args_list)
+        self.assertTrue(os.path.isfile(cache_path))
+
+
+class OutputsEnvironment(Environment):
+    """Environment which gives default plugin priorities, as built environments do."""
+
+    # pylint: disable=too-few-public-methods
+    def plugin_priority(self, delta: int = 0) -> int:
+        """Return the default fixture priority with a delta."""
+        return DEFAULT_FIXTURE_PRIORITY + delta
+
+
+class TerraformClientPluginOutputsTest(unittest.TestCase):
+    """Output fixtures made from terraform root module outputs."""
+
+    def _output_plugin_ids(self, fixtures) -> list:
+        """Return the plugin_ids of the fixtures for the "value" output."""
+        return [fixture.plugin_id for fixture in fixtures if fixture.instance_id == "value"]
+
+    def test_output_type_change(self):
+        """An unused output fixture is replaced when the output type changes."""
+        outputs = {"value": {"sensitive": False, "type": ["string", "string"], "value": "text"}}
+        environment = OutputsEnvironment(config=new_config(), instance_id="terraform_outputs")
+        with tempfile.TemporaryDirectory() as path, mock.patch.object(
+            TerraformClientPlugin, "output", lambda client: outputs
+        ), mock.patch.object(terraform.shutil, "which", return_value="terraform"):
+            client = TerraformClientPlugin(
+                environment,
+                "terraform",
+                chart_path=path,
+                state_path=os.path.join(path, "terraform.tfstate"),
+                tfvars={},
+                tfvars_path=os.path.join(path, "terraform.tfvars.json"),
+            )
+            self.assertEqual(
+                self._output_plugin_ids(client.fixtures), [METTA_PLUGIN_ID_OUTPUT_TEXT]
+            )
+
+            outputs["value"] = {"sensitive": False, "type": ["object", {}], "value": {"a": 1}}
+            client.make_fixtures()
+
+        for fixtures in [client.fixtures, environment.fixtures()]:
+            self.assertEqual(self._output_plugin_ids(fixtures), [METTA_PLUGIN_ID_OUTPUT_DICT])
+        self.assertEqual(client.fixtures.get_plugin(instance_id="value").get_output("a"), 1)
@@ -21,6 +21,7 @@ from configerus.validator import ValidationError
 
 from mirantis.testing.metta.environment import Environment
 from mirantis.testing.metta.fixture import Fixtures
+from mirantis.testing.metta_common.files import write_if_changed
 
 from .client import TestkitClientPlugin, METTA_TESTKIT_CLIENT_PLUGIN_ID
 from .testkit import TESTKITCLIENT_CLI_CONFIG_FILE_DEFAULT
@@ -209,7 +210,7 @@ class TestkitProvisionerPlugin:
         self._rm_config_file()
 
     def _write_config_file(self):
-        """Write the config file for testkit."""
+        """Write the config file for testkit, if its contents have changed."""
         try:
             # load all of the testkit configuration, force a reload to get up to date contents
             testkit_config = self._environment.config().load(self._config_label, force_reload=True)
@@ -229,10 +230,8 @@ class TestkitProvisionerPlugin:
         )
         """ config_file value from plugin configuration """
 
-        # write the configto our yaml file target (creating the path)
-        os.makedirs(os.path.dirname(os.path.realpath(config_file)), exist_ok=True)
-        with open(os.path.realpath(config_file), "w", encoding="utf8") as file:
-            yaml.dump(config, file)
+        # write the config to our yaml file target (creating the path)
+        write_if_changed(config_file, yaml.dump(config))
 
     def _rm_config_file(self):
         """Remove the written config file."""